@@ -6,9 +6,12 @@ from flask_jwt_extended import JWTManager
 import app
 from app.config import Config
 from app.database import db, migrate
+from app.conflict_audit import audit_conflicts_command
 from app.import_data import add_admin
+from app.json_provider import FastJSONProvider
 from app.models import User
 from app.routes.auth import init_oauth, auth_bp
+from app.routes.calendar import calendar_bp
 from app.routes.courses import courses_bp
 from app.routes.download import download_bp
 from app.routes.exams import exams_bp
@@ -16,6 +19,7 @@ from app.routes.import_from_excel import upload_bp
 from app.routes.rooms import rooms_bp
 from app.routes.settings import settings_bp
 from app.routes.users import users_bp
+from app.sync_jobs import sync_worker_command
 
 jwt = JWTManager()
 
@@ -23,7 +27,7 @@ jwt = JWTManager()
 def create_app():
     """Funcție de creare a aplicației Flask"""
     app = Flask(__name__)
-
+    app.json = FastJSONProvider(app)
 
     app.config.from_object(Config)
     CORS(app, supports_credentials=True, origins=[app.config["FRONTEND_URL"]])
@@ -72,6 +76,10 @@ def create_app():
     app.register_blueprint(exams_bp)
     app.register_blueprint(download_bp)
     app.register_blueprint(rooms_bp)
+    app.register_blueprint(calendar_bp)
+
+    app.cli.add_command(audit_conflicts_command)
+    app.cli.add_command(sync_worker_command)
 
     return app
 
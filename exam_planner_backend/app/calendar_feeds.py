@@ -0,0 +1,208 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, or_
+from sqlalchemy.orm import aliased
+
+from app.change_tracking import subscribe
+from app.config import Config
+from app.database import db
+from app.intervals import as_minutes
+from app.models import Exam, ExamStatus, Course, Group, Room, User
+
+# Tipurile de calendare: tip -> (modelul entității, coloana după care se filtrează examenele)
+FEED_KINDS = {
+    "group": (Group, (Exam.group_id,)),
+    "professor": (User, (Exam.professor_id, Exam.assistant_id)),
+    "room": (Room, (Exam.room_id,)),
+}
+
+
+def _escape(text):
+    """Escapare pentru valorile de tip TEXT din iCalendar (RFC 5545, 3.3.11)."""
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line):
+    """Împarte liniile mai lungi de 75 de octeți (RFC 5545, 3.1)."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, current = [], ""
+    for char in line:
+        limit = 75 if not parts else 74
+        if len((current + char).encode("utf-8")) > limit:
+            parts.append(current)
+            current = char
+        else:
+            current += char
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _ics_time(day, minute):
+    return (datetime.combine(day, datetime.min.time()) + timedelta(minutes=minute)).strftime("%Y%m%dT%H%M%S")
+
+
+class CalendarFeedCache:
+    """
+    Cache pentru calendarele .ics, câte o intrare pentru fiecare (tip, id).
+
+    Pentru fiecare calendar se rețin și sălile, cursurile, grupele și utilizatorii care apar în el,
+    astfel încât un commit invalidează doar calendarele afectate. Fiecare proces gunicorn are
+    propriul cache, așa că intrările expiră și după `ttl` secunde.
+
+    Fiecare invalidare crește `_generation`; un calendar construit din BD este păstrat doar dacă
+    nicio invalidare nu a avut loc în timpul construirii (altfel conținutul poate fi deja depășit).
+
+    Exemple de utilizare:
+        - calendar_feeds.get("group", 3) -> (etag, last_modified, conținut) sau None
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._feeds = {}
+        self._dependencies = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._feeds.clear()
+            self._dependencies.clear()
+            self._generation += 1
+
+    def invalidate(self, model, key):
+        """Elimină calendarele în care apare înregistrarea (model, key)."""
+        with self._lock:
+            for feed in self._dependencies.pop((model, key), ()):
+                self._feeds.pop(feed, None)
+            self._generation += 1
+
+    def invalidate_feed(self, kind, entity_id):
+        """Elimină calendarul (tip, id)."""
+        with self._lock:
+            self._feeds.pop((kind, entity_id), None)
+            self._generation += 1
+
+    def _build(self, kind, entity_id):
+        model, columns = FEED_KINDS[kind]
+        entity = db.session.get(model, entity_id)
+        if entity is None:
+            return None, set()
+
+        professor = aliased(User)
+        assistant = aliased(User)
+        rows = db.session.execute(
+            select(Exam.exam_id, Exam.exam_date, Exam.start_time, Exam.duration, Exam.type, Exam.details,
+                   Exam.course_id, Course.name, Exam.group_id, Group.name, Exam.room_id, Room.name, Room.building,
+                   Exam.professor_id, professor.name, Exam.assistant_id, assistant.name)
+            .select_from(Exam)
+            .outerjoin(Course, Course.course_id == Exam.course_id)
+            .outerjoin(Group, Group.group_id == Exam.group_id)
+            .outerjoin(Room, Room.room_id == Exam.room_id)
+            .outerjoin(professor, professor.user_id == Exam.professor_id)
+            .outerjoin(assistant, assistant.user_id == Exam.assistant_id)
+            .where(or_(*(column == entity_id for column in columns)),
+                   Exam.status == ExamStatus.ACCEPTAT,
+                   Exam.start_time.isnot(None),
+                   Exam.duration.isnot(None))
+            .order_by(Exam.exam_date, Exam.start_time, Exam.exam_id)
+        ).all()
+
+        dependencies = {(model, entity_id)}
+        events = []
+        for (exam_id, exam_date, start_time, duration, exam_type, details, course_id, course_name, group_id,
+             group_name, room_id, room_name, building, professor_id, professor_name, assistant_id,
+             assistant_name) in rows:
+            dependencies.update({(Exam, exam_id), (Course, course_id), (Group, group_id), (Room, room_id),
+                                 (User, professor_id), (User, assistant_id)})
+            start = as_minutes(start_time)
+            description = [f"Grupa: {group_name}", f"Examinator: {professor_name}"]
+            if assistant_name:
+                description.append(f"Asistent: {assistant_name}")
+            if details:
+                description.append(f"Detalii: {details}")
+            events.append([
+                "BEGIN:VEVENT",
+                f"UID:exam-{exam_id}@{Config.SHORT_FACULTY_NAME or 'exam-planner'}",
+                None,  # DTSTAMP, completat la final
+                f"DTSTART:{_ics_time(exam_date, start)}",
+                f"DTEND:{_ics_time(exam_date, start + duration)}",
+                f"SUMMARY:{_escape(f'{exam_type} {course_name} - {group_name}')}",
+                f"LOCATION:{_escape(f'{room_name} ({building})' if room_name else 'N/A')}",
+                f"DESCRIPTION:{_escape(chr(10).join(description))}",
+                "END:VEVENT",
+            ])
+        return (getattr(entity, "name", str(entity_id)), events), dependencies
+
+    @staticmethod
+    def _render(title, events, stamp):
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//USV//Exam Planner//RO",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(title)}",
+            "X-WR-TIMEZONE:Europe/Bucharest",
+        ]
+        for event in events:
+            lines.extend(f"DTSTAMP:{stamp}" if line is None else line for line in event)
+        lines.append("END:VCALENDAR")
+        return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode("utf-8")
+
+    def get(self, kind, entity_id):
+        """
+        Returnează calendarul (etag, last_modified, conținut .ics) sau None dacă entitatea nu există.
+
+        ETag-ul este calculat din evenimente (fără DTSTAMP), deci nu se schimbă dacă un calendar
+        reconstruit are același conținut; în acest caz se păstrează și Last-Modified.
+        """
+        key = (kind, entity_id)
+        with self._lock:
+            entry = self._feeds.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1:]
+            generation = self._generation
+
+        built, dependencies = self._build(kind, entity_id)
+        if built is None:
+            return None
+        title, events = built
+        etag = hashlib.sha1(repr(built).encode("utf-8")).hexdigest()
+
+        if entry is not None and entry[1] == etag:
+            last_modified, body = entry[2], entry[3]
+        else:
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+            body = self._render(f"Examene - {title}", events, last_modified.strftime("%Y%m%dT%H%M%SZ"))
+
+        with self._lock:
+            if self._generation == generation:
+                self._feeds[key] = (time.monotonic(), etag, last_modified, body)
+                for dependency in dependencies:
+                    self._dependencies.setdefault(dependency, set()).add(key)
+        return etag, last_modified, body
+
+
+calendar_feeds = CalendarFeedCache(ttl=Config.CALENDAR_FEED_TTL)
+
+
+@subscribe
+def _invalidate_calendar_feeds(changes):
+    for change in changes:
+        if change.key is None:
+            calendar_feeds.clear()
+            return
+        calendar_feeds.invalidate(change.model, change.key)
+        if change.model is Exam:
+            # un examen nou sau mutat apare în calendarele grupei / cadrelor didactice / sălii sale
+            for values in (change.before, change.after):
+                if values is not None:
+                    for kind, field in (("group", "group_id"), ("professor", "professor_id"),
+                                        ("professor", "assistant_id"), ("room", "room_id")):
+                        calendar_feeds.invalidate_feed(kind, values.get(field))
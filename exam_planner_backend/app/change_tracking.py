@@ -0,0 +1,131 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+
+from app.database import db
+from app.models import Exam, Room, Course, Group, User
+
+# Modelele ale căror modificări sunt anunțate după commit
+TRACKED_MODELS = (Exam, Room, Course, Group, User)
+
+
+class Change(NamedTuple):
+    """
+    O modificare salvată în baza de date.
+
+    Atribute:
+        model (type): Clasa modelului modificat (ex: Exam).
+        key (int, optional): Cheia primară a înregistrării; None pentru modificări în masă
+            (toate înregistrările modelului trebuie considerate modificate).
+        before (dict, optional): Valorile coloanelor înainte de modificare (None pentru inserări).
+        after (dict, optional): Valorile coloanelor după modificare (None pentru ștergeri).
+    """
+    model: type
+    key: int
+    before: Optional[dict]
+    after: Optional[dict]
+
+
+_subscribers = []
+
+
+def subscribe(callback):
+    """
+    Înregistrează o funcție apelată după fiecare commit cu lista de `Change`.
+
+    Poate fi folosită și ca decorator. Cache-urile în memorie (index de intervale,
+    disponibilitatea sălilor etc.) se actualizează astfel fără a modifica rutele.
+    """
+    _subscribers.append(callback)
+    return callback
+
+
+def notify(changes):
+    """Transmite lista de modificări tuturor abonaților."""
+    for callback in _subscribers:
+        callback(changes)
+
+
+def notify_bulk(*models):
+    """Anunță modificări făcute fără unitatea de lucru ORM (ex: inserări/ștergeri în masă)."""
+    notify([Change(model, None, None, None) for model in models])
+
+
+def _key(state):
+    return state.mapper.primary_key_from_instance(state.obj())[0]
+
+
+def _current(state):
+    return {attr.key: getattr(state.obj(), attr.key) for attr in state.mapper.column_attrs}
+
+
+def _previous(state):
+    values = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.deleted:
+            values[attr.key] = history.deleted[0]
+        elif history.unchanged:
+            values[attr.key] = history.unchanged[0]
+        else:
+            values[attr.key] = getattr(state.obj(), attr.key)
+    return values
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history încarcă valoarea veche a coloanelor Exam chiar dacă obiectul a expirat după un commit,
+# astfel încât `Change.before` conține data / resursele de dinaintea modificării
+for _attr in inspect(Exam).column_attrs:
+    event.listen(getattr(Exam, _attr.key), "set", _keep_previous_value, active_history=True)
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault("tracked_changes", {})
+    for obj in session.new:
+        if isinstance(obj, TRACKED_MODELS):
+            state = inspect(obj)
+            pending[(type(obj), _key(state))] = Change(type(obj), _key(state), None, _current(state))
+    for obj in session.dirty:
+        if isinstance(obj, TRACKED_MODELS) and session.is_modified(obj):
+            state = inspect(obj)
+            key = (type(obj), _key(state))
+            before = pending[key].before if key in pending else _previous(state)
+            pending[key] = Change(type(obj), key[1], before, _current(state))
+    for obj in session.deleted:
+        if isinstance(obj, TRACKED_MODELS):
+            state = inspect(obj)
+            key = (type(obj), _key(state))
+            before = pending[key].before if key in pending else _current(state)
+            pending[key] = Change(type(obj), key[1], before, None)
+
+
+@event.listens_for(db.session, "after_commit")
+def _publish_changes(session):
+    session.info.pop("savepoints", None)
+    changes = list(session.info.pop("tracked_changes", {}).values())
+    if changes:
+        notify(changes)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("tracked_changes", None)
+
+
+# La revenirea la un savepoint (ex: simularea modificărilor) se păstrează doar modificările
+# colectate înainte de savepoint
+@event.listens_for(db.session, "after_transaction_create")
+def _remember_savepoint(session, transaction):
+    if transaction.nested:
+        session.info.setdefault("savepoints", {})[transaction] = dict(session.info.get("tracked_changes", {}))
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _restore_savepoint(session, previous_transaction):
+    saved = session.info.get("savepoints", {}).pop(previous_transaction, None)
+    if saved is not None:
+        session.info["tracked_changes"] = saved
@@ -20,4 +20,31 @@ class Config:
     MAIL_PORT = os.getenv("MAIL_PORT")
     MAIL_USE_TLS = os.getenv("MAIL_USE_TLS")
     MAIL_SERVER = os.getenv("MAIL_SERVER")
+    # Durata (secunde) după care o zi din cache-ul de disponibilitate a sălilor este reîncărcată din BD
+    INTERVAL_INDEX_TTL = int(os.getenv("INTERVAL_INDEX_TTL", 60))
 
+    # Constrângeri pentru examenele unei grupe (0 dezactivează verificarea)
+    GROUP_MAX_EXAMS_PER_DAY = int(os.getenv("GROUP_MAX_EXAMS_PER_DAY", 0))
+    GROUP_MIN_DAYS_BETWEEN_EXAMS = int(os.getenv("GROUP_MIN_DAYS_BETWEEN_EXAMS", 0))
+    # Numărul de date alternative propuse la respingerea / conflictul unei propuneri
+    SUGGESTION_COUNT = int(os.getenv("SUGGESTION_COUNT", 5))
+    # Cache-ul fișierelor exportate: bugetul total în octeți și durata (secunde) unei intrări
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    EXPORT_CACHE_TTL = int(os.getenv("EXPORT_CACHE_TTL", 60))
+    # Numărul de procese pentru generarea broșurii PDF pe grupe, în fiecare worker gunicorn
+    # (0 = broșura este generată în procesul cererii, fără pool)
+    EXPORT_BOOKLET_WORKERS = int(os.getenv("EXPORT_BOOKLET_WORKERS", 0))
+    # Durata (secunde) după care un calendar .ics din cache este reconstruit
+    CALENDAR_FEED_TTL = int(os.getenv("CALENDAR_FEED_TTL", 300))
+    # Sincronizarea cu orar.usv.ro: cereri HTTP simultane și durata maximă (secunde) a unei cereri
+    SYNC_MAX_WORKERS = int(os.getenv("SYNC_MAX_WORKERS", 8))
+    SYNC_HTTP_TIMEOUT = float(os.getenv("SYNC_HTTP_TIMEOUT", 15))
+    # Workerul de sincronizare (`flask sync-worker`): intervalul (secunde) de verificare a joburilor noi,
+    # după cât timp fără semn de viață un job în curs este reluat și de câte ori
+    SYNC_JOB_POLL_INTERVAL = float(os.getenv("SYNC_JOB_POLL_INTERVAL", 5))
+    SYNC_JOB_STALE_AFTER = int(os.getenv("SYNC_JOB_STALE_AFTER", 300))
+    SYNC_JOB_MAX_ATTEMPTS = int(os.getenv("SYNC_JOB_MAX_ATTEMPTS", 3))
+    # Cache-ul pe disc al răspunsurilor orar.usv.ro: off, record, replay sau ttl (vezi app/http_cache.py)
+    SYNC_HTTP_CACHE = os.getenv("SYNC_HTTP_CACHE", "off")
+    SYNC_HTTP_CACHE_DIR = os.getenv("SYNC_HTTP_CACHE_DIR", os.path.join("tmp", "orar_cache"))
+    SYNC_HTTP_CACHE_TTL = int(os.getenv("SYNC_HTTP_CACHE_TTL", 24 * 60 * 60))
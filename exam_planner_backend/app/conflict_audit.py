@@ -0,0 +1,134 @@
+from datetime import date
+
+import click
+import numpy as np
+from flask.cli import with_appcontext
+from sqlalchemy import select
+
+from app.database import db
+from app.intervals import format_minutes, overlap_mask
+from app.models import Exam, ExamStatus
+
+# Resursele verificate: numele folosit în raport -> coloana din Exam
+AUDIT_RESOURCES = {
+    "room": "room_id",
+    "professor": "professor_id",
+    "assistant": "assistant_id",
+    "group": "group_id",
+}
+
+
+def load_accepted_exams():
+    """
+    Încarcă toate examenele acceptate (cu oră și durată) într-o singură interogare.
+
+    Returns:
+        dict: tablouri NumPy `exam_id`, `start`, `end` (minute absolute) și câte unul pentru fiecare resursă
+        (valorile lipsă sunt -1).
+    """
+    rows = db.session.execute(
+        select(Exam.exam_id, Exam.exam_date, Exam.start_time, Exam.duration,
+               Exam.room_id, Exam.professor_id, Exam.assistant_id, Exam.group_id)
+        .where(Exam.status == ExamStatus.ACCEPTAT,
+               Exam.start_time.isnot(None),
+               Exam.duration.isnot(None))
+    ).all()
+
+    count = len(rows)
+    exam_ids, dates, times, durations, *resources = zip(*rows) if rows else ([],) * 8
+
+    start = np.fromiter((d.toordinal() * 1440 + t.hour * 60 + t.minute for d, t in zip(dates, times)),
+                        dtype=np.int64, count=count)
+    columns = {
+        "exam_id": np.fromiter(exam_ids, dtype=np.int64, count=count),
+        "start": start,
+        "end": start + np.fromiter(durations, dtype=np.int64, count=count),
+    }
+    for field, values in zip(("room_id", "professor_id", "assistant_id", "group_id"), resources):
+        columns[field] = np.fromiter((-1 if v is None else v for v in values), dtype=np.int64, count=count)
+    return columns
+
+
+def find_overlaps(keys, starts, ends):
+    """
+    Găsește toate perechile de intervale care se suprapun pentru aceeași cheie (resursă).
+
+    Intervalele sunt sortate după (cheie, început) și codificate ca `rang_cheie * lățime + început`,
+    astfel încât fiecare cheie ocupă o bandă separată. Pentru intervalul i, `searchsorted` dă
+    capătul `hi[i]` al intervalelor din aceeași cheie care încep înainte de finalul lui; toate
+    pozițiile din (i, hi[i]) se suprapun cu i. Perechile sunt apoi expandate cu `np.repeat` și
+    `np.arange`, fără bucle Python: costul este O(n log n + numărul de perechi), iar fiecare
+    pereche este raportată o singură dată.
+
+    Args:
+        keys, starts, ends (np.ndarray): ID-ul resursei și intervalul [start, end) al fiecărui examen.
+
+    Returns:
+        tuple: (poziții, parteneri) — indici în tablourile inițiale; examenul `poziții[k]` se
+        suprapune cu examenul `parteneri[k]`, care începe înaintea lui (sau odată cu el).
+    """
+    keys, starts, ends = np.asarray(keys), np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+    valid = np.flatnonzero(keys >= 0)
+    if valid.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order = valid[np.lexsort((starts[valid], keys[valid]))]
+    _, rank = np.unique(keys[order], return_inverse=True)
+    sorted_starts, sorted_ends = starts[order], ends[order]
+
+    origin = sorted_starts.min()
+    width = max(int(sorted_ends.max()), int(sorted_starts.max())) - int(origin) + 1
+    band = rank.astype(np.int64) * width
+    hi = np.searchsorted(band + (sorted_starts - origin), band + (np.maximum(sorted_ends, sorted_starts) - origin))
+
+    first = np.arange(order.size)
+    counts = np.maximum(hi - first - 1, 0)
+    total = int(counts.sum())
+    earlier = np.repeat(first, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    later = earlier + offsets + 1
+
+    # un interval de durată zero care începe odată cu altul nu se suprapune cu acesta
+    keep = overlap_mask(sorted_starts[later], sorted_ends[later], sorted_starts[earlier], sorted_ends[earlier])
+    earlier, later = earlier[keep], later[keep]
+    sequence = np.lexsort((earlier, later))
+    return order[later[sequence]], order[earlier[sequence]]
+
+
+def audit_conflicts(columns=None):
+    """
+    Verifică întregul program al examenelor acceptate.
+
+    Returns:
+        list[dict]: câte o intrare pentru fiecare examen suprapus cu un alt examen pe aceeași
+        resursă (sală, profesor, asistent sau grupă).
+    """
+    if columns is None:
+        columns = load_accepted_exams()
+
+    report = []
+    exam_ids, starts = columns["exam_id"], columns["start"]
+    for resource, field in AUDIT_RESOURCES.items():
+        positions, partners = find_overlaps(columns[field], starts, columns["end"])
+        for position, partner in zip(positions.tolist(), partners.tolist()):
+            day, minute = divmod(int(starts[position]), 1440)
+            report.append({
+                "resource": resource,
+                "resource_id": int(columns[field][position]),
+                "exam_id": int(exam_ids[position]),
+                "conflicts_with": int(exam_ids[partner]),
+                "exam_date": date.fromordinal(day).isoformat(),
+                "start_time": format_minutes(minute),
+            })
+    return report
+
+
+@click.command("audit-conflicts")
+@with_appcontext
+def audit_conflicts_command():
+    """Afișează toate suprapunerile din programul examenelor acceptate."""
+    report = audit_conflicts()
+    for item in report:
+        click.echo(f"{item['resource']} {item['resource_id']}: examenul {item['exam_id']} se suprapune cu "
+                   f"{item['conflicts_with']} ({item['exam_date']} {item['start_time']})")
+    click.echo(f"{len(report)} conflicte găsite.")
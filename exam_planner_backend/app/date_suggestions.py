@@ -0,0 +1,138 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.config import Config
+from app.database import db
+from app.group_constraints import check_group_date, load_group_dates
+from app.intervals import as_date, as_minutes, format_minutes
+from app.models import Exam, ExamStatus, ExaminationPeriod, Room
+
+# Grila zilnică pe care se caută alternative: 08:00 - 20:00, în pași de 30 de minute
+DAY_START = 8 * 60
+DAY_END = 20 * 60
+SLOT_MINUTES = 30
+DEFAULT_DURATION = 120
+
+
+def _slot_mask(start, end):
+    """Bitmap-ul intervalelor din grilă atinse de [start, end) (bitul i = intervalul DAY_START + i * SLOT_MINUTES)."""
+    first = max(0, (start - DAY_START) // SLOT_MINUTES)
+    last = min((DAY_END - DAY_START) // SLOT_MINUTES, -(-(end - DAY_START) // SLOT_MINUTES))
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _start_mask(free, needed, slots):
+    """Biții de start de la care urmează `needed` intervale libere consecutive în bitmap-ul `free`."""
+    run = free
+    for shift in range(1, needed):
+        run &= free >> shift
+    return run & ((1 << (slots - needed + 1)) - 1)
+
+
+def _exam_days(exam_type, not_before=None):
+    days = set()
+    for period_start, period_end in db.session.execute(
+            select(ExaminationPeriod.period_start, ExaminationPeriod.period_end)
+            .where(ExaminationPeriod.name == exam_type)):
+        day = max(period_start, not_before) if not_before else period_start
+        while day <= period_end:
+            if day.weekday() < 5:
+                days.add(day)
+            day += timedelta(days=1)
+    return days
+
+
+def suggest_alternatives(exam, professor_id=None, duration=None, room_id=None, exclude_date=None,
+                         not_before=None, k=None):
+    """
+    Propune primele `k` date și ore libere pentru un examen, în perioada de examinare a tipului său.
+
+    Pentru fiecare zi se construiesc bitmap-uri (întregi Python, un bit pentru fiecare interval de
+    `SLOT_MINUTES`) cu timpul ocupat al profesorului, al grupei și al fiecărei săli, dintr-o singură
+    interogare a examenelor acceptate din perioadă. Zilele sunt parcurse în ordinea apropierii de data
+    propusă și sunt păstrate doar cele care respectă și constrângerile grupei (vezi `check_group_date`).
+
+    Args:
+        exam (Exam): Examenul pentru care se caută alternative.
+        professor_id (int, optional): Profesorul care va susține examenul (implicit `exam.professor_id`).
+        duration (int, optional): Durata în minute (implicit durata examenului sau DEFAULT_DURATION).
+        room_id (int, optional): Sala preferată; este încercată prima.
+        exclude_date (date, optional): O dată care nu trebuie propusă (ex: data respinsă).
+        not_before (date, optional): Prima dată care poate fi propusă.
+        k (int, optional): Numărul maxim de sugestii (implicit `Config.SUGGESTION_COUNT`).
+
+    Returns:
+        list[dict]: Sugestii {"exam_date": "YYYY-MM-DD", "start_time": "HH:MM", "room_id": int}.
+    """
+    k = Config.SUGGESTION_COUNT if k is None else k
+    duration = int(duration or exam.duration or DEFAULT_DURATION)
+    professor_id = professor_id or exam.professor_id
+    near = as_date(exam.exam_date)
+
+    days = _exam_days(exam.type, not_before)
+    days.discard(as_date(exclude_date) if exclude_date else None)
+    if not days or k <= 0:
+        return []
+
+    slots = (DAY_END - DAY_START) // SLOT_MINUTES
+    needed = -(-duration // SLOT_MINUTES)
+    if needed > slots:
+        return []
+    full = (1 << slots) - 1
+
+    busy = defaultdict(int)
+    for exam_date, start_time, exam_duration, exam_room, exam_professor, exam_group in db.session.execute(
+            select(Exam.exam_date, Exam.start_time, Exam.duration, Exam.room_id, Exam.professor_id, Exam.group_id)
+            .where(Exam.exam_date.between(min(days), max(days)),
+                   Exam.status == ExamStatus.ACCEPTAT,
+                   Exam.start_time.isnot(None),
+                   Exam.duration.isnot(None),
+                   Exam.exam_id != exam.exam_id)):
+        start = as_minutes(start_time)
+        mask = _slot_mask(start, start + exam_duration)
+        if exam_room is not None:
+            busy[(exam_date, exam_room)] |= mask
+        if professor_id is not None and exam_professor == professor_id:
+            busy[(exam_date, "professor")] |= mask
+        if exam_group == exam.group_id:
+            busy[(exam_date, "group")] |= mask
+
+    room_ids = db.session.execute(select(Room.room_id).order_by(Room.room_id)).scalars().all()
+    if room_id in room_ids:
+        room_ids.remove(room_id)
+        room_ids.insert(0, room_id)
+
+    group_dates = load_group_dates(exam.group_id)
+    suggestions = []
+    for day in sorted(days, key=lambda d: (abs((d - near).days), d)):
+        if check_group_date(exam.group_id, day, exclude_exam_id=exam.exam_id, group_dates=group_dates):
+            continue
+        starts = _start_mask(full & ~(busy[(day, "professor")] | busy[(day, "group")]), needed, slots)
+        best = None
+        for candidate in room_ids:
+            room_starts = starts & _start_mask(full & ~busy[(day, candidate)], needed, slots)
+            if room_starts:
+                first = (room_starts & -room_starts).bit_length() - 1
+                if best is None or first < best[0]:
+                    best = (first, candidate)
+                if first == 0:
+                    break
+        if best is None:
+            continue
+        suggestions.append({
+            "exam_date": day.isoformat(),
+            "start_time": format_minutes(DAY_START + best[0] * SLOT_MINUTES),
+            "room_id": best[1],
+        })
+        if len(suggestions) >= k:
+            break
+    return suggestions
+
+
+def format_alternatives(suggestions):
+    """Textul cu sugestiile, pentru notificările prin email."""
+    return "\n".join(f"- {s['exam_date']} ora {s['start_time']}" for s in suggestions)
@@ -5,6 +5,12 @@ from flask_jwt_extended import verify_jwt_in_request, get_jwt
 
 
 def roles_required(*allowed_roles):
+    """
+    Verifică token-ul JWT și rolul din claim-uri.
+
+    Rolul și, pentru șefii de grupă, grupa vin din token; utilizatorul este încărcat cel mult o dată
+    pe cerere, la primul acces la `app.identity.current_user`.
+    """
     def wrapper(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
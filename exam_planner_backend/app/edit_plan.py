@@ -0,0 +1,214 @@
+from datetime import date, datetime, time as time_type
+from enum import Enum
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.interval_index import RESOURCE_FIELDS
+from app.intervals import as_date, exam_span, overlap_mask
+from app.models import Exam, ExamStatus, ExamType, Room, User, UserRole, exclusion_violation_field
+
+# Câmpurile unui examen care pot fi modificate de secretariat, în ordinea aplicării
+EDITABLE_FIELDS = ("exam_date", "type", "room_id", "professor_id", "assistant_id", "status",
+                   "start_time", "duration", "details")
+
+CONFLICT_LABELS = {
+    "room_id": "Sala",
+    "assistant_id": "Asistentul",
+    "professor_id": "Profesorul",
+}
+
+
+class PlanError(ValueError):
+    """Planul de modificări nu are formatul așteptat."""
+
+
+def _parse(field, value):
+    if value is None:
+        return None
+    try:
+        if field == "exam_date":
+            return as_date(value)
+        if field == "start_time":
+            return datetime.strptime(value[:5], "%H:%M").time() if isinstance(value, str) else value
+        if field == "type":
+            return ExamType[value].name
+        if field == "status":
+            return ExamStatus[value]
+        if field in ("room_id", "professor_id", "assistant_id", "duration"):
+            return int(value)
+    except (KeyError, TypeError, ValueError):
+        raise PlanError(f"Valoare invalidă pentru '{field}': {value}")
+    return value
+
+
+def _serialize(value):
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, time_type):
+        return value.strftime("%H:%M")
+    return value
+
+
+def _interval(exam):
+    if exam.status != ExamStatus.ACCEPTAT or exam.end_minute is None:
+        return None
+    return exam.start_minute, exam.end_minute
+
+
+def _check_references(edits, exams):
+    """Verifică, cu câte o interogare, că sălile și cadrele didactice din plan există."""
+    problems = []
+    room_ids = {edit["room_id"] for edit in edits if edit.get("room_id") is not None}
+    user_ids = {edit[f] for edit in edits for f in ("professor_id", "assistant_id") if edit.get(f) is not None}
+    rooms = set(db.session.execute(select(Room.room_id).where(Room.room_id.in_(room_ids))).scalars())
+    teachers = set(db.session.execute(
+        select(User.user_id).where(User.user_id.in_(user_ids), User.role == UserRole.CD)).scalars())
+
+    for edit in edits:
+        exam_id = edit["exam_id"]
+        if exam_id not in exams:
+            problems.append({"exam_id": exam_id, "field": None, "conflicts_with": None,
+                             "msg": "Examenul nu a fost găsit!"})
+            continue
+        if edit.get("room_id") is not None and edit["room_id"] not in rooms:
+            problems.append({"exam_id": exam_id, "field": "room_id", "conflicts_with": None,
+                             "msg": "Sala specificată nu există."})
+        for field, label in (("assistant_id", "Asistentul"), ("professor_id", "Profesorul")):
+            if edit.get(field) is not None and edit[field] not in teachers:
+                problems.append({"exam_id": exam_id, "field": field, "conflicts_with": None,
+                                 "msg": f"{label} nu există sau nu este cadru didactic (CD)."})
+    return problems
+
+
+def _find_overlaps(edited):
+    """
+    Caută toate suprapunerile examenelor modificate, atât cu examenele din BD, cât și între ele.
+
+    Examenele acceptate din zilele afectate sunt încărcate cu o singură interogare și grupate
+    pe (zi, resursă) împreună cu starea planificată, ca tablouri sortate după început; fiecare
+    examen modificat este comparat cu toate intervalele grupei printr-un singur `overlap_mask`.
+    """
+    days = {exam.exam_date for exam in edited if _interval(exam)}
+    if not days:
+        return []
+
+    edited_ids = {exam.exam_id for exam in edited}
+    groups = {}
+    for exam_id, exam_date, start_time, duration, *resources in db.session.execute(
+            select(Exam.exam_id, Exam.exam_date, Exam.start_time, Exam.duration,
+                   *(getattr(Exam, field) for field in RESOURCE_FIELDS))
+            .where(Exam.exam_date.in_(days),
+                   Exam.status == ExamStatus.ACCEPTAT,
+                   Exam.start_time.isnot(None),
+                   Exam.duration.isnot(None),
+                   Exam.exam_id.notin_(edited_ids))):
+        span = exam_span(start_time, duration)
+        for field, value in zip(RESOURCE_FIELDS, resources):
+            if value is not None:
+                groups.setdefault((exam_date, field, value), []).append((*span, exam_id))
+
+    for exam in edited:
+        interval = _interval(exam)
+        if interval:
+            for field in RESOURCE_FIELDS:
+                value = getattr(exam, field)
+                if value is not None:
+                    groups.setdefault((exam.exam_date, field, value), []).append((*interval, exam.exam_id))
+    groups = {key: np.array(sorted(rows), dtype=np.int64) for key, rows in groups.items()}
+
+    conflicts, seen = [], set()
+    for exam in edited:
+        interval = _interval(exam)
+        if not interval:
+            continue
+        for field in RESOURCE_FIELDS:
+            value = getattr(exam, field)
+            if value is None:
+                continue
+            rows = groups[(exam.exam_date, field, value)]
+            hits = rows[overlap_mask(rows[:, 0], rows[:, 1], *interval) & (rows[:, 2] != exam.exam_id), 2]
+            if not hits.size:
+                continue
+            # ca în `IntervalList.find`: examenul care începe cel mai târziu
+            other = int(hits[-1])
+            if (field, other, exam.exam_id) in seen:
+                continue
+            seen.add((field, exam.exam_id, other))
+            conflicts.append({"exam_id": exam.exam_id, "field": field, "conflicts_with": other,
+                              "msg": f"{CONFLICT_LABELS[field]} este ocupat în intervalul propus."})
+    return conflicts
+
+
+def run_edit_plan(edits, dry_run=True):
+    """
+    Aplică un plan de modificări pentru mai multe examene într-un savepoint.
+
+    Toate modificările sunt aplicate, apoi sunt verificate împreună (existența sălilor și a
+    cadrelor didactice, suprapunerile de sală / asistent / profesor, constrângerile BD la flush).
+    Dacă `dry_run` este adevărat sau există conflicte, savepoint-ul este anulat; altfel
+    modificările sunt salvate toate odată.
+
+    Args:
+        edits (list[dict]): Modificările, fiecare cu `exam_id` și câmpurile din `EDITABLE_FIELDS`.
+        dry_run (bool): Doar simulează planul.
+
+    Returns:
+        dict: {"applied": bool, "conflicts": [...], "diff": [{"exam_id", "changes": {câmp: {"before", "after"}}}]}
+
+    Raises:
+        PlanError: Dacă planul nu are formatul așteptat.
+    """
+    if not isinstance(edits, list) or not edits:
+        raise PlanError("Planul trebuie să conțină o listă nevidă de modificări.")
+
+    parsed = []
+    for edit in edits:
+        if not isinstance(edit, dict) or not isinstance(edit.get("exam_id"), int):
+            raise PlanError("Fiecare modificare trebuie să conțină exam_id.")
+        parsed.append({"exam_id": edit["exam_id"],
+                       **{field: _parse(field, edit[field]) for field in EDITABLE_FIELDS if field in edit}})
+    if len({edit["exam_id"] for edit in parsed}) != len(parsed):
+        raise PlanError("Un examen poate apărea o singură dată în plan.")
+
+    exams = {exam.exam_id: exam for exam in
+             Exam.query.filter(Exam.exam_id.in_([edit["exam_id"] for edit in parsed])).all()}
+    conflicts = _check_references(parsed, exams)
+
+    savepoint = db.session.begin_nested()
+    diff, edited = [], []
+    with db.session.no_autoflush:
+        for edit in parsed:
+            exam = exams.get(edit["exam_id"])
+            if exam is None:
+                continue
+            changes = {}
+            for field in EDITABLE_FIELDS:
+                if field in edit and getattr(exam, field) != edit[field]:
+                    changes[field] = {"before": _serialize(getattr(exam, field)), "after": _serialize(edit[field])}
+                    setattr(exam, field, edit[field])
+            diff.append({"exam_id": exam.exam_id, "changes": changes})
+            edited.append(exam)
+
+        conflicts.extend(_find_overlaps(edited))
+
+    if not conflicts:
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            field = exclusion_violation_field(e)
+            conflicts.append({"exam_id": None, "field": field, "conflicts_with": None,
+                              "msg": f"{CONFLICT_LABELS[field]} este ocupat în intervalul propus." if field
+                              else "Modificările încalcă o constrângere a bazei de date."})
+
+    if dry_run or conflicts:
+        savepoint.rollback()
+        return {"applied": False, "conflicts": conflicts, "diff": diff}
+
+    savepoint.commit()
+    db.session.commit()
+    return {"applied": True, "conflicts": [], "diff": diff}
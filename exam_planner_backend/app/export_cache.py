@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.change_tracking import subscribe
+from app.config import Config
+
+# Crește la orice modificare a formatului fișierelor exportate (coloane, stil), pentru ETag-uri noi
+EXPORT_FORMAT_VERSION = 1
+
+
+class ExportCache:
+    """
+    Cache LRU pentru fișierele exportate (Excel / PDF), limitat ca număr total de octeți.
+
+    Cheile conțin versiunea programului, care crește după orice commit ce modifică examene,
+    săli, cursuri, grupe sau utilizatori; fișierele vechi nu mai sunt cerute și sunt eliminate
+    de politica LRU când bugetul `max_bytes` este depășit. Fiecare proces gunicorn are propria
+    versiune, așa că intrările expiră și după `ttl` secunde pentru modificările altor procese.
+
+    ETag-ul este hash-ul liniilor exportate (nu al fișierului, care conține data generării),
+    deci este același în toate procesele și la orice moment pentru aceleași date.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=60):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Marchează toate fișierele din cache ca fiind vechi."""
+        with self._lock:
+            self.version += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _store(self, key, entry):
+        if len(entry[2]) > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += len(entry[2])
+        while self.size > self.max_bytes:
+            _, (_, _, data) = self._entries.popitem(last=False)
+            self.size -= len(data)
+
+    def get_or_render(self, name, load, render):
+        """
+        Returnează (etag, conținut) pentru exportul `name`, generându-l cu `render(load())` doar dacă lipsește.
+
+        Args:
+            name (str): Numele exportului, cu filtrele (ex: "exams-xlsx?group_id=3").
+            load (callable): Funcție care întoarce liniile exportului (generator sau dict {grupă: linii}).
+            render (callable): Funcție care primește liniile și întoarce conținutul fișierului (bytes).
+        """
+        with self._lock:
+            key = (name, self.version)
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            if entry is not None:
+                del self._entries[key]
+                self.size -= len(entry[2])
+
+        digest = hashlib.sha1(f"{EXPORT_FORMAT_VERSION}:{name}".encode())
+        data = render(_digest_rows(load(), digest))
+        etag = digest.hexdigest()
+        with self._lock:
+            if key not in self._entries:
+                self._store(key, (time.monotonic(), etag, data))
+        return etag, data
+
+
+def _digest_rows(rows, digest):
+    """Adaugă liniile exportului la `digest`; un generator este citit o singură dată, pe măsură ce este randat."""
+    if isinstance(rows, dict):
+        digest.update(repr(rows).encode())
+        return rows
+    return _digested(rows, digest)
+
+
+def _digested(rows, digest):
+    for row in rows:
+        digest.update(repr(row).encode())
+        yield row
+
+
+export_cache = ExportCache(max_bytes=Config.EXPORT_CACHE_MAX_BYTES, ttl=Config.EXPORT_CACHE_TTL)
+
+
+@subscribe
+def _bump_export_version(changes):
+    # Toate modelele urmărite (examene, săli, cursuri, grupe, utilizatori) apar în exporturi
+    if changes:
+        export_cache.bump()
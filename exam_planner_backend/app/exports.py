@@ -0,0 +1,189 @@
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from openpyxl import Workbook
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, LongTable, TableStyle
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.config import Config
+from app.database import db
+from app.models import Exam, Course, Group, Room, User
+
+EXPORT_HEADER = ["Grupa", "Disciplina", "Examinator", "Asistent", "Data examen/colocviu", "Ora examen/colocviu",
+                 "Sala"]
+
+# Filtrele acceptate de exporturi: numele parametrului -> condiția SQL
+EXPORT_FILTERS = {
+    "group_id": lambda value: Exam.group_id == value,
+    "professor_id": lambda value: Exam.professor_id == value,
+    "specialization": lambda value: Group.specialization == value,
+    "study_year": lambda value: Group.year_of_study == value,
+    "date_from": lambda value: Exam.exam_date >= value,
+    "date_to": lambda value: Exam.exam_date <= value,
+}
+
+PDF_FONT = "DejaVuSans"
+PDF_FONT_PATH = os.path.join(os.path.dirname(__file__), 'static', 'DejaVuSans.ttf')
+PDF_TITLE = "Programarea colocviilor si examenelor"
+
+PDF_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), PDF_FONT),  # Folosește fontul înregistrat
+    ('FONTSIZE', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.whitesmoke),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Înălțimile rândurilor (capul de tabel / rândurile cu date) pentru fontul de 6pt; fiind fixe,
+# ReportLab nu mai măsoară toate celulele la fiecare împărțire pe pagini
+PDF_HEADER_HEIGHT = 27
+PDF_ROW_HEIGHT = 18
+
+# Caracterele permise în numele fișierelor din arhiva broșurii
+SAFE_FILENAME = re.compile(r"[^\w.-]+")
+
+_font_lock = threading.Lock()
+_pool_lock = threading.Lock()
+_booklet_pool = None
+
+
+def register_pdf_font():
+    """Înregistrează fontul pentru PDF o singură dată pe proces."""
+    if PDF_FONT in pdfmetrics.getRegisteredFontNames():
+        return
+    with _font_lock:
+        if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(PDF_FONT, PDF_FONT_PATH))
+
+
+def _export_rows(filters):
+    professor = aliased(User)
+    assistant = aliased(User)
+    stmt = (
+        select(Exam.group_id, Group.name, Group.year_of_study, Group.specialization, Course.name, professor.name,
+               assistant.name, Exam.exam_date, Exam.start_time, Room.name)
+        .select_from(Exam)
+        .outerjoin(Course, Course.course_id == Exam.course_id)
+        .outerjoin(Group, Group.group_id == Exam.group_id)
+        .outerjoin(Room, Room.room_id == Exam.room_id)
+        .outerjoin(professor, professor.user_id == Exam.professor_id)
+        .outerjoin(assistant, assistant.user_id == Exam.assistant_id)
+        .where(*(EXPORT_FILTERS[name](value) for name, value in (filters or {}).items()))
+        .order_by(Exam.exam_date.asc(), Exam.start_time.asc(), Exam.exam_id.asc())
+        .execution_options(yield_per=500)
+    )
+    for (group_id, group_name, year_of_study, specialization, course_name, professor_name, assistant_name,
+         exam_date, start_time, room_name) in db.session.execute(stmt):
+        yield group_id, group_name, [
+            f"{group_name}/{year_of_study}/{specialization}" if group_name else "N/A",
+            course_name or "N/A",
+            professor_name or "N/A",
+            assistant_name or "N/A",
+            exam_date.strftime("%Y-%m-%d"),  # Formatează data
+            start_time.strftime("%H:%M") if start_time else "N/A",  # Formatează ora
+            room_name or "N/A",  # Verifică dacă există sală
+        ]
+
+
+def exam_export_rows(filters=None):
+    """
+    Returnează, ca generator, liniile de export pentru examenele care respectă filtrele.
+
+    Datele vin dintr-o singură interogare (examene JOIN cursuri, grupe, săli, profesori, asistenți),
+    citită pe bucăți, astfel încât numărul de interogări nu depinde de numărul de examene.
+
+    Args:
+        filters (dict, optional): Valorile pentru cheile din `EXPORT_FILTERS`, deja validate.
+    """
+    for _, _, row in _export_rows(filters):
+        yield row
+
+
+def exam_export_rows_by_group(filters=None):
+    """Grupează liniile de export după grupă: {numele grupei: [linii]}, tot dintr-o singură interogare."""
+    groups = {}
+    for _, group_name, row in _export_rows(filters):
+        groups.setdefault(group_name or "fara_grupa", []).append(row)
+    return groups
+
+
+def render_xlsx(rows):
+    """Generează fișierul Excel (bytes) pentru liniile date."""
+    # Workbook în modul write-only: liniile sunt scrise pe măsură ce sunt citite din BD
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Examene")
+
+    ws.append(EXPORT_HEADER)
+    for row in rows:
+        ws.append(row)
+
+    excel_file = BytesIO()
+    wb.save(excel_file)
+    return excel_file.getvalue()
+
+
+def render_pdf(rows, title=PDF_TITLE):
+    """Generează fișierul PDF (bytes) pentru liniile date."""
+    register_pdf_font()
+
+    data = [EXPORT_HEADER]
+    data.extend(rows)
+
+    # PDF-ul este generat în memorie: fiecare cerere are propriul fișier
+    pdf_file = BytesIO()
+    doc = SimpleDocTemplate(pdf_file, pagesize=landscape(letter))  # Format landscape
+
+    styles = getSampleStyleSheet()
+    title_paragraph = Paragraph(title, styles['Title'])
+    # LongTable se împarte pe pagini și repetă capul de tabel pe fiecare pagină
+    table = LongTable(data, repeatRows=1, rowHeights=[PDF_HEADER_HEIGHT] + [PDF_ROW_HEIGHT] * (len(data) - 1))
+    table.setStyle(PDF_TABLE_STYLE)
+
+    doc.build([title_paragraph, table])
+    return pdf_file.getvalue()
+
+
+def _render_group_pdf(group_name, rows):
+    return render_pdf(rows, title=f"{PDF_TITLE} - grupa {group_name}")
+
+
+def _get_booklet_pool():
+    global _booklet_pool
+    with _pool_lock:
+        if _booklet_pool is None:
+            _booklet_pool = ProcessPoolExecutor(max_workers=Config.EXPORT_BOOKLET_WORKERS)
+        return _booklet_pool
+
+
+def render_booklet(groups):
+    """
+    Generează câte un PDF pentru fiecare grupă și le arhivează într-un ZIP (bytes).
+
+    Cu `EXPORT_BOOKLET_WORKERS` > 0, PDF-urile sunt generate în paralel într-un pool de procese
+    (ReportLab folosește doar CPU), refolosit între cereri; implicit, sau pentru o singură grupă,
+    sunt generate direct în procesul cererii.
+    """
+    names = list(groups)
+    if len(names) > 1 and Config.EXPORT_BOOKLET_WORKERS > 0:
+        pdfs = _get_booklet_pool().map(_render_group_pdf, names, [groups[name] for name in names])
+    else:
+        pdfs = [_render_group_pdf(name, groups[name]) for name in names]
+
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, pdf in zip(names, pdfs):
+            zf.writestr(f"examene_{SAFE_FILENAME.sub('_', name)}.pdf", pdf)
+    return archive.getvalue()
@@ -0,0 +1,81 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from sqlalchemy import select
+
+from app.config import Config
+from app.database import db
+from app.intervals import as_date
+from app.models import Exam, ExamStatus
+
+
+def load_group_dates(group_id):
+    """
+    Datele examenelor propuse sau acceptate ale unei grupe, citite din BD.
+
+    O singură interogare pe indexul `ix_exams_group_date`; rezultatul este citit la fiecare
+    verificare (nu este păstrat între cereri), deci vede și examenele salvate de alte procese.
+
+    Returns:
+        tuple: (ordinalele datelor sortate, ID-urile examenelor în aceeași ordine)
+    """
+    rows = db.session.execute(
+        select(Exam.exam_date, Exam.exam_id)
+        .where(Exam.group_id == group_id,
+               Exam.status != ExamStatus.RESPINS)
+        .order_by(Exam.exam_date, Exam.exam_id)
+    ).all()
+    return [exam_date.toordinal() for exam_date, _ in rows], [exam_id for _, exam_id in rows]
+
+
+def check_group_date(group_id, exam_date, exclude_exam_id=None, max_per_day=None, min_days_between=None,
+                     group_dates=None):
+    """
+    Verifică constrângerile grupei pentru o dată nouă de examen.
+
+    Args:
+        group_id (int): ID-ul grupei.
+        exam_date (date | str): Data propusă.
+        exclude_exam_id (int, optional): Examenul care se reprogramează (ignorat).
+        max_per_day (int, optional): Numărul maxim de examene pe zi (implicit din Config; 0 dezactivează
+            verificarea).
+        min_days_between (int, optional): Numărul minim de zile între două examene din zile
+            diferite (implicit din Config; 0 dezactivează verificarea).
+        group_dates (tuple, optional): Rezultatul `load_group_dates` din aceeași cerere, pentru verificarea
+            mai multor date cu o singură interogare.
+
+    Returns:
+        str | None: Mesajul de eroare sau None dacă data respectă constrângerile.
+    """
+    if max_per_day is None:
+        max_per_day = Config.GROUP_MAX_EXAMS_PER_DAY
+    if min_days_between is None:
+        min_days_between = Config.GROUP_MIN_DAYS_BETWEEN_EXAMS
+    if not max_per_day and not min_days_between:
+        return None
+
+    day = as_date(exam_date).toordinal()
+    dates, ids = group_dates if group_dates is not None else load_group_dates(group_id)
+
+    first, last = bisect_left(dates, day), bisect_right(dates, day)
+    same_day = sum(1 for exam_id in ids[first:last] if exam_id != exclude_exam_id)
+    if max_per_day and same_day >= max_per_day:
+        return f"Grupa are deja {same_day} examen(e) în această zi (maxim {max_per_day})."
+
+    if min_days_between:
+        neighbours = []
+        i = first - 1
+        while i >= 0 and ids[i] == exclude_exam_id:
+            i -= 1
+        if i >= 0:
+            neighbours.append(dates[i])
+        i = last
+        while i < len(ids) and ids[i] == exclude_exam_id:
+            i += 1
+        if i < len(ids):
+            neighbours.append(dates[i])
+        for other in neighbours:
+            if abs(other - day) < min_days_between:
+                return (f"Între două examene ale grupei trebuie să fie cel puțin {min_days_between} zile "
+                        f"(există un examen pe {date.fromordinal(other).isoformat()}).")
+    return None
@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Modurile cache-ului HTTP al sincronizării (`SYNC_HTTP_CACHE`):
+#   off    - cereri directe, fără cache
+#   record - cereri directe; răspunsurile sunt salvate pe disc
+#   replay - răspunsurile sunt citite doar de pe disc, fără acces la rețea
+#   ttl    - răspunsurile de pe disc mai noi de `SYNC_HTTP_CACHE_TTL` secunde sunt refolosite,
+#            celelalte sunt cerute din nou și salvate
+CACHE_MODES = ("off", "record", "replay", "ttl")
+
+# Antetele păstrate împreună cu corpul răspunsului
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Adaptor `requests` care înregistrează / redă răspunsurile GET de pe disc.
+
+    Fiecare răspuns 200 este un fișier gzip (`<sha256(url)>.gz`): o linie JSON cu URL-ul, statusul,
+    antetele și momentul descărcării, urmată de corpul răspunsului. Adaptorul este montat în sesiunea
+    sincronizării, deci codul care face cererile nu știe de cache.
+    """
+
+    def __init__(self, mode, directory, ttl, **kwargs):
+        super().__init__(**kwargs)
+        self.mode, self.directory, self.ttl = mode, directory, ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + ".gz")
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        path = self.path(request.url)
+        cached = self.read(path)
+        if self.mode == "replay":
+            if cached is None:
+                raise requests.ConnectionError(f"{request.url} nu există în cache-ul HTTP (mod replay)",
+                                               request=request)
+            return self.build_response_from_cache(request, *cached)
+        if self.mode == "ttl" and cached is not None and time.time() - cached[0]["fetched_at"] < self.ttl:
+            return self.build_response_from_cache(request, *cached)
+
+        if cached is None:
+            # Fără o copie locală, un 304 nu ar avea ce înregistra
+            for header in CONDITIONAL_HEADERS:
+                request.headers.pop(header, None)
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            self.write(path, request.url, response.status_code, response.headers, response.content)
+        elif response.status_code == 304 and cached is not None:
+            meta, body = cached
+            self.write(path, request.url, meta["status"], meta["headers"], body)
+        return response
+
+    @staticmethod
+    def read(path):
+        """(metadate, corp) pentru un răspuns înregistrat, sau None."""
+        try:
+            with gzip.open(path, "rb") as f:
+                return json.loads(f.readline()), f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, path, url, status, headers, body):
+        meta = {"url": url, "status": status, "fetched_at": time.time(),
+                "headers": {name: headers[name] for name in CACHED_HEADERS if name in headers}}
+        # Scriem într-un fișier temporar, astfel încât un cititor nu vede niciodată o intrare parțială
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    def build_response_from_cache(self, request, meta, body):
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
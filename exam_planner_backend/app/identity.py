@@ -0,0 +1,106 @@
+from typing import NamedTuple, Optional
+
+from flask import g
+from flask_jwt_extended import get_jwt
+from werkzeug.local import LocalProxy
+
+from app.database import db
+from app.models import User, Group
+
+
+class GroupClaims(NamedTuple):
+    """
+    Grupa condusă de utilizatorul curent (șef de grupă), așa cum apare în token.
+
+    Atribute:
+        group_id (int): ID-ul grupei.
+        specialization (str, optional): Specializarea grupei.
+        study_year (int, optional): Anul de studiu al grupei.
+    """
+    group_id: int
+    specialization: Optional[str]
+    study_year: Optional[int]
+
+
+def token_claims(user):
+    """
+    Claim-urile adăugate în token-ul JWT al unui utilizator.
+
+    Pe lângă rol, token-ul unui șef de grupă conține grupa, specializarea și anul de studiu,
+    astfel încât rutele nu mai caută grupa la fiecare cerere.
+    """
+    claims = {"role": user.role.value, "group_id": None, "specialization": None, "study_year": None}
+    if user.led_groups:
+        group = user.led_groups[0]
+        claims.update(group_id=group.group_id, specialization=group.specialization,
+                      study_year=group.year_of_study)
+    return claims
+
+
+def _per_token(name, load):
+    """
+    Valoarea `load(claims)` calculată o singură dată pentru token-ul verificat în cererea curentă.
+
+    Cheia este obiectul claim-urilor pus în `g` de `verify_jwt_in_request`, nu doar `g`: în teste
+    mai multe cereri pot rula în același context de aplicație.
+    """
+    claims = get_jwt()
+    cached = g.get(name)
+    if cached is None or cached[0] is not claims:
+        cached = (claims, load(claims))
+        setattr(g, name, cached)
+    return cached[1]
+
+
+def _load_user(claims):
+    identity = claims.get("sub")
+    return db.session.get(User, int(identity)) if str(identity).isdigit() else None
+
+
+def _load_group(claims):
+    if "group_id" in claims:
+        if claims["group_id"] is None:
+            return None
+        return GroupClaims(claims["group_id"], claims.get("specialization"), claims.get("study_year"))
+    return _load_led_group(claims)
+
+
+def _load_led_group(claims):
+    if not str(claims.get("sub")).isdigit():
+        return None
+    row = db.session.execute(
+        db.select(Group.group_id, Group.specialization, Group.year_of_study)
+        .where(Group.leader_id == int(claims["sub"]))
+    ).first()
+    return GroupClaims(*row) if row else None
+
+
+def get_current_user():
+    """
+    Utilizatorul din token-ul cererii curente, încărcat o singură dată pe cerere (None dacă nu există).
+
+    Rutele și funcțiile apelate de ele folosesc aceeași instanță în loc să repete
+    `User.query.get(get_jwt_identity())`.
+    """
+    return _per_token("_current_user", _load_user)
+
+
+# Proxy către `get_current_user()`, folosit în rutele protejate de `roles_required` / `jwt_required`
+current_user = LocalProxy(get_current_user)
+
+
+def current_group(verify=False):
+    """
+    Grupa condusă de utilizatorul curent, ca `GroupClaims`, sau None dacă nu conduce nicio grupă.
+
+    Valorile vin din claim-urile token-ului; pentru token-urile emise înainte de aceste claim-uri
+    grupa este căutată o singură dată pe cerere.
+
+    Args:
+        verify (bool): Caută grupa în BD în loc să folosească claim-urile. Folosit de rutele care
+            modifică date: un șef de grupă schimbat între timp nu mai poate acționa pentru grupă
+            până la expirarea token-ului vechi.
+    """
+    if verify:
+        return _per_token("_verified_group", _load_led_group)
+    return _per_token("_current_group", _load_group)
@@ -1,7 +1,17 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import requests
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.database import db
-from app.models import User, UserRole, Course, Room
+from app.http_cache import CACHE_MODES, CachingAdapter
+from app.models import User, UserRole, Course, Room, TimetableSyncState, course_assistants
 
 API_PROFESSORS = "https://orar.usv.ro/orar/vizualizare/data/cadre.php?json"
 API_COURSES = "https://orar.usv.ro/orar/vizualizare/data/orarSPG.php?ID={}&mod=prof&json"
@@ -21,105 +31,340 @@ def add_admin():
         db.session.commit()
 
 
-def fetch_and_store_data():
-    """ Preia profesorii și cursurile asociate și le salvează în baza de date. """
-    response = requests.get(API_PROFESSORS)
+def http_session(pool_size, cache_mode="off", cache_dir=None, cache_ttl=None):
+    """
+    Sesiune HTTP comună pentru sincronizare: conexiunile către orar.usv.ro sunt păstrate (keep-alive)
+    și refolosite de toate firele, cel mult `pool_size` deschise simultan.
+
+    Cu un `cache_mode` diferit de "off", răspunsurile sunt înregistrate / redate de pe disc (vezi
+    `app.http_cache.CACHE_MODES`).
+    """
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"Mod necunoscut pentru cache-ul HTTP al sincronizării: {cache_mode}")
+    pool = {"pool_connections": 1, "pool_maxsize": pool_size, "pool_block": True}
+    if cache_mode == "off":
+        adapter = HTTPAdapter(**pool)
+    else:
+        adapter = CachingAdapter(cache_mode, cache_dir, cache_ttl, **pool)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_json(session, url, timeout):
+    """Răspunsul JSON de la `url`, sau None dacă cererea eșuează / depășește `timeout` secunde."""
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Eroare la accesarea {url}: {e}")
+        return None
     if response.status_code != 200:
-        print("Eroare la preluarea profesorilor")
+        print(f"Eroare la accesarea {url}: HTTP {response.status_code}")
+        return None
+    return response.json()
+
+
+class FetchedTimetable(NamedTuple):
+    """
+    Orarul modificat al unui profesor, împreună cu validatorii HTTP ai răspunsului.
+
+    Atribute:
+        data (list): Orarul decodat din JSON.
+        content_hash (str): Hash-ul SHA-256 al corpului răspunsului.
+        etag (str, optional): Antetul ETag.
+        last_modified (str, optional): Antetul Last-Modified.
+    """
+    data: list
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+# Rezultatul descărcării unui orar identic cu cel de la ultima sincronizare
+UNCHANGED = object()
+
+
+def fetch_timetable(session, teacher_id, state, timeout):
+    """
+    Preia orarul unui profesor, condiționat de starea ultimei sincronizări (sau None).
+
+    Returns:
+        FetchedTimetable pentru un orar nou sau modificat, `UNCHANGED` dacă serverul răspunde 304 sau
+        conținutul are același hash, None dacă cererea eșuează.
+    """
+    headers = {}
+    if state is not None and state.etag:
+        headers["If-None-Match"] = state.etag
+    if state is not None and state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+
+    url = API_COURSES.format(teacher_id)
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Eroare la accesarea {url}: {e}")
+        return None
+    if response.status_code == 304:
+        return UNCHANGED
+    if response.status_code != 200:
+        print(f"Eroare la accesarea {url}: HTTP {response.status_code}")
+        return None
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    if state is not None and state.content_hash == content_hash:
+        return UNCHANGED
+    return FetchedTimetable(response.json(), content_hash, response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"))
+
+
+def fetch_timetables(session, teacher_ids, states, max_workers, timeout, progress=None):
+    """
+    Preia în paralel orarele profesorilor (cel mult `max_workers` cereri simultane).
+
+    Args:
+        states (dict): teacherId -> starea ultimei sincronizări (`load_sync_states`).
+        progress (callable, optional): Apelată ca `progress(descărcate, total)` în firul apelantului,
+            la pornire și după fiecare orar descărcat.
+
+    Returns:
+        dict: teacherId -> rezultatul `fetch_timetable`.
+    """
+    results = {}
+    if progress:
+        progress(0, len(teacher_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(fetch_timetable, session, teacher_id, states.get(teacher_id), timeout): teacher_id
+            for teacher_id in teacher_ids
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(done, len(futures))
+    return results
+
+
+def load_sync_states(teacher_ids):
+    """Starea ultimei sincronizări pentru fiecare profesor deja sincronizat: teacherId -> rând."""
+    return {
+        state.teacher_id: state
+        for state in db.session.execute(
+            select(TimetableSyncState.teacher_id, TimetableSyncState.content_hash, TimetableSyncState.etag,
+                   TimetableSyncState.last_modified)
+            .where(TimetableSyncState.teacher_id.in_(teacher_ids))
+        )
+    }
+
+
+def store_sync_states(fetched):
+    """Salvează hash-ul și validatorii HTTP ai orarelor procesate (teacherId -> FetchedTimetable)."""
+    if not fetched:
         return
+    insert_states = upsert(TimetableSyncState.__table__)
+    db.session.execute(insert_states.on_conflict_do_update(
+        index_elements=["teacher_id"],
+        set_={column: insert_states.excluded[column]
+              for column in ("content_hash", "etag", "last_modified", "synced_at")},
+    ), [
+        {"teacher_id": teacher_id, "content_hash": timetable.content_hash, "etag": timetable.etag,
+         "last_modified": timetable.last_modified, "synced_at": datetime.now()}
+        for teacher_id, timetable in fetched.items()
+    ])
+
+
+def fetch_and_store_data(full=False, progress=None):
+    """
+    Preia profesorii și cursurile asociate și le salvează în baza de date.
+
+    Orarele sunt descărcate în paralel (`SYNC_MAX_WORKERS` cereri simultane, `SYNC_HTTP_TIMEOUT` secunde
+    pe cerere) printr-o sesiune comună; apoi toate orarele sunt salvate împreună, prin inserări în bloc.
+    Orarele neschimbate de la ultima sincronizare (304 sau același conținut) nu sunt procesate, cu
+    excepția sincronizării complete (`full=True`). `progress` urmărește descărcarea (vezi `fetch_timetables`).
+
+    Returns:
+        dict: numărul profesorilor și al orarelor modificate, neschimbate și eșuate (None dacă lista
+        profesorilor nu a putut fi preluată).
+    """
+    max_workers = current_app.config.get("SYNC_MAX_WORKERS")
+    timeout = current_app.config.get("SYNC_HTTP_TIMEOUT")
+
+    with http_session(max_workers, current_app.config.get("SYNC_HTTP_CACHE"),
+                      current_app.config.get("SYNC_HTTP_CACHE_DIR"),
+                      current_app.config.get("SYNC_HTTP_CACHE_TTL")) as session:
+        professors = fetch_json(session, API_PROFESSORS, timeout)
+        if professors is None:
+            print("Eroare la preluarea profesorilor")
+            return None
+
+        professors = [prof for prof in professors
+                      if prof["facultyName"] == current_app.config.get("FACULTY_NAME")]
+        teacher_ids = [int(prof["id"]) for prof in professors]
+        states = {} if full else load_sync_states(teacher_ids)
+        db.session.commit()  # Nu ținem tranzacția deschisă pe durata descărcării
+        timetables = fetch_timetables(session, teacher_ids, states, max_workers, timeout, progress)
 
-    professors = response.json()
     with current_app.app_context():
+        user_ids = store_professors(professors)
+        parsed, fetched, counts = {}, {}, {"professors": len(professors), "changed": 0, "unchanged": 0, "failed": 0}
         for prof in professors:
-            if prof["facultyName"] == current_app.config.get("FACULTY_NAME"):
-                user = User.query.filter_by(email=prof["emailAddress"]).first()
-                if not user:
-                    user = User(
-                        name=f"{prof['firstName']} {prof['lastName']}",
-                        email=prof["emailAddress"],
-                        role=UserRole.CD,
-                        teacherId=int(prof["id"])
-                    )
-                    db.session.add(user)
-                    db.session.commit()  # Salvăm profesorul în BD
+            teacher_id = int(prof["id"])
+            label = f"{prof['firstName']} {prof['lastName']} - {teacher_id}"
+            timetable = timetables[teacher_id]
+            if timetable is UNCHANGED:
+                counts["unchanged"] += 1
+                continue
+            if timetable is None or teacher_id not in user_ids:
+                print(f"Eroare la preluarea cursurilor pentru {label}")
+                counts["failed"] += 1
+                continue
+            parsed[user_ids[teacher_id]] = parse_timetable(timetable.data, label)
+            fetched[teacher_id] = timetable
+            counts["changed"] += 1
+
+        store_timetables(parsed)
+        store_sync_states(fetched)
+        db.session.commit()
 
-                fetch_and_store_courses(user)  # Procesăm cursurile pentru fiecare profesor
+    print(f"✅ Orare: {counts['changed']} modificate, {counts['unchanged']} neschimbate, {counts['failed']} eșuate.")
+    return counts
 
 
-import requests
+# Tipurile de activități care fac din profesor coordonatorul, respectiv asistentul cursului
+COORDINATOR_TYPES = ("curs", "pr")
+ASSISTANT_TYPES = ("lab", "sem")
 
 
-def fetch_and_store_courses(professor):
-    """Preia cursurile unui profesor și le salvează în BD pentru toate facultățile."""
-    response = requests.get(API_COURSES.format(professor.teacherId))
-    if response.status_code != 200:
-        print(f"Eroare la preluarea cursurilor pentru {professor.name}")
-        return
+def upsert(table):
+    """`INSERT` cu suport pentru `ON CONFLICT`, specific dialectului bazei de date (PostgreSQL / SQLite)."""
+    if db.session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
 
-    data = response.json()
+def store_professors(professors):
+    """
+    Inserează profesorii care lipsesc din BD; utilizatorii existenți (după email) nu sunt modificați.
+
+    Returns:
+        dict: teacherId din orar -> user_id.
+    """
+    if not professors:
+        return {}
+    db.session.execute(upsert(User.__table__).on_conflict_do_nothing(index_elements=["email"]), [
+        {"name": f"{prof['firstName']} {prof['lastName']}", "email": prof["emailAddress"],
+         "role": UserRole.CD, "teacherId": int(prof["id"])}
+        for prof in professors
+    ])
+    teacher_ids = {prof["emailAddress"]: int(prof["id"]) for prof in professors}
+    users = db.session.execute(select(User.email, User.user_id).where(User.email.in_(teacher_ids)))
+    return {teacher_ids[email]: user_id for email, user_id in users}
+
+
+def parse_timetable(data, label):
+    """
+    Sălile și activitățile din orarul unui profesor, pentru toate facultățile (fără acces la BD).
+
+    Returns:
+        tuple: (săli: nume -> clădire, activități: listă de ((nume, an, specializare), tip activitate))
+    """
+    rooms, activities = {}, []
     if not data or len(data) < 2:
-        return
+        return rooms, activities
 
     course_entries, course_groups = data  # Prima parte conține cursurile, a doua parte conține anii & specializările
-    course_dict = {}  # Stocăm cursurile pentru a asocia laboratoarele/seminariile
 
     for entry in course_entries:
         topic_name = entry.get("topicLongName")
         type_short_name = entry.get("typeShortName")
 
-        # Preluăm sau creăm sala doar dacă roomLongName nu este null
+        # Reținem sala doar dacă roomLongName nu este null
         if entry.get("roomLongName"):
-            room = Room.query.filter_by(name=entry["roomLongName"]).first()
-            if not room:
-                room = Room(name=entry["roomLongName"], building=entry.get("roomBuilding"))
-                db.session.add(room)
+            rooms.setdefault(entry["roomLongName"], entry.get("roomBuilding") or "")
 
         # Ignorăm cursurile fără nume
         if not topic_name or type_short_name == None:
-            print(f"⚠️ Curs ignorat ({'fără nume' if not topic_name else type_short_name}) pentru {professor.name} - {professor.teacherId}")
+            print(f"⚠️ Curs ignorat ({'fără nume' if not topic_name else type_short_name}) pentru {label}")
             continue
 
         # Extragem anul și specializarea, verificând facultatea
         study_year, specialization, faculty = extract_year_specialization_from_pair(course_groups, entry["id"])
         if study_year is None or specialization is None or faculty is None:
             print(
-                f"⚠️ Curs ignorat (nu este de la {current_app.config.get('SHORT_FACULTY_NAME')}): {topic_name} - {professor.teacherId}")
+                f"⚠️ Curs ignorat (nu este de la {current_app.config.get('SHORT_FACULTY_NAME')}): {topic_name} - {label}")
             continue
 
+        activities.append(((topic_name, study_year, specialization), type_short_name))
 
-        # Creăm cheia unică pentru curs
-        course_key = (topic_name, study_year, specialization)
-
-        # Căutăm cursul în BD sau îl creăm dacă nu există
-        if course_key in course_dict:
-            course = course_dict[course_key]
-        else:
-            course = Course.query.filter_by(
-                name=topic_name,
-                study_year=study_year,
-                specialization=specialization
-            ).first()
-
-            if not course:
-                course = Course(
-                    name=topic_name,
-                    study_year=study_year,
-                    specialization=specialization,
-                    coordinator_id=None,  # Va fi actualizat ulterior
-                )
-                db.session.add(course)
+    return rooms, activities
 
-            course_dict[course_key] = course  # Stocăm cursul în dicționar
 
-        # Asociem profesorii în funcție de tipul activității
-        if type_short_name in ["curs","pr"]:
-            course.coordinator_id = professor.user_id  # Profesorul devine coordonator
-        elif type_short_name in ["lab", "sem"]:
-            if professor not in course.assistants:
-                course.assistants.append(professor)  # Profesorul devine asistent
-
-    db.session.commit()
+def store_timetables(timetables):
+    """
+    Salvează sălile, cursurile și asistenții din orarele parsate (user_id -> rezultatul `parse_timetable`).
 
+    Fiecare tabel costă un singur `INSERT ... ON CONFLICT` executat în loturi, plus o interogare pentru
+    ID-urile cursurilor, oricâte orare și activități ar fi. Ultimul profesor cu o activitate de tip curs
+    devine coordonatorul cursului; legăturile de asistent ale profesorilor procesați sunt aduse la zi
+    (diferența față de BD). Tranzacția este salvată de apelant.
+    """
+    rooms, courses, assistants = {}, {}, set()
+    for user_id, (timetable_rooms, activities) in timetables.items():
+        for name, building in timetable_rooms.items():
+            rooms.setdefault(name, building)
+        for course_key, type_short_name in activities:
+            courses.setdefault(course_key, None)
+            # Asociem profesorii în funcție de tipul activității
+            if type_short_name in COORDINATOR_TYPES:
+                courses[course_key] = user_id  # Profesorul devine coordonator
+            elif type_short_name in ASSISTANT_TYPES:
+                assistants.add((course_key, user_id))  # Profesorul devine asistent
+
+    if rooms:
+        db.session.execute(upsert(Room.__table__).on_conflict_do_nothing(index_elements=["name"]), [
+            {"name": name, "building": building} for name, building in rooms.items()
+        ])
+
+    if courses:
+        insert_courses = upsert(Course.__table__)
+        # Un curs doar cu laboratoare / seminarii în acest orar își păstrează coordonatorul
+        db.session.execute(insert_courses.on_conflict_do_update(
+            index_elements=["name", "study_year", "specialization"],
+            set_={"coordinator_id": func.coalesce(insert_courses.excluded.coordinator_id, Course.coordinator_id)},
+        ), [
+            {"name": name, "study_year": study_year, "specialization": specialization, "coordinator_id": coordinator}
+            for (name, study_year, specialization), coordinator in courses.items()
+        ])
+
+    # Asistenții profesorilor procesați: se adaugă legăturile noi și se șterg cele care nu mai apar în orar
+    links = set()
+    if assistants:
+        course_ids = {
+            (name, study_year, specialization): course_id
+            for course_id, name, study_year, specialization in db.session.execute(
+                select(Course.course_id, Course.name, Course.study_year, Course.specialization)
+                .where(Course.name.in_({name for name, _, _ in courses}))
+            )
+        }
+        links = {(course_ids[course_key], user_id) for course_key, user_id in assistants}
+
+    if timetables:
+        existing = set(db.session.execute(
+            select(course_assistants.c.course_id, course_assistants.c.assistant_id)
+            .where(course_assistants.c.assistant_id.in_(timetables))
+        ).tuples())
+        if links - existing:
+            db.session.execute(upsert(course_assistants).on_conflict_do_nothing(), [
+                {"course_id": course_id, "assistant_id": user_id} for course_id, user_id in links - existing
+            ])
+        if existing - links:
+            db.session.execute(
+                delete(course_assistants).where(course_assistants.c.course_id == bindparam("link_course_id"),
+                                                course_assistants.c.assistant_id == bindparam("link_assistant_id")),
+                [{"link_course_id": course_id, "link_assistant_id": user_id}
+                 for course_id, user_id in existing - links],
+            )
 
 
 import re
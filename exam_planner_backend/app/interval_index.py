@@ -0,0 +1,138 @@
+from bisect import bisect_left
+
+from sqlalchemy import or_, select
+
+from app.database import db
+from app.intervals import as_date, as_minutes, exam_span, overlaps
+from app.models import Exam, ExamStatus
+
+# Resursele pentru care verificăm suprapuneri (numele coloanelor din Exam)
+RESOURCE_FIELDS = ("room_id", "assistant_id", "professor_id")
+
+
+class IntervalList:
+    """
+    Listă sortată de intervale [start, end) pentru o singură resursă într-o zi.
+
+    Pe lângă capetele intervalelor păstrăm maximul prefix al capetelor de final,
+    astfel încât întrebarea "resursa este liberă în [start, end)?" se rezolvă
+    cu o căutare binară, chiar dacă în date există suprapuneri vechi.
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_end")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_end = []
+
+    def _rebuild_from(self, pos):
+        running = self.max_end[pos - 1] if pos > 0 else -1
+        del self.max_end[pos:]
+        for end in self.ends[pos:]:
+            running = max(running, end)
+            self.max_end.append(running)
+
+    def add(self, start, end, exam_id):
+        pos = bisect_left(self.starts, start)
+        self.starts.insert(pos, start)
+        self.ends.insert(pos, end)
+        self.ids.insert(pos, exam_id)
+        self._rebuild_from(pos)
+
+    def remove(self, exam_id):
+        pos = self.ids.index(exam_id)
+        del self.starts[pos]
+        del self.ends[pos]
+        del self.ids[pos]
+        self._rebuild_from(pos)
+
+    def find(self, start, end, exclude_exam_id=None):
+        """Returnează ID-ul unui examen care se suprapune cu [start, end) sau None."""
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_end[i] > start:
+            if overlaps(self.starts[i], self.ends[i], start, end) and self.ids[i] != exclude_exam_id:
+                return self.ids[i]
+            i -= 1
+        return None
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def find_conflict(field, resource_id, exam_date, start_time, duration, exclude_exam_id=None):
+    """
+    Caută un examen acceptat care ocupă resursa în intervalul cerut.
+
+    Verificarea se face direct în BD (indexurile `ix_exams_<resursă>_date_status`), deci vede
+    și modificările altor procese; constrângerile de excludere din PostgreSQL resping oricum,
+    la commit, suprapunerile apărute între verificare și salvare.
+
+    Args:
+        field (str): "room_id", "assistant_id" sau "professor_id".
+        resource_id (int): ID-ul sălii / utilizatorului.
+        exam_date (date | str): Ziua examenului.
+        start_time (time | str): Ora de început.
+        duration (int): Durata în minute.
+        exclude_exam_id (int, optional): Examenul care se modifică (ignorat).
+
+    Returns:
+        int | None: ID-ul examenului în conflict sau None dacă resursa este liberă.
+
+    Exemple de utilizare:
+        - find_conflict("room_id", 3, date(2025, 6, 10), "09:00", 120)
+    """
+    start = as_minutes(start_time)
+    end = start + int(duration)
+    query = (
+        select(Exam.exam_id, Exam.start_time, Exam.duration)
+        .where(getattr(Exam, field) == int(resource_id),
+               Exam.exam_date == as_date(exam_date),
+               Exam.status == ExamStatus.ACCEPTAT)
+    )
+    if exclude_exam_id is not None:
+        query = query.where(Exam.exam_id != exclude_exam_id)
+    for exam_id, exam_start, exam_duration in db.session.execute(query):
+        span = exam_span(exam_start, exam_duration)
+        if span is not None and overlaps(start, end, *span):
+            return exam_id
+    return None
+
+
+def is_free(field, resource_id, exam_date, start_time, duration, exclude_exam_id=None):
+    """Verifică dacă resursa este liberă în intervalul [start, start + durată)."""
+    return find_conflict(field, resource_id, exam_date, start_time, duration, exclude_exam_id) is None
+
+
+def load_db_intervals(dates, resources):
+    """
+    Examenele acceptate din BD pentru mai multe resurse și zile, citite cu o singură interogare
+    (varianta în bloc a `find_conflict`, folosită de evaluarea mai multor propuneri).
+
+    Args:
+        dates (set): Zilele verificate.
+        resources (dict): câmp ("room_id" / "assistant_id" / "professor_id") -> ID-urile verificate.
+
+    Returns:
+        dict: (câmp, ID, zi) -> IntervalList
+    """
+    resources = {field: set(ids) for field, ids in resources.items() if ids}
+    if not dates or not resources:
+        return {}
+    rows = db.session.execute(
+        select(Exam.exam_id, Exam.exam_date, Exam.start_time, Exam.duration, *[getattr(Exam, f) for f in resources])
+        .where(Exam.exam_date.in_(dates),
+               Exam.status == ExamStatus.ACCEPTAT,
+               or_(*[getattr(Exam, field).in_(ids) for field, ids in resources.items()]))
+    )
+    intervals = {}
+    for exam_id, exam_date, start_time, duration, *values in rows:
+        span = exam_span(start_time, duration)
+        if span is None:
+            continue
+        for (field, ids), value in zip(resources.items(), values):
+            if value in ids:
+                intervals.setdefault((field, value, exam_date), IntervalList()).add(*span, exam_id)
+    return intervals
+
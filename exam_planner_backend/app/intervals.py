@@ -0,0 +1,60 @@
+from datetime import datetime, time as time_type
+
+import numpy as np
+
+# Toate intervalele examenelor sunt reprezentate ca [start, end) în minute de la miezul nopții.
+
+
+def as_date(value):
+    """Convertește o dată primită ca șir (YYYY-MM-DD) într-un obiect `date`."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def as_minutes(value):
+    """Convertește o oră (`time` sau șir HH:MM) în minute de la miezul nopții."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value[:5], "%H:%M").time()
+    if isinstance(value, time_type):
+        return value.hour * 60 + value.minute
+    return int(value)
+
+
+def format_minutes(minute):
+    """Formatează un număr de minute de la miezul nopții ca HH:MM."""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def exam_span(start_time, duration):
+    """Returnează intervalul (start, end) al unui examen sau None dacă ora sau durata lipsesc."""
+    if start_time is None or duration is None:
+        return None
+    start = as_minutes(start_time)
+    return start, start + int(duration)
+
+
+def overlaps(start1, end1, start2, end2):
+    """Verifică dacă intervalele [start1, end1) și [start2, end2) se suprapun."""
+    return start1 < end2 and start2 < end1
+
+
+def overlap_mask(starts, ends, start, end):
+    """
+    Varianta vectorizată a `overlaps`: compară un interval cu o listă de intervale.
+
+    Args:
+        starts, ends (array-like): Capetele intervalelor, în minute.
+        start, end (int | array-like): Intervalul (sau intervalele, element cu element) comparat(e).
+
+    Returns:
+        np.ndarray: Mască booleană, True pentru intervalele care se suprapun.
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    return (starts < end) & (start < ends)
+
@@ -0,0 +1,52 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, time
+from enum import Enum
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+def _default(value):
+    """Tipurile pe care orjson nu le codifică nativ."""
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Furnizor JSON bazat pe orjson.
+
+    Datele calendaristice, orele, enum-urile și dataclass-urile sunt codificate nativ (în C):
+    datele ca `YYYY-MM-DD`, orele ca `HH:MM:SS`, enum-urile prin valoarea lor. Răspunsurile
+    sunt compacte; în modul debug se păstrează indentarea furnizorului implicit.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get("indent"):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.options).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        body = orjson.dumps(obj, default=_default, option=self.options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    @staticmethod
+    def default(value):
+        # Folosit doar de `dumps` cu indentare (debug): aceleași formate ca orjson
+        if isinstance(value, (date, time)):
+            return value.isoformat()
+        if isinstance(value, Enum):
+            return value.value
+        if dataclasses.is_dataclass(value):
+            return dataclasses.asdict(value)
+        return _default(value)
@@ -1,8 +1,12 @@
 from sqlalchemy.orm import relationship, validates
 
 from app import db  # Importă instanța globală a bazei de date
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, Date, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, Boolean, Date, DateTime, Table, DDL, event, text, \
+    func, literal
 from enum import Enum as PyEnum
+from datetime import time as time_type
+
+from app.intervals import exam_span
 
 # Definirea enum-urilor
 class UserRole(PyEnum):
@@ -138,6 +142,10 @@ class Group(db.Model):
     specialization = Column(String, nullable=True)
     year_of_study = Column(Integer, nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_groups_specialization_year", "specialization", "year_of_study"),
+    )
+
     # Relații
     leader = relationship("User", back_populates="led_groups")
     exams = relationship("Exam", back_populates="group")
@@ -169,6 +177,11 @@ class Room(db.Model):
     name = Column(String, nullable=False)
     building = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Cheia după care sincronizarea cu orarul inserează sălile (INSERT ... ON CONFLICT)
+        db.UniqueConstraint("name", name="unique_room_name"),
+    )
+
     # Relații
     exams = relationship("Exam", back_populates="room")
 
@@ -206,12 +219,23 @@ class Course(db.Model):
     # Profesor coordonator (unic)
     coordinator_id = Column(Integer, ForeignKey("users.user_id"))
 
+    __table_args__ = (
+        # Cheia după care sincronizarea cu orarul inserează / actualizează cursurile (INSERT ... ON CONFLICT)
+        db.UniqueConstraint("name", "study_year", "specialization", name="unique_course_per_year_and_specialization"),
+        db.Index("ix_courses_specialization_year", "specialization", "study_year"),
+        db.Index("ix_courses_coordinator", "coordinator_id"),
+    )
+
     # Relații
     coordinator = relationship("User", back_populates="coordinated_courses", foreign_keys=[coordinator_id])
     assistants = relationship("User", secondary=course_assistants, backref="assisted_courses")
     exams = relationship("Exam", back_populates="course")
 
 
+# Condiția indexurilor parțiale pe examenele acceptate
+EXAM_ACCEPTED_SQL = "status = 'ACCEPTAT'"
+
+
 class Exam(db.Model):
     """
        Modelul pentru examene.
@@ -231,6 +255,11 @@ class Exam(db.Model):
            start_time (Time): Ora de începere a examenului.
            duration (int): Durata în minute a examenului.
            details (str): Detalii opționale despre examen.
+           start_minute, end_minute (int): Intervalul examenului în minute de la miezul nopții (calculate).
+
+       În PostgreSQL tabela are și coloana generată `time_span` (tsrange), pe care constrângerile
+       de excludere din `EXAM_EXCLUSION_CONSTRAINTS` împiedică suprapunerea examenelor acceptate
+       în aceeași sală sau cu același asistent / profesor.
        """
     __tablename__ = "exams"
     exam_id = Column(Integer, primary_key=True)
@@ -248,6 +277,13 @@ class Exam(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("course_id", "group_id", name="unique_exam_per_course_and_group"),
+        db.Index("ix_exams_group_date", "group_id", "exam_date"),
+        db.Index("ix_exams_room_date_status", "room_id", "exam_date", "status"),
+        db.Index("ix_exams_assistant_date_status", "assistant_id", "exam_date", "status"),
+        db.Index("ix_exams_professor_date_status", "professor_id", "exam_date", "status"),
+        # Index parțial: doar examenele acceptate ocupă săli / persoane (indexul de intervale, calendarul)
+        db.Index("ix_exams_accepted_date", "exam_date", "start_time",
+                 postgresql_where=text(EXAM_ACCEPTED_SQL), sqlite_where=text(EXAM_ACCEPTED_SQL)),
     )
 
     # Relații
@@ -257,6 +293,61 @@ class Exam(db.Model):
     professor = relationship("User", back_populates="exams_as_professor", foreign_keys=[professor_id])
     assistant = relationship("User", back_populates="exams_as_assistant", foreign_keys=[assistant_id])
 
+    @property
+    def start_minute(self):
+        """Ora de început în minute de la miezul nopții (None dacă nu este stabilită)."""
+        span = exam_span(self.start_time, self.duration)
+        return span[0] if span else None
+
+    @property
+    def end_minute(self):
+        """Ora de final în minute de la miezul nopții (None dacă ora sau durata lipsesc)."""
+        span = exam_span(self.start_time, self.duration)
+        return span[1] if span else None
+
+
+# Cheia de ordonare a listei examenelor: examenele fără oră sunt la începutul zilei. Valoarea implicită
+# este scrisă direct în SQL (nu ca parametru), astfel încât expresia din interogări este identică
+# cu cea din indexul `ix_exams_date_start`
+EXAM_START_KEY = func.coalesce(Exam.start_time, literal(time_type.min, db.Time, literal_execute=True))
+
+# Lista examenelor: filtru pe interval de date și paginare keyset (dată, oră, id), fără sortare
+db.Index("ix_exams_date_start", Exam.exam_date, EXAM_START_KEY, Exam.exam_id)
+
+# Intervalul de timp al examenului, stocat ca tsrange generat de PostgreSQL
+EXAM_TIME_SPAN_SQL = (
+    "CASE WHEN start_time IS NOT NULL AND duration IS NOT NULL "
+    "THEN tsrange(exam_date + start_time, exam_date + start_time + duration * interval '1 minute', '[)') END"
+)
+
+# Constrângerile de excludere pentru examenele acceptate: nume constrângere -> coloana resursei
+EXAM_EXCLUSION_CONSTRAINTS = {
+    "exams_room_no_overlap": "room_id",
+    "exams_assistant_no_overlap": "assistant_id",
+    "exams_professor_no_overlap": "professor_id",
+}
+
+# Coloana și constrângerile există doar în PostgreSQL (btree_gist + GiST); SQLite din teste le ignoră
+for _ddl in [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    f"ALTER TABLE exams ADD COLUMN time_span tsrange GENERATED ALWAYS AS ({EXAM_TIME_SPAN_SQL}) STORED",
+    *[
+        f"ALTER TABLE exams ADD CONSTRAINT {name} EXCLUDE USING gist "
+        f"({column} WITH =, time_span WITH &&) WHERE (status = 'ACCEPTAT')"
+        for name, column in EXAM_EXCLUSION_CONSTRAINTS.items()
+    ],
+]:
+    event.listen(Exam.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+
+def exclusion_violation_field(error):
+    """
+    Determină resursa (room_id / assistant_id / professor_id) a cărei constrângere de excludere
+    a fost încălcată de un `IntegrityError`, sau None dacă eroarea are altă cauză.
+    """
+    diag = getattr(getattr(error, "orig", None), "diag", None)
+    return EXAM_EXCLUSION_CONSTRAINTS.get(getattr(diag, "constraint_name", None))
+
 class ExaminationPeriod(db.Model):
     """
        Modelul pentru perioada de examinare.
@@ -279,6 +370,10 @@ class ExaminationPeriod(db.Model):
     period_start = Column(Date, nullable=False)
     period_end = Column(Date, nullable=False)
 
+    __table_args__ = (
+        db.Index("ix_examination_period_name_dates", "name", "period_start", "period_end"),
+    )
+
 
 @validates("name")
 def validate_unique_name_for_examination_period(cls, key, name):
@@ -294,3 +389,87 @@ def validate_unique_teacher_id(cls, key, teacher_id):
     if existing:
         raise ValueError("Exista deja o inregistrare cu acest teacher_id")
     return teacher_id
+
+
+class TimetableSyncState(db.Model):
+    """
+    Starea ultimei sincronizări a orarului unui profesor de pe orar.usv.ro.
+
+    La următoarea sincronizare, orarul este cerut condiționat (ETag / Last-Modified), iar un răspuns
+    cu același conținut (același hash) nu mai este procesat.
+
+    Atribute:
+        teacher_id (int): ID-ul profesorului în orar (`teacherId`).
+        content_hash (str): Hash-ul SHA-256 al ultimului orar salvat.
+        etag (str, optional): Antetul ETag al ultimului răspuns.
+        last_modified (str, optional): Antetul Last-Modified al ultimului răspuns.
+        synced_at (DateTime): Momentul ultimei salvări a orarului.
+    """
+    __tablename__ = "timetable_sync_state"
+
+    teacher_id = Column(Integer, primary_key=True, autoincrement=False)
+    content_hash = Column(String(64), nullable=False)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    synced_at = Column(DateTime, nullable=False)
+
+
+class SyncJobStatus(PyEnum):
+    """
+    Statusul unui job de sincronizare cu orarul.
+
+    - IN_ASTEPTARE: Jobul a fost programat și așteaptă un worker.
+    - IN_CURS: Jobul rulează (sau workerul lui s-a oprit și jobul va fi reluat).
+    - FINALIZAT: Sincronizarea s-a încheiat cu succes.
+    - ESUAT: Sincronizarea a eșuat.
+    """
+    IN_ASTEPTARE = "IN ASTEPTARE"
+    IN_CURS = "IN CURS"
+    FINALIZAT = "FINALIZAT"
+    ESUAT = "ESUAT"
+
+
+# Condiția indexului unic care permite un singur job activ de fiecare tip
+SYNC_JOB_ACTIVE_SQL = "status IN ('IN_ASTEPTARE', 'IN_CURS')"
+
+
+class SyncJob(db.Model):
+    """
+    Un job de sincronizare cu orar.usv.ro, programat prin POST /sync-data și rulat de `flask sync-worker`.
+
+    Atribute:
+        job_id (int): ID-ul unic al jobului.
+        kind (str): Tipul sincronizării; cel mult un job activ (în așteptare / în curs) pentru fiecare tip.
+        status (SyncJobStatus): Statusul jobului.
+        full (bool): Sincronizare completă (orarele neschimbate sunt reprocesate).
+        requested_by (int, optional): Utilizatorul care a programat jobul.
+        attempts (int): De câte ori a fost pornit jobul (un job al unui worker oprit este reluat).
+        total, fetched (int, optional): Numărul profesorilor și al orarelor descărcate până acum.
+        changed, unchanged, failed (int, optional): Orarele modificate, neschimbate și eșuate.
+        error (str, optional): Mesajul erorii pentru un job eșuat.
+        created_at, started_at, finished_at (DateTime): Momentele programării, pornirii și încheierii.
+        heartbeat_at (DateTime, optional): Ultimul semn de viață al workerului care rulează jobul.
+    """
+    __tablename__ = "sync_jobs"
+
+    job_id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(SQLEnum(SyncJobStatus), nullable=False, default=SyncJobStatus.IN_ASTEPTARE)
+    full = Column(Boolean, nullable=False, default=False)
+    requested_by = Column(Integer, ForeignKey("users.user_id"), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    fetched = Column(Integer, nullable=True)
+    changed = Column(Integer, nullable=True)
+    unchanged = Column(Integer, nullable=True)
+    failed = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ux_sync_jobs_active", "kind", unique=True,
+                 postgresql_where=text(SYNC_JOB_ACTIVE_SQL), sqlite_where=text(SYNC_JOB_ACTIVE_SQL)),
+    )
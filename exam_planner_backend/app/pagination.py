@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import date, time as time_type
+
+from flask import request
+from sqlalchemy import tuple_
+
+from app.database import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PaginationError(ValueError):
+    """Parametrii de paginare (limit / cursor) sunt invalizi."""
+
+
+def page_params():
+    """
+    Citește parametrii `limit` și `cursor` din query string.
+
+    Paginarea este opțională: dacă niciunul nu este trimis, se întoarce None și rutele
+    păstrează răspunsul complet (compatibil cu clienții existenți).
+
+    Returns:
+        tuple | None: (limit, cursor)
+    """
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None and cursor is None:
+        return None
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise PaginationError("Parametrul limit trebuie să fie un număr întreg.")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise PaginationError(f"Parametrul limit trebuie să fie între 1 și {MAX_PAGE_SIZE}.")
+    return limit, cursor or None
+
+
+def encode_cursor(values):
+    """Codifică valorile cheii ultimului rând într-un cursor opac."""
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, time_type)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, keys):
+    """Decodifică un cursor în valori de tipul coloanelor din `keys`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        decoded = []
+        for value, key in zip(values, keys):
+            python_type = key.type.python_type
+            decoded.append(python_type.fromisoformat(value) if python_type in (date, time_type)
+                           else python_type(value))
+        return decoded
+    except (ValueError, TypeError, UnicodeError):
+        raise PaginationError("Cursor invalid.")
+
+
+def keyset_page(stmt, keys, limit, cursor=None):
+    """
+    Paginare keyset: rândurile de după cursor, în ordinea cheilor (toate crescătoare).
+
+    Spre deosebire de OFFSET, costul unei pagini nu crește cu numărul paginii: condiția
+    `(k1, k2, ...) > (v1, v2, ...)` folosește indexul pe chei. Cheile trebuie să fie
+    selectate, în această ordine, ca ultimele coloane ale interogării, iar ultima cheie
+    trebuie să fie unică (ex: cheia primară).
+
+    Returns:
+        tuple: (rândurile paginii, cursorul paginii următoare sau None)
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(*keys) > tuple_(*decode_cursor(cursor, keys)))
+    rows = db.session.execute(stmt.order_by(*keys).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(tuple(rows[-1])[-len(keys):])
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from sqlalchemy import select, and_
+
+from app.change_tracking import subscribe
+from app.config import Config
+from app.database import db
+from app.intervals import as_date, as_minutes
+from app.models import Room, Exam, ExamStatus
+
+
+def merge_intervals(intervals):
+    """
+    Unește intervalele [start, end) care se suprapun sau se ating (sweep-line pe intervale sortate).
+
+    Exemple:
+        merge_intervals([(600, 720), (540, 660), (720, 780)]) -> [(540, 780)]
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(busy, day_start, day_end, min_duration=0):
+    """Returnează intervalele libere din [day_start, day_end) pentru o listă de intervale ocupate unite."""
+    free = []
+    cursor = day_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= day_end:
+            break
+        if start - cursor >= max(min_duration, 1):
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+    if day_end - cursor >= max(min_duration, 1):
+        free.append((cursor, day_end))
+    return free
+
+
+class RoomAvailabilityCache:
+    """
+    Cache pe zile cu intervalele ocupate ale fiecărei săli.
+
+    O zi este calculată dintr-o singură interogare (săli LEFT JOIN examene acceptate în acea zi)
+    și rămâne în cache până când un examen din acea zi se modifică, o sală se modifică
+    sau expiră `INTERVAL_INDEX_TTL` (pentru modificările făcute de alte procese).
+
+    Fiecare invalidare crește `_generation`; o zi citită din BD este păstrată doar dacă nicio
+    invalidare nu a avut loc în timpul citirii (altfel rezultatul poate fi deja depășit).
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._days = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._generation += 1
+
+    def invalidate(self, exam_date):
+        with self._lock:
+            self._days.pop(exam_date, None)
+            self._generation += 1
+
+    def _load(self, exam_date):
+        rows = db.session.execute(
+            select(Room.room_id, Room.name, Room.building, Exam.start_time, Exam.duration)
+            .outerjoin(Exam, and_(Exam.room_id == Room.room_id,
+                                  Exam.exam_date == exam_date,
+                                  Exam.status == ExamStatus.ACCEPTAT,
+                                  Exam.start_time.isnot(None),
+                                  Exam.duration.isnot(None)))
+            .order_by(Room.name, Room.room_id)
+        ).all()
+
+        rooms = {}
+        for room_id, name, building, start_time, duration in rows:
+            room = rooms.setdefault(room_id, (room_id, name, building, []))
+            if start_time is not None:
+                start = as_minutes(start_time)
+                room[3].append((start, start + duration))
+
+        return [(room_id, name, building, merge_intervals(busy)) for room_id, name, building, busy in rooms.values()]
+
+    def get(self, exam_date):
+        """Returnează lista (room_id, nume, clădire, intervale ocupate unite) pentru o zi."""
+        with self._lock:
+            entry = self._days.get(exam_date)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            generation = self._generation
+        rooms = self._load(exam_date)
+        with self._lock:
+            if self._generation == generation:
+                self._days[exam_date] = (time.monotonic(), rooms)
+        return rooms
+
+
+room_availability = RoomAvailabilityCache(ttl=Config.INTERVAL_INDEX_TTL)
+
+
+@subscribe
+def _invalidate_room_availability(changes):
+    for change in changes:
+        if change.model is Room or (change.model is Exam and change.key is None):
+            room_availability.clear()
+            return
+        if change.model is Exam:
+            for values in (change.before, change.after):
+                if values is not None:
+                    try:
+                        room_availability.invalidate(as_date(values["exam_date"]))
+                    except (TypeError, ValueError):
+                        room_availability.clear()
@@ -5,6 +5,7 @@ from flasgger import swag_from
 from flask_jwt_extended import create_access_token
 from authlib.integrations.flask_client import OAuth
 
+from app.identity import token_claims
 from app.models import User
 
 auth_bp = Blueprint("auth", __name__)
@@ -75,7 +76,7 @@ def callback():
     if user:
         access_token = create_access_token(
             identity=str(user.user_id),
-            additional_claims={"role": user.role.value}
+            additional_claims=token_claims(user)
         )
 
         # Redirecționează spre frontend și trimite tokenul în URL (sau altă metodă)
@@ -0,0 +1,56 @@
+from flasgger import swag_from
+from flask import Blueprint, jsonify, request, Response
+
+from app.calendar_feeds import calendar_feeds
+
+calendar_bp = Blueprint("calendar", __name__, url_prefix="/calendar")
+
+
+def _feed_doc(kind, label):
+    return {
+        'tags': ['Calendar'],
+        'summary': f'Calendarul iCalendar (.ics) al examenelor - {label}',
+        'description': 'Conține examenele acceptate (cu oră și durată). Răspunsul are ETag și Last-Modified; '
+                       'clienții care trimit If-None-Match / If-Modified-Since primesc 304 dacă nu s-a modificat.',
+        'parameters': [
+            {'name': f'{kind}_id', 'in': 'path', 'type': 'integer', 'required': True}
+        ],
+        'responses': {
+            200: {'description': 'Calendarul în format text/calendar'},
+            304: {'description': 'Calendarul nu s-a modificat'},
+            404: {'description': 'Entitatea nu a fost găsită'}
+        }
+    }
+
+
+def _feed_response(kind, entity_id, not_found_msg):
+    feed = calendar_feeds.get(kind, entity_id)
+    if feed is None:
+        return jsonify({"msg": not_found_msg}), 404
+
+    etag, last_modified, body = feed
+    response = Response(body, mimetype="text/calendar")
+    response.charset = "utf-8"
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    response.headers["Content-Disposition"] = f'inline; filename="{kind}_{entity_id}.ics"'
+    return response.make_conditional(request)
+
+
+@calendar_bp.route("/group/<int:group_id>.ics", methods=["GET"])
+@swag_from(_feed_doc("group", "grupă"))
+def group_calendar(group_id):
+    return _feed_response("group", group_id, "Grupa nu a fost găsită.")
+
+
+@calendar_bp.route("/professor/<int:professor_id>.ics", methods=["GET"])
+@swag_from(_feed_doc("professor", "cadru didactic (examinator sau asistent)"))
+def professor_calendar(professor_id):
+    return _feed_response("professor", professor_id, "Profesorul nu a fost găsit.")
+
+
+@calendar_bp.route("/room/<int:room_id>.ics", methods=["GET"])
+@swag_from(_feed_doc("room", "sală"))
+def room_calendar(room_id):
+    return _feed_response("room", room_id, "Sala nu a fost găsită.")
@@ -1,13 +1,17 @@
 from flask import Blueprint, jsonify
 from flasgger import swag_from
 from flask import request
-from flask_jwt_extended import get_jwt_identity, jwt_required, current_user
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
 from sqlalchemy.sql.functions import user
 
 from app import db
 
 from app.decorators import roles_required
+from app.identity import current_user, current_group
 from app.models import User, Group, Course, UserRole, ExamType
+from app.pagination import page_params, keyset_page, PaginationError
+from app.serializers import serialize_course
 
 courses_bp = Blueprint("courses", __name__)
 
@@ -16,8 +20,18 @@ courses_bp = Blueprint("courses", __name__)
 @swag_from({
     'tags': ['Cursuri'],
     'summary': 'Vizualizare cursuri în funcție de rol',
-    'description': 'Returnează cursurile relevante pentru student (SG), profesor (CD) sau secretar (SEC).',
+    'description': 'Returnează cursurile relevante pentru student (SG), profesor (CD) sau secretar (SEC). '
+                   'Cu `limit` / `cursor` răspunsul este paginat (keyset, după ID): '
+                   '`{"courses": [...], "next_cursor": "..."}`.',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {'name': 'specialization', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'study_year', 'in': 'query', 'type': 'integer', 'required': False},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': 'Numărul de cursuri pe pagină (1-500)'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Valoarea `next_cursor` din pagina anterioară'}
+    ],
     'responses': {
         200: {
             'description': 'Listă de cursuri',
@@ -33,46 +47,63 @@ courses_bp = Blueprint("courses", __name__)
                 ]
             }
         },
+        400: {
+            'description': 'Filtre sau parametri de paginare invalizi.'
+        },
         403: {
             'description': 'Acces interzis. Rol insuficient.'
         }
     }
 })
 def get_courses_by_role():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user = current_user
     if not user:
         return jsonify({"error": "Utilizatorul nu a fost găsit."}), 404
 
+    stmt = select(Course.name, Course.examination_method, Course.specialization, Course.study_year,
+                  Course.course_id)
+
     # Secretar: vede toate cursurile
     if user.role == UserRole.SEC:
-        courses = Course.query.all()
+        pass
 
     # Profesor coordonator: vede doar cursurile coordonate de el
     elif user.role == UserRole.CD:
-        courses = Course.query.filter_by(coordinator_id=user_id).all()
+        stmt = stmt.where(Course.coordinator_id == user.user_id)
 
     # Student lider: vede cursurile grupei
     elif user.role == UserRole.SG:
-        group = Group.query.filter_by(leader_id=user.user_id).first()
+        group = current_group()
         if not group:
             return jsonify({"error": "Studentul nu este asociat unui grup."}), 404
-        courses = Course.query.filter_by(
-            specialization=group.specialization,
-            study_year=group.year_of_study
-        ).all()
+        stmt = stmt.where(Course.specialization == group.specialization,
+                          Course.study_year == group.study_year)
 
     else:
         return jsonify({"error": "Rolul utilizatorului nu are acces la această resursă."}), 403
 
-    course_list = [{
-        "id": c.course_id,
-        "name": c.name,
-        "examination_method": c.examination_method,
-        "specialization": c.specialization,
-        "study_year": c.study_year
-    } for c in courses]
-
+    # Filtre opționale, aplicate peste restricțiile rolului
+    if request.args.get("specialization"):
+        stmt = stmt.where(Course.specialization == request.args["specialization"])
+    if request.args.get("study_year"):
+        try:
+            stmt = stmt.where(Course.study_year == int(request.args["study_year"]))
+        except ValueError:
+            return jsonify({"msg": "Parametrul study_year trebuie să fie un număr întreg."}), 400
+
+    try:
+        page = page_params()
+        if page is not None:
+            rows, next_cursor = keyset_page(stmt, (Course.course_id,), *page)
+        else:
+            rows = db.session.execute(stmt.order_by(Course.course_id)).all()
+    except PaginationError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    course_list = [serialize_course(row) for row in rows]
+
+    if page is not None:
+        return jsonify({"courses": course_list, "next_cursor": next_cursor}), 200
     return jsonify(course_list), 200
 
 
@@ -114,8 +145,7 @@ def get_courses_by_role():
 })
 def set_examination_method(course_id):
 
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user = current_user
     data = request.get_json()
     new_method = data.get("examination_method")
     print(user.role)
@@ -176,8 +206,7 @@ def set_examination_method(course_id):
     }
 })
 def get_course_by_id(course_id):
-    user_id = get_jwt_identity()
-    user = db.session.get(User, user_id)
+    user = current_user
     course = db.session.get(Course, course_id)
 
     if not user or not course:
@@ -190,11 +219,11 @@ def get_course_by_id(course_id):
         if course.coordinator_id != user.user_id:
             return jsonify({'message': 'Acces interzis'}), 403
     elif  user.role == UserRole.SG:
-        group = user.led_groups[0] if user.led_groups else None
+        group = current_group()
         if not group:
             return jsonify({"message": "Nu ești lider de grup"}), 403
 
-        if group.specialization != course.specialization or group.year_of_study != course.study_year:
+        if group.specialization != course.specialization or group.study_year != course.study_year:
             return jsonify({
                 "message": "Grupa ta nu corespunde cu specializarea sau anul de studiu al cursului"
             }), 403
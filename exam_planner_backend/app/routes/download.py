@@ -3,25 +3,78 @@ from datetime import datetime
 
 import pandas as pd
 from flasgger import swag_from
-from flask import Blueprint, current_app
-from openpyxl import Workbook
+from flask import Blueprint, current_app, request
 from io import BytesIO
-from datetime import datetime
 from flask import send_file, jsonify
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib import colors, fonts
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
-import os
 
-from app import db
 from app.decorators import roles_required
-from app.models import Exam
+from app.export_cache import export_cache
+from app.exports import exam_export_rows, exam_export_rows_by_group, render_xlsx, render_pdf, render_booklet
 
 download_bp = Blueprint("download", __name__)
 
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Parametrii de filtrare comuni exporturilor (documentație Swagger)
+EXPORT_FILTER_PARAMETERS = [
+    {'name': 'group_id', 'in': 'query', 'type': 'integer', 'required': False, 'description': 'Doar examenele grupei'},
+    {'name': 'professor_id', 'in': 'query', 'type': 'integer', 'required': False,
+     'description': 'Doar examenele profesorului'},
+    {'name': 'specialization', 'in': 'query', 'type': 'string', 'required': False,
+     'description': 'Specializarea grupei'},
+    {'name': 'study_year', 'in': 'query', 'type': 'integer', 'required': False,
+     'description': 'Anul de studiu al grupei'},
+    {'name': 'date_from', 'in': 'query', 'type': 'string', 'format': 'date', 'required': False,
+     'description': 'Prima dată inclusă (YYYY-MM-DD)'},
+    {'name': 'date_to', 'in': 'query', 'type': 'string', 'format': 'date', 'required': False,
+     'description': 'Ultima dată inclusă (YYYY-MM-DD)'},
+]
+
+
+def _export_filters():
+    """
+    Citește filtrele exportului din query string.
+
+    Returns:
+        dict: Filtrele trimise, cu valorile convertite.
+
+    Raises:
+        ValueError: Dacă un filtru are o valoare invalidă.
+    """
+    filters = {}
+    for name in ("group_id", "professor_id", "study_year"):
+        if request.args.get(name):
+            try:
+                filters[name] = int(request.args[name])
+            except ValueError:
+                raise ValueError(f"Parametrul {name} trebuie să fie un număr întreg.")
+    if request.args.get("specialization"):
+        filters["specialization"] = request.args["specialization"]
+    for name in ("date_from", "date_to"):
+        if request.args.get(name):
+            try:
+                filters[name] = datetime.strptime(request.args[name], "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError(f"Parametrul {name} trebuie să aibă formatul YYYY-MM-DD.")
+    return filters
+
+
+def _cached_export(name, filters, load, render, mimetype, extension):
+    """
+    Trimite un export din cache, cu ETag; răspunde cu 304 dacă clientul are deja aceeași versiune.
+    """
+    key = name + "?" + "&".join(f"{k}={v}" for k, v in sorted(filters.items()))
+    etag, data = export_cache.get_or_render(key, lambda: load(filters), render)
+    response = send_file(
+        BytesIO(data),
+        as_attachment=True,
+        download_name=f"examene_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{extension}",
+        mimetype=mimetype,
+        etag=etag,
+    )
+    response.cache_control.no_cache = True
+    return response
+
 
 @download_bp.route("/download/user-template", methods=["GET"])
 @roles_required("SEC")
@@ -68,10 +121,12 @@ def download_user_template():
 @swag_from({
     'tags': ['Download'],
     'summary': 'Descarcă fișier Excel cu examenele și datele acestora',
-    'description': 'Returnează un fișier Excel care conține informațiile despre examene, cursuri, grupuri și profesori.',
+    'description': 'Returnează un fișier Excel care conține informațiile despre examene, cursuri, grupuri și profesori.'
+                   ' Examenele pot fi filtrate după grupă, profesor, specializare, an de studiu și interval de date.',
+    'parameters': EXPORT_FILTER_PARAMETERS,
     'responses': {
         200: {
-            'description': 'Fișier Excel cu examenele generat cu succes',
+            'description': 'Fișier Excel cu examenele generat cu succes (cu ETag)',
             'content': {
                 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': {
                     'schema': {
@@ -81,58 +136,24 @@ def download_user_template():
                 }
             }
         },
+        304: {
+            'description': 'Fișierul nu s-a modificat față de ETag-ul trimis în If-None-Match'
+        },
+        400: {
+            'description': 'Filtru invalid'
+        },
         500: {
             'description': 'Eroare internă la generarea fișierului Excel'
         }
     }
 })
 def download_exams():
-    # Creăm un workbook și o foaie de lucru
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Examene"
-
-
-    ws.append([
-        "Grupa", "Disciplina", "Examinator", "Asistent", "Data examen/colocviu", "Ora examen/colocviu",
-        "Sala"
-    ])
-
-    # Obținem toate examenele din baza de date, sortate după data și ora examenului
-    exams = db.session.query(Exam).order_by(Exam.exam_date.asc(), Exam.start_time.asc()).all()
-
-    for exam in exams:
-        # Adunăm datele despre fiecare examen
-        course = exam.course
-        group = exam.group
-        room = exam.room
-        professor = exam.professor
-        assistant = exam.assistant
-
-
-        # Adăugăm informațiile într-o linie în fișierul Excel
-        ws.append([
-            group.name + "/" + str(group.year_of_study) + "/" + group.specialization,
-            course.name,
-            professor.name,
-            assistant.name if assistant else "N/A",
-            exam.exam_date.strftime("%Y-%m-%d"),  # Formatează data
-            exam.start_time.strftime("%H:%M") if exam.start_time else "N/A",  # Formatează ora
-            room.name if room else "N/A",  # Verifică dacă există sală
-        ])
-
-    # Salvează fișierul într-un obiect BytesIO
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
-
-    # Trimitem fișierul pentru descărcare
-    return send_file(
-        excel_file,
-        as_attachment=True,
-        download_name=f"examene_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    try:
+        filters = _export_filters()
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    return _cached_export("exams-xlsx", filters, exam_export_rows, render_xlsx, XLSX_MIMETYPE, "xlsx")
 
 
 @download_bp.route("/download/exams-pdf", methods=["GET"])
@@ -140,10 +161,15 @@ def download_exams():
 @swag_from({
     'tags': ['Download'],
     'summary': 'Descarcă fișier PDF cu examenele și datele acestora',
-    'description': 'Returnează un fișier PDF care conține informațiile despre examene, cursuri, grupuri și profesori.',
+    'description': 'Returnează un fișier PDF care conține informațiile despre examene, cursuri, grupuri și profesori.'
+                   ' Cu booklet=1 se returnează o arhivă ZIP cu câte un PDF pentru fiecare grupă.',
+    'parameters': EXPORT_FILTER_PARAMETERS + [
+        {'name': 'booklet', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': '1 pentru broșura pe grupe (ZIP)'},
+    ],
     'responses': {
         200: {
-            'description': 'Fișier PDF cu examenele generat cu succes',
+            'description': 'Fișier PDF cu examenele generat cu succes (cu ETag)',
             'content': {
                 'application/pdf': {
                     'schema': {
@@ -153,77 +179,26 @@ def download_exams():
                 }
             }
         },
+        304: {
+            'description': 'Fișierul nu s-a modificat față de ETag-ul trimis în If-None-Match'
+        },
+        400: {
+            'description': 'Filtru invalid'
+        },
         500: {
             'description': 'Eroare internă la generarea fișierului PDF'
         }
     }
 })
 def download_exams_pdf():
-    font_path = os.path.join(current_app.root_path, 'static', 'DejaVuSans.ttf')
-
-    # Înregistrează fontul
-    pdfmetrics.registerFont(TTFont('DejaVuSans', font_path))
-
-    exams = db.session.query(Exam).order_by(Exam.exam_date.asc(), Exam.start_time.asc()).all()
-
-    data = [
-        ["Grupa", "Disciplina", "Examinator", "Asistent", "Data examen/colocviu", "Ora examen/colocviu",
-         "Sala"]
-    ]
-
-    # Adăugăm datele examenele
-    for exam in exams:
-        course = exam.course
-        group = exam.group
-        room = exam.room
-        professor = exam.professor
-        assistant = exam.assistant
-
-        data.append([
-            group.name + "/" + str(group.year_of_study) + "/" + group.specialization,
-            course.name,
-            professor.name,
-            assistant.name if assistant else "N/A",
-            exam.exam_date.strftime("%Y-%m-%d"),  # Formatează data
-            exam.start_time.strftime("%H:%M") if exam.start_time else "N/A",  # Formatează ora
-            room.name if room else "N/A",  # Verifică dacă există sală
-        ])
-
-    # Crează documentul PDF
-    pdf_file = os.path.join(current_app.root_path, 'static', "examene.pdf")
-    doc = SimpleDocTemplate(pdf_file, pagesize=landscape(letter))  # Format landscape
-
-    title = "Programarea colocviilor si examenelor"
-    styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    title_paragraph = Paragraph(title, title_style)
-    # Creează tabelul
-    table = Table(data)
-
-    # Adaugă stil pentru tabel
-    style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'DejaVuSans'),  # Folosește fontul înregistrat
-        ('FONTSIZE', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.whitesmoke),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ])
-
-    table.setStyle(style)
-
-    # Adaugă tabelul la document
-    elements = [title_paragraph, table]
-    doc.build(elements)
-
-    print(f"Fișierul PDF a fost generat: {pdf_file}")
-
-    # Trimite fișierul PDF către utilizator
-    return send_file(
-        pdf_file,
-        as_attachment=True,
-        download_name=f"examene_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.pdf",
-        mimetype="application/pdf"
-    )
+    try:
+        filters = _export_filters()
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    # Broșura: câte un PDF pentru fiecare grupă, într-o arhivă ZIP
+    if request.args.get("booklet", "").lower() in ("1", "true"):
+        return _cached_export("exams-booklet", filters, exam_export_rows_by_group, render_booklet,
+                              "application/zip", "zip")
+
+    return _cached_export("exams-pdf", filters, exam_export_rows, render_pdf, "application/pdf", "pdf")
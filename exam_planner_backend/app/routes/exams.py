@@ -1,33 +1,40 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 
 from flasgger import swag_from
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
-from sqlalchemy import and_
+from flask_jwt_extended import jwt_required
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
+from app.conflict_audit import audit_conflicts
+from app.date_suggestions import suggest_alternatives, format_alternatives
 from app.decorators import roles_required
+from app.edit_plan import run_edit_plan, PlanError
 from app.email import send_email_notification
-from app.models import ExaminationPeriod, db, UserRole, Group, User, Course, Exam, ExamStatus, Room, ExamType
+from app.group_constraints import check_group_date
+from app.identity import current_user, current_group
+from app.interval_index import find_conflict, IntervalList, load_db_intervals
+from app.pagination import page_params, keyset_page, PaginationError
+from app.intervals import as_minutes
+from app.models import ExaminationPeriod, db, UserRole, Group, User, Course, Exam, ExamStatus, Room, ExamType, \
+    exclusion_violation_field, EXAM_START_KEY
+from app.scheduler import auto_schedule, missing_exams_by_group
+from app.serializers import exam_row_select, serialize_exam_list_item, serialize_exam_details, \
+    serialize_exam_by_status
 
 exams_bp = Blueprint("exam", __name__, url_prefix="/exam")
 
-
-def overlaps(start1, dur1, start2, dur2):
-    # Verificăm și convertim start1 și start2 la obiecte 'time' dacă sunt șiruri
-    if isinstance(start1, str):
-        start1 = datetime.strptime(start1, "%H:%M").time()
-    if isinstance(start2, str):
-        start2 = datetime.strptime(start2, "%H:%M").time()
-
-    # Converim 'start1' și 'start2' în obiecte datetime pentru a le compara
-    s1 = datetime.combine(date.today(), start1)
-    e1 = s1 + timedelta(minutes=dur1)
-    s2 = datetime.combine(date.today(), start2)
-    e2 = s2 + timedelta(minutes=dur2)
-
-    # Verificăm dacă există o suprapunere
-    return s1 < e2 and s2 < e1
+# Mesajele de conflict pentru fiecare resursă verificată
+REVIEW_CONFLICT_MESSAGES = {
+    "room_id": "Sala este ocupata in acest interval de timp.",
+    "assistant_id": "Asistentul este ocupat in intervalul propus.",
+    "professor_id": "Aveti un alt examen acceptat in intervalul propus",
+}
+EDIT_CONFLICT_LABELS = {
+    "room_id": "Sala",
+    "assistant_id": "Asistentul",
+    "professor_id": "Profesorul",
+}
 
 
 @exams_bp.route("/propose", methods=["POST"])
@@ -63,14 +70,14 @@ def overlaps(start1, dur1, start2, dur2):
             'description': 'Utilizatorul nu este liderul grupului.'
         },
         '409': {
-            'description': 'Examenul pentru aceasta disciplina a fost deja propus.'
+            'description': 'Examenul pentru aceasta disciplina a fost deja propus sau data încalcă '
+                           'constrângerile grupei (examene pe zi / zile între examene).'
         }
     }
 })
 # doar SG poate face propuneri
 def exam_date_propose():
     data = request.get_json()
-    user_id = get_jwt_identity()
 
     # 1. Validare date
     course_id = data.get("course_id")
@@ -84,9 +91,9 @@ def exam_date_propose():
         return jsonify({"msg": "Formatul datei trebuie să fie YYYY-MM-DD"}), 400
 
     # 2. Obține user, curs și grup
-    user = User.query.get(user_id)
+    user = current_user
     course = Course.query.get(course_id)
-    group = Group.query.filter_by(leader_id=user_id).first()
+    group = current_group(verify=True)
 
     if not group:
         return jsonify({"msg": "Nu ești liderul niciunei grupe."}), 403
@@ -110,6 +117,11 @@ def exam_date_propose():
     existing_exam = Exam.query.filter_by(course_id=course_id, group_id=group.group_id).first()
     if existing_exam:
         return jsonify({"error": "Examenul pentru aceasta disciplina a fost deja propus."}), 409
+
+    group_conflict = check_group_date(group.group_id, exam_date)
+    if group_conflict:
+        return jsonify({"error": group_conflict}), 409
+
     # 3. Creează examen
     exam = Exam(
         course_id=course.course_id,
@@ -131,7 +143,7 @@ def exam_date_propose():
         send_email_notification(
             to="ancuta.cirlan1@student.usv.ro",
             subject="Propunere nouă pentru dată de examen",
-            body=f"{user.name} din grupa {group.name} a propus o dată pentru cursul {course.name}.\n"
+            body=f"{user.name} din grupa {exam.group.name} a propus o dată pentru cursul {course.name}.\n"
                  f"Data propusă: {exam_date.strftime('%d.%m.%Y')}"
         )
     except Exception as e:
@@ -183,7 +195,8 @@ def exam_date_propose():
         200: {'description': 'Decizia a fost înregistrată cu succes'},
         400: {'description': 'Date invalide sau incomplete'},
         404: {'description': 'Examenul sau datele nu au fost găsite'},
-        409: {'description': 'Conflicte de programare (sală/asistent/profesor)'}
+        409: {'description': 'Conflicte de programare (sală/asistent/profesor); răspunsul conține '
+                             '`alternatives`, o listă de date și ore libere (exam_date, start_time, room_id)'}
     }
 })
 
@@ -196,9 +209,6 @@ def review_exam_proposal():
 
     exam = Exam.query.get_or_404(exam_id)
 
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
-
     if exam.status != ExamStatus.IN_ASTEPTARE:
         return jsonify({"msg": "Propunerea a fost acceptată și actualizată."}), 400
 
@@ -230,65 +240,15 @@ def review_exam_proposal():
         if not assistant or assistant.role != UserRole.CD:
             return jsonify({"msg": "Asistentul selectat nu este valid."}), 404
 
-        def overlaps(start1, dur1, start2, dur2):
-            # Verificăm și convertim start1 și start2 la obiecte 'time' dacă sunt șiruri
-            if isinstance(start1, str):
-                start1 = datetime.strptime(start1, "%H:%M").time()
-            if isinstance(start2, str):
-                start2 = datetime.strptime(start2, "%H:%M").time()
-
-            # Converim 'start1' și 'start2' în obiecte datetime pentru a le compara
-            s1 = datetime.combine(date.today(), start1)
-            e1 = s1 + timedelta(minutes=dur1)
-            s2 = datetime.combine(date.today(), start2)
-            e2 = s2 + timedelta(minutes=dur2)
-
-            # Verificăm dacă există o suprapunere
-            return s1 < e2 and s2 < e1
-
-        # Verificare sală
-        room_conflicts = Exam.query.filter(
-            and_(
-                Exam.room_id == room_id,
-                Exam.exam_date == exam.exam_date,
-                Exam.exam_id != exam.exam_id,
-                Exam.status == ExamStatus.ACCEPTAT
-            )
-        ).all()
-
-        for e in room_conflicts:
-            if overlaps(start_time, duration, e.start_time, e.duration):
-                return jsonify({"msg": "Sala este ocupata in acest interval de timp."}), 409
-
-        # Verificare asistent
-        assistant_conflicts = Exam.query.filter(
-            and_(
-                Exam.assistant_id == assistant_id,
-                Exam.exam_date == exam.exam_date,
-                Exam.exam_id != exam.exam_id,
-                Exam.status == ExamStatus.ACCEPTAT
-
-            )
-        ).all()
-
-        for e in assistant_conflicts:
-            if overlaps(start_time, duration, e.start_time, e.duration):
-                return jsonify({"msg": "Asistentul este ocupat in intervalul propus."}), 409
-
-        # Verificare profesor
-        prof_conflicts = Exam.query.filter(
-            and_(
-                Exam.professor_id == current_user.user_id,
-                Exam.exam_date == exam.exam_date,
-                Exam.exam_id != exam.exam_id,
-                Exam.status == ExamStatus.ACCEPTAT
-
-            )
-        ).all()
-
-        for e in prof_conflicts:
-            if overlaps(start_time, duration, e.start_time, e.duration):
-                return jsonify({"msg": "Aveti un alt examen acceptat in intervalul propus"}), 409
+        # Verificare sală, asistent și profesor folosind indexul de intervale
+        for field, value in (("room_id", room_id), ("assistant_id", assistant_id),
+                             ("professor_id", current_user.user_id)):
+            if find_conflict(field, value, exam.exam_date, start_time, duration, exam.exam_id):
+                return jsonify({
+                    "msg": REVIEW_CONFLICT_MESSAGES[field],
+                    "alternatives": suggest_alternatives(exam, current_user.user_id, duration, room_id,
+                                                         not_before=date.today()),
+                }), 409
 
         # Acceptare finală
         exam.status = ExamStatus.ACCEPTAT
@@ -299,7 +259,19 @@ def review_exam_proposal():
         exam.duration = duration
         exam.details = details
 
-        db.session.commit()
+        # Constrângerile de excludere din BD resping suprapunerile apărute concurent
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            field = exclusion_violation_field(e)
+            if field is None:
+                raise
+            return jsonify({
+                "msg": REVIEW_CONFLICT_MESSAGES[field],
+                "alternatives": suggest_alternatives(exam, current_user.user_id, duration, room_id,
+                                                     not_before=date.today()),
+            }), 409
 
         course = Course.query.get(exam.course_id);
 
@@ -328,6 +300,8 @@ def review_exam_proposal():
         db.session.commit()
 
         course = Course.query.get(exam.course_id)
+        alternatives = suggest_alternatives(exam, current_user.user_id, exclude_date=exam.exam_date,
+                                            not_before=date.today())
 
         # Notificare SG
         sg = User.query.get(Group.query.get(exam.group_id).leader_id)
@@ -337,14 +311,251 @@ def review_exam_proposal():
             subject="Propunere respinsă",
             body=f"Data propusă pentru examenul '{course.name}' a fost respinsă de profesor. Alegeti o alta data."
                  f"\nalte detalii: {exam.details}. \n"
+                 + (f"Date disponibile:\n{format_alternatives(alternatives)}\n" if alternatives else "")
         )
 
-        return jsonify({"msg": "Propunerea a fost respinsa si studentul a fost notificat."}), 200
+        return jsonify({"msg": "Propunerea a fost respinsa si studentul a fost notificat.",
+                        "alternatives": alternatives}), 200
 
     else:
         return jsonify({"msg": "Decizie invalida. Statusul poate fi doar 'ACCEPTAT' sau 'RESPINS'."}), 400
 
 
+@exams_bp.route("/review/batch", methods=["PUT"])
+@roles_required("CD")
+@swag_from({
+    'tags': ['Examen'],
+    'summary': 'Acceptă sau respinge mai multe propuneri de examen',
+    'description': 'Procesează o listă de decizii într-o singură tranzacție. Fiecare decizie este verificată față de '
+                   'examenele acceptate din baza de date și față de celelalte decizii din listă. Implicit '
+                   '(`all_or_nothing` false) deciziile valide sunt salvate, iar cele invalide sunt raportate '
+                   'în `results` cu propriul cod; cu `all_or_nothing` true orice eroare anulează întreaga listă.',
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'all_or_nothing': {
+                        'type': 'boolean', 'default': False,
+                        'description': 'true: lista se aplică doar dacă toate deciziile sunt valide; '
+                                       'false: se aplică doar deciziile valide (listă parțială)'
+                    },
+                    'decisions': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'exam_id': {'type': 'integer', 'example': 5},
+                                'decision': {'type': 'string', 'enum': ['ACCEPTAT', 'RESPINS']},
+                                'room_id': {'type': 'integer', 'example': 1},
+                                'assistant_id': {'type': 'integer', 'example': 3},
+                                'start_time': {'type': 'string', 'example': '09:30'},
+                                'duration': {'type': 'integer', 'example': 120},
+                                'details': {'type': 'string', 'example': 'Se permite laptop'}
+                            },
+                            'required': ['exam_id', 'decision']
+                        }
+                    }
+                },
+                'required': ['decisions']
+            }
+        }
+    ],
+    'responses': {
+        200: {'description': 'Rezultatul (`code`) pentru fiecare decizie; doar cele cu 200 au fost salvate'},
+        400: {'description': 'Lista de decizii lipsește sau este invalidă'},
+        409: {'description': 'Conflicte de programare (lista a fost anulată)'}
+    }
+})
+def review_exam_proposals_batch():
+    data = request.get_json(silent=True) or {}
+    decisions = data.get("decisions")
+    all_or_nothing = bool(data.get("all_or_nothing", False))
+
+    if not isinstance(decisions, list) or not decisions:
+        return jsonify({"msg": "Lipseste lista de decizii."}), 400
+
+    professor_id = current_user.user_id
+
+    # Toate entitățile necesare sunt încărcate cu câte o interogare
+    def ids(key):
+        return {d.get(key) for d in decisions if isinstance(d, dict) and _is_id(d.get(key))}
+
+    exams = {
+        e.exam_id: e for e in Exam.query.filter(Exam.exam_id.in_(ids("exam_id")))
+        .options(joinedload(Exam.course), joinedload(Exam.group).joinedload(Group.leader)).all()
+    }
+    room_ids = ids("room_id")
+    rooms = {r.room_id for r in Room.query.filter(Room.room_id.in_(room_ids)).all()} if room_ids else set()
+    assistant_ids = ids("assistant_id")
+    assistants = {
+        u.user_id: u for u in User.query.filter(User.user_id.in_(assistant_ids), User.role == UserRole.CD).all()
+    } if assistant_ids else {}
+
+    # Ocuparea sălilor / persoanelor din BD (vizibilă pentru toate procesele), într-o singură interogare
+    db_intervals = load_db_intervals({exam.exam_date for exam in exams.values()},
+                                     {"room_id": rooms, "assistant_id": set(assistants),
+                                      "professor_id": {professor_id}})
+
+    results = []
+    applied = []
+    seen = set()
+    batch_intervals = {}
+
+    for item in decisions:
+        result, change = _check_batch_decision(item, exams, rooms, assistants, professor_id, seen, batch_intervals,
+                                               db_intervals)
+        results.append(result)
+        if change is not None:
+            applied.append(change)
+
+    if all_or_nothing and len(applied) != len(results):
+        return jsonify({"msg": "Lista a fost anulată deoarece conține decizii invalide.", "results": results}), 409
+
+    # Mesajele pentru notificări se construiesc înainte de commit (obiectele expiră după commit)
+    notifications = []
+    for exam, values in applied:
+        notifications.append((exam.group_id, _batch_review_line(exam, values, assistants)))
+        for key, value in values.items():
+            setattr(exam, key, value)
+
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        field = exclusion_violation_field(e)
+        if field is None:
+            raise
+        # Nicio decizie nu a fost salvată
+        for result in results:
+            if result["code"] == 200:
+                result.update(code=409, msg="Decizia nu a fost salvată deoarece lista a fost anulată.")
+                result.pop("status", None)
+        return jsonify({"msg": REVIEW_CONFLICT_MESSAGES[field] + " Lista a fost anulată.", "results": results}), 409
+
+    _notify_batch_review(notifications)
+
+    return jsonify({"applied": len(applied), "results": results}), 200
+
+
+def _is_id(value):
+    """True pentru un ID trimis în JSON ca număr întreg (nu bool, text sau listă)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_batch_decision(item, exams, rooms, assistants, professor_id, seen, batch_intervals, db_intervals):
+    """
+    Validează o decizie din lista trimisă la `/exam/review/batch`.
+
+    Returns:
+        tuple: (rezultatul pentru răspuns, (examen, valori de actualizat) sau None dacă decizia este invalidă)
+    """
+    def error(msg, code):
+        return {"exam_id": exam_id, "code": code, "msg": msg}, None
+
+    exam_id = item.get("exam_id") if isinstance(item, dict) else None
+    if not exam_id:
+        return error("Lipseste exam_id", 400)
+    if not _is_id(exam_id):
+        return error("exam_id trebuie să fie un număr întreg.", 400)
+    if exam_id in seen:
+        return error("Examenul apare de mai multe ori în listă.", 400)
+    seen.add(exam_id)
+
+    exam = exams.get(exam_id)
+    if not exam:
+        return error("Examenul nu a fost găsit.", 404)
+    if exam.status != ExamStatus.IN_ASTEPTARE:
+        return error("Propunerea a fost deja evaluată.", 400)
+
+    decision = item.get("decision")
+    if decision == "RESPINS":
+        values = {"status": ExamStatus.RESPINS, "details": item.get("details", "")}
+        return {"exam_id": exam_id, "code": 200, "status": "RESPINS"}, (exam, values)
+
+    if decision != "ACCEPTAT":
+        return error("Decizie invalida. Statusul poate fi doar 'ACCEPTAT' sau 'RESPINS'.", 400)
+
+    room_id = item.get("room_id")
+    assistant_id = item.get("assistant_id")
+    start_time_str = item.get("start_time")
+    duration = item.get("duration")
+    if not all([room_id, assistant_id, start_time_str, duration]):
+        return error("Lipsesc câmpuri obligatorii pentru acceptare.", 400)
+    if not _is_id(room_id) or not _is_id(assistant_id):
+        return error("room_id și assistant_id trebuie să fie numere întregi.", 400)
+
+    try:
+        start_time = datetime.strptime(start_time_str, "%H:%M").time()
+    except (TypeError, ValueError):
+        return error("Format oră invalid. Se așteaptă HH:MM", 400)
+
+    try:
+        duration = int(duration)
+    except (TypeError, ValueError):
+        return error("Durata trebuie să fie un număr de minute.", 400)
+
+    if room_id not in rooms:
+        return error("Sala selectată nu există.", 404)
+    if assistant_id not in assistants:
+        return error("Asistentul selectat nu este valid.", 404)
+
+    resources = (("room_id", room_id), ("assistant_id", assistant_id), ("professor_id", professor_id))
+    start = as_minutes(start_time)
+    for field, value in resources:
+        intervals = db_intervals.get((field, value, exam.exam_date))
+        if intervals is not None and intervals.find(start, start + duration, exam_id) is not None:
+            return error(REVIEW_CONFLICT_MESSAGES[field], 409)
+        intervals = batch_intervals.get((field, value, exam.exam_date))
+        if intervals is not None and intervals.find(start, start + duration) is not None:
+            return error(REVIEW_CONFLICT_MESSAGES[field] + " (conflict în aceeași listă)", 409)
+
+    for field, value in resources:
+        batch_intervals.setdefault((field, value, exam.exam_date), IntervalList()).add(start, start + duration, exam_id)
+
+    values = {
+        "status": ExamStatus.ACCEPTAT,
+        "room_id": room_id,
+        "assistant_id": assistant_id,
+        "professor_id": professor_id,
+        "start_time": start_time,
+        "duration": duration,
+        "details": item.get("details", ""),
+    }
+    return {"exam_id": exam_id, "code": 200, "status": "ACCEPTAT"}, (exam, values)
+
+
+def _batch_review_line(exam, values, assistants):
+    course_name = exam.course.name
+    if values["status"] == ExamStatus.ACCEPTAT:
+        assistant = assistants.get(values["assistant_id"])
+        return (f"- '{course_name}': acceptat, data {exam.exam_date}, ora {values['start_time']}, "
+                f"durata {values['duration']} min, prof. asistent: {assistant.name if assistant else '-'}, "
+                f"detalii: {values['details']}")
+    return f"- '{course_name}': respins, alegeti o alta data. detalii: {values['details']}"
+
+
+def _notify_batch_review(notifications):
+    """Trimite câte un singur email fiecărui șef de grupă, cu toate deciziile care îl privesc."""
+    by_group = {}
+    for group_id, line in notifications:
+        by_group.setdefault(group_id, []).append(line)
+
+    for group_id, lines in by_group.items():
+        try:
+            send_email_notification(
+                # to=leader.email,
+                to="ancuta.cirlan1@student.usv.ro",
+                subject="Decizii pentru propunerile de examen",
+                body="Propunerile grupei au fost evaluate:\n" + "\n".join(lines)
+            )
+        except Exception as e:
+            print(f"⚠️ Notificare eșuată pentru grupa {group_id}: {e}")
+
+
 @exams_bp.route("/by-status", methods=["GET"])
 @roles_required("CD")
 @swag_from({
@@ -474,38 +685,19 @@ def review_exam_proposal():
 
 
 def get_exams_by_status():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user
 
     if not user or user.role != UserRole.CD:
         return jsonify({"msg": "Acces interzis"}), 403
 
     # Toate examenele de la cursurile unde e coordonator
-    exams = (
-        Exam.query
-        .join(Course)
-        .filter(Course.coordinator_id == user.user_id)
-        .options(joinedload(Exam.course), joinedload(Exam.group), joinedload(Exam.room))
-        .all()
-    )
+    rows = db.session.execute(exam_row_select().where(Course.coordinator_id == user.user_id)).all()
 
     grouped_exams = {"IN_ASTEPTARE": [], "ACCEPTAT": [], "RESPINS": []}
 
-    for exam in exams:
-        status = exam.status.name if exam.status else "IN_ASTEPTARE"
-        grouped_exams[status].append({
-            "exam_id": exam.exam_id,
-            "course_name": exam.course.name if exam.course else None,
-            "group_name": exam.group.name if exam.group else None,
-            "specialization": exam.course.specialization if exam.course else None,
-            "exam_date": exam.exam_date.isoformat() if exam.exam_date else None,
-            "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
-            "duration": exam.duration,
-            "room": exam.room.name if exam.room else None,
-            "building": exam.room.building if exam.room else None,
-            "type": exam.type,
-            "status": status
-        })
+    for row in rows:
+        exam_info = serialize_exam_by_status(row)
+        grouped_exams[exam_info["status"]].append(exam_info)
 
     return jsonify(grouped_exams), 200
 
@@ -550,40 +742,16 @@ def get_exams_by_status():
     }
 })
 def get_group_exams():
-    # Obținem ID-ul utilizatorului (șeful de grup) din token-ul JWT
-    current_user_id = get_jwt_identity()
-
-    # Verificăm dacă utilizatorul are rolul de șef de grup (SG)
-    user = User.query.get(current_user_id)
-
-    # Obținem grupul de care este responsabil șeful de grup
-    group = Group.query.filter_by(leader_id=current_user_id).first()
+    # Obținem grupul de care este responsabil șeful de grup (din token)
+    group = current_group()
     if not group:
         return jsonify({"msg": "Grupa asignata sefului de grupa nu a fost găsita."}), 404
 
     # Preluăm examenele pentru grupul respectiv
-    exams = db.session.query(Exam).filter_by(group_id=group.group_id). \
-        options(joinedload(Exam.course), joinedload(Exam.room), joinedload(Exam.professor),
-                joinedload(Exam.assistant)).all()
+    rows = db.session.execute(exam_row_select().where(Exam.group_id == group.group_id)).all()
 
     # Formăm lista de examene și detalii relevante
-    exam_details = []
-    for exam in exams:
-        exam_info = {
-            "exam_id": exam.exam_id,
-            "course_name": exam.course.name,
-            "exam_type": str(exam.type),
-            "exam_date": exam.exam_date.strftime("%Y-%m-%d") if exam.exam_date else None,
-            "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
-            "duration": exam.duration if exam.duration is not None else None,
-            "room": exam.room.name if exam.room else None,
-            "building": exam.room.building if exam.room else None,
-            "professor": exam.professor.name if exam.professor else None,
-            "assistant": exam.assistant.name if exam.assistant else None,
-            "status": exam.status.value if exam.status else None,
-            "details": exam.details if exam.details else None
-        }
-        exam_details.append(exam_info)
+    exam_details = [serialize_exam_details(row) for row in rows]
 
     # Returnăm lista cu toate examenele
     return jsonify(exam_details), 200
@@ -632,14 +800,16 @@ def get_group_exams():
         },
         404: {
             'description': 'Examenul sau grupa nu a fost găsit(ă).'
+        },
+        409: {
+            'description': 'Data încalcă constrângerile grupei (examene pe zi / zile între examene). '
+                           'Răspunsurile 400 / 409 conțin `alternatives`, o listă de date și ore libere.'
         }
     }
 })
 def reschedule_exam(exam_id):
-    current_user_id = get_jwt_identity()
-
     # Verificăm grupa asociată șefului de grup
-    group = Group.query.filter_by(leader_id=current_user_id).first()
+    group = current_group(verify=True)
     if not group:
         return jsonify({"msg": "Grupa asociată nu a fost găsită."}), 404
 
@@ -672,7 +842,15 @@ def reschedule_exam(exam_id):
     ).first()
 
     if not perioada:
-        return jsonify({"error": "Data nu este într-o perioadă de examinare validă."}), 400
+        return jsonify({"error": "Data nu este într-o perioadă de examinare validă.",
+                        "alternatives": suggest_alternatives(exam, exclude_date=exam.exam_date,
+                                                             not_before=date.today())}), 400
+
+    group_conflict = check_group_date(group.group_id, new_date, exclude_exam_id=exam.exam_id)
+    if group_conflict:
+        return jsonify({"error": group_conflict,
+                        "alternatives": suggest_alternatives(exam, exclude_date=exam.exam_date,
+                                                             not_before=date.today())}), 409
 
     # Actualizăm data
     exam.exam_date = new_date
@@ -741,55 +919,40 @@ def reschedule_exam(exam_id):
     }
 })
 def get_exam(exam_id):
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
 
     if not user:
         return jsonify({"error": "Utilizator inexistent."}), 404
 
-    exam = Exam.query.get(exam_id)
+    exam = db.session.execute(
+        exam_row_select(Exam.professor_id, Exam.group_id).where(Exam.exam_id == exam_id)
+    ).first()
     if not exam:
         return jsonify({"error": "Examenul nu a fost găsit."}), 404
+    professor_id, group_id = exam[-2:]
 
     # Rol: secretar → poate vedea tot
     if user.role == UserRole.SEC:
-        return jsonify(exam_to_dict(exam)), 200
+        return jsonify(serialize_exam_details(exam)), 200
 
     # Rol: profesor
     if user.role == UserRole.CD:
-        if exam.professor_id == user.user_id:
-            return jsonify(exam_to_dict(exam)), 200
+        if professor_id == user.user_id:
+            return jsonify(serialize_exam_details(exam)), 200
         else:
             return jsonify({"error": "Nu ai acces la acest examen."}), 403
 
     # Rol: sef de grupă
     if user.role == UserRole.SG:
-        group_led = Group.query.filter_by(leader_id=user.user_id).first()
-        if exam.group_id == group_led.group_id:
-            return jsonify(exam_to_dict(exam)), 200
+        group_led = current_group()
+        if group_led and group_id == group_led.group_id:
+            return jsonify(serialize_exam_details(exam)), 200
         else:
             return jsonify({"error": "Nu ești liderul acestui grup."}), 403
 
     return jsonify({"error": "Rolul tău nu are acces la acest examen."}), 403
 
 
-def exam_to_dict(exam):
-    return {
-        "exam_id": exam.exam_id,
-        "course_name": exam.course.name,
-        "exam_type": str(exam.type),
-        "exam_date": exam.exam_date.strftime("%Y-%m-%d") if exam.exam_date else None,
-        "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
-        "duration": exam.duration if exam.duration is not None else None,
-        "room": exam.room.name if exam.room else None,
-        "building": exam.room.building if exam.room else None,
-        "professor": exam.professor.name if exam.professor else None,
-        "assistant": exam.assistant.name if exam.assistant else None,
-        "status": exam.status.value if exam.status else None,
-        "details": exam.details if exam.details else None
-    }
-
-
 @exams_bp.route("/edit/<int:exam_id>", methods=["PUT"])
 @roles_required("SEC")
 @swag_from({
@@ -806,6 +969,15 @@ def exam_to_dict(exam):
             'description': 'ID-ul examenului care trebuie modificat',
             'example': 1
         },
+        {
+            'name': 'dry_run',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Cu dry_run=1 modificarea doar este simulată: se întorc conflictele și diferențele, '
+                           'fără a salva nimic.',
+            'example': 1
+        },
         {
             'name': 'body',
             'in': 'body',
@@ -864,6 +1036,14 @@ def exam_to_dict(exam):
 def edit_exam_secretariat(exam_id):
     data = request.get_json()
 
+    # Simulare: modificarea este aplicată într-un savepoint, verificată și anulată
+    if _dry_run_requested():
+        try:
+            result = run_edit_plan([{**data, "exam_id": exam_id}], dry_run=True)
+        except PlanError as e:
+            return jsonify({"msg": str(e)}), 400
+        return jsonify({"dry_run": True, "conflicts": result["conflicts"], "diff": result["diff"]}), 200
+
     # 1. Caută examenul
     exam = Exam.query.get(exam_id)
     if not exam:
@@ -887,31 +1067,15 @@ def edit_exam_secretariat(exam_id):
 
     # 3. Verifică suprapuneri dacă toate datele sunt disponibile
     def check_conflicts(user_id_field, value, entity_label):
-        conflicts = Exam.query.filter(
-            and_(
-                getattr(Exam, user_id_field) == value,
-                Exam.exam_date == data['exam_date'],
-                Exam.exam_id != exam_id,
-                Exam.status == ExamStatus.ACCEPTAT
-            )
-        ).all()
-
-        for e in conflicts:
-            if overlaps(data['start_time'], data['duration'], e.start_time, e.duration):
-                return jsonify({"msg": f"{entity_label} este ocupat în intervalul propus."}), 409
+        if find_conflict(user_id_field, value, data['exam_date'], data['start_time'],
+                         data['duration'], exam_id):
+            return jsonify({"msg": f"{entity_label} este ocupat în intervalul propus."}), 409
 
     if all(k in data for k in ('exam_date', 'start_time', 'duration')):
-        if 'room_id' in data:
-            response = check_conflicts('room_id', data['room_id'], "Sala")
-            if response: return response
-
-        if 'assistant_id' in data:
-            response = check_conflicts('assistant_id', data['assistant_id'], "Asistentul")
-            if response: return response
-
-        if 'professor_id' in data:
-            response = check_conflicts('professor_id', data['professor_id'], "Profesorul")
-            if response: return response
+        for field, label in EDIT_CONFLICT_LABELS.items():
+            if field in data:
+                response = check_conflicts(field, data[field], label)
+                if response: return response
 
     # 4. Actualizează câmpurile
     if 'exam_date' in data:
@@ -933,19 +1097,262 @@ def edit_exam_secretariat(exam_id):
     if 'details' in data:
         exam.details = data['details']
 
-    # 5. Salvează în baza de date
-    db.session.commit()
+    # 5. Salvează în baza de date (constrângerile de excludere resping suprapunerile concurente)
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        field = exclusion_violation_field(e)
+        if field is None:
+            raise
+        return jsonify({"msg": f"{EDIT_CONFLICT_LABELS[field]} este ocupat în intervalul propus."}), 409
 
     return jsonify({"msg": "Examenul a fost actualizat cu succes!"}), 200
 
 
+def _dry_run_requested():
+    return request.args.get("dry_run", "").lower() in ("1", "true")
+
+
+@exams_bp.route("/edit/plan", methods=["PUT"])
+@roles_required("SEC")
+@swag_from({
+    'tags': ['Examen'],
+    'summary': 'Aplică sau simulează un plan de modificări pentru mai multe examene',
+    'description': 'Toate modificările sunt aplicate într-un savepoint și verificate împreună (inclusiv '
+                   'conflictele dintre examenele din plan). Cu dry_run=1 planul este doar simulat; altfel '
+                   'este salvat numai dacă nu există niciun conflict.',
+    'parameters': [
+        {
+            'name': 'dry_run',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'example': 1
+        },
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'edits': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'exam_id': {'type': 'integer', 'example': 1},
+                                'exam_date': {'type': 'string', 'format': 'date', 'example': '2025-06-10'},
+                                'room_id': {'type': 'integer', 'example': 1},
+                                'start_time': {'type': 'string', 'example': '10:00'},
+                                'duration': {'type': 'integer', 'example': 120}
+                            },
+                            'required': ['exam_id']
+                        }
+                    }
+                },
+                'required': ['edits']
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Planul a fost simulat sau salvat',
+            'examples': {
+                'application/json': {
+                    "dry_run": True,
+                    "applied": False,
+                    "conflicts": [
+                        {"exam_id": 4, "field": "room_id", "conflicts_with": 9,
+                         "msg": "Sala este ocupat în intervalul propus."}
+                    ],
+                    "diff": [
+                        {"exam_id": 4, "changes": {"start_time": {"before": "09:00", "after": "10:00"}}}
+                    ]
+                }
+            }
+        },
+        400: {'description': 'Plan invalid'},
+        409: {'description': 'Planul are conflicte și nu a fost salvat'}
+    }
+})
+def edit_exams_plan():
+    data = request.get_json() or {}
+    dry_run = _dry_run_requested()
+
+    try:
+        result = run_edit_plan(data.get("edits"), dry_run=dry_run)
+    except PlanError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    code = 409 if result["conflicts"] and not dry_run else 200
+    return jsonify({"dry_run": dry_run, **result}), code
+
+
+@exams_bp.route("/auto-schedule", methods=["POST"])
+@roles_required("SEC")
+@swag_from({
+    'tags': ['Examen'],
+    'summary': 'Programează automat toate examenele lipsă',
+    'description': 'Plasează toate perechile (curs, grupă) fără examen în perioadele de examinare, fără suprapuneri '
+                   'de sală, profesor, asistent sau grupă. Examenele sunt create cu statusul IN_ASTEPTARE.',
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': False,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'duration': {'type': 'integer', 'example': 120},
+                    'day_start': {'type': 'string', 'example': '08:00'},
+                    'day_end': {'type': 'string', 'example': '20:00'},
+                    'include_weekends': {'type': 'boolean', 'example': False}
+                }
+            }
+        }
+    ],
+    'responses': {
+        201: {'description': 'Examenele au fost programate.'},
+        400: {'description': 'Parametri invalizi.'},
+        409: {'description': 'Examenele au fost modificate în timpul programării.'}
+    }
+})
+def auto_schedule_exams():
+    data = request.get_json(silent=True) or {}
+
+    try:
+        duration = int(data.get("duration", 120))
+        day_start = data.get("day_start", "08:00")
+        day_end = data.get("day_end", "20:00")
+        datetime.strptime(day_start, "%H:%M")
+        datetime.strptime(day_end, "%H:%M")
+    except (TypeError, ValueError):
+        return jsonify({"msg": "Parametri invalizi. Orele se trimit ca HH:MM, durata în minute."}), 400
+
+    if duration <= 0:
+        return jsonify({"msg": "Durata trebuie să fie pozitivă."}), 400
+
+    try:
+        placed, unplaced = auto_schedule(duration, day_start, day_end, bool(data.get("include_weekends", False)))
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"msg": "Examenele au fost modificate în timpul programării. Reîncercați."}), 409
+
+    return jsonify({
+        "scheduled": len(placed),
+        "unscheduled": [
+            {"course_id": req.course_id, "group_id": req.group_id, "reason": reason}
+            for req, reason in unplaced
+        ]
+    }), 201
+
+
+@exams_bp.route("/audit", methods=["GET"])
+@roles_required("SEC")
+@swag_from({
+    'tags': ['Examen'],
+    'summary': 'Verifică suprapunerile din întregul program',
+    'description': 'Încarcă toate examenele acceptate și raportează fiecare suprapunere de sală, profesor, '
+                   'asistent sau grupă.',
+    'responses': {
+        200: {
+            'description': 'Raportul de conflicte',
+            'examples': {
+                'application/json': {
+                    "count": 1,
+                    "conflicts": [
+                        {
+                            "resource": "room",
+                            "resource_id": 3,
+                            "exam_id": 12,
+                            "conflicts_with": 7,
+                            "exam_date": "2025-06-10",
+                            "start_time": "10:00"
+                        }
+                    ]
+                }
+            }
+        },
+        403: {'description': 'Acces interzis'}
+    }
+})
+def audit_exam_conflicts():
+    report = audit_conflicts()
+    return jsonify({"count": len(report), "conflicts": report}), 200
+
+
+def _exam_list_filters():
+    """
+    Citește filtrele pentru lista examenelor: status, date_from, date_to, specialization, building.
+
+    Raises:
+        ValueError: Dacă un filtru are o valoare invalidă.
+    """
+    filters = {}
+    if request.args.get("status"):
+        try:
+            filters["status"] = [ExamStatus[name] for name in request.args["status"].split(",")]
+        except KeyError:
+            raise ValueError("Status invalid. Valori permise: IN_ASTEPTARE, ACCEPTAT, RESPINS.")
+    for name in ("date_from", "date_to"):
+        if request.args.get(name):
+            try:
+                filters[name] = datetime.strptime(request.args[name], "%Y-%m-%d").date()
+            except ValueError:
+                raise ValueError(f"Parametrul {name} trebuie să aibă formatul YYYY-MM-DD.")
+    for name in ("specialization", "building"):
+        if request.args.get(name):
+            filters[name] = request.args[name]
+    return filters
+
+
+def _exam_list_query(filters):
+    """
+    Interogarea (o singură instrucțiune, fără încărcări lazy) pentru lista examenelor.
+
+    Returns:
+        tuple: (select-ul filtrat, cheile de ordonare / paginare (dată, oră, id))
+    """
+    # Examenele fără oră sunt ordonate la începutul zilei; cheile corespund indexului `ix_exams_date_start`
+    keys = (Exam.exam_date, EXAM_START_KEY, Exam.exam_id)
+
+    stmt = exam_row_select(*keys)
+    if "status" in filters:
+        stmt = stmt.where(Exam.status.in_(filters["status"]))
+    if "date_from" in filters:
+        stmt = stmt.where(Exam.exam_date >= filters["date_from"])
+    if "date_to" in filters:
+        stmt = stmt.where(Exam.exam_date <= filters["date_to"])
+    if "specialization" in filters:
+        stmt = stmt.where(Group.specialization == filters["specialization"])
+    if "building" in filters:
+        stmt = stmt.where(Room.building == filters["building"])
+    return stmt, keys
+
+
 @exams_bp.route('/all', methods=['GET'])
 @roles_required("SEC")
 @swag_from({
     'tags': ['Examen'],
     'summary': 'Vezi toate examenele din sistem',
-    'description': 'Permite secretarului facultății să vadă toate examenele programate dar si cele neprogramate.',
+    'description': 'Permite secretarului facultății să vadă toate examenele programate dar si cele neprogramate. '
+                   'Cu `limit` / `cursor` răspunsul este paginat (keyset, ordonat după dată, oră și ID) și conține '
+                   'doar examenele: `{"exams": [...], "next_cursor": "..."}`.',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {'name': 'status', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Unul sau mai multe statusuri separate prin virgulă (IN_ASTEPTARE, ACCEPTAT, RESPINS)'},
+        {'name': 'date_from', 'in': 'query', 'type': 'string', 'format': 'date', 'required': False},
+        {'name': 'date_to', 'in': 'query', 'type': 'string', 'format': 'date', 'required': False},
+        {'name': 'specialization', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'building', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': 'Numărul de examene pe pagină (1-500)'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Valoarea `next_cursor` din pagina anterioară'}
+    ],
     'responses': {
         200: {
             'description': 'Lista completă a examenelor',
@@ -1044,87 +1451,44 @@ def edit_exam_secretariat(exam_id):
 }
 
         },
+        400: {
+            'description': 'Filtre sau parametri de paginare invalizi'
+        },
         403: {
             'description': 'Acces interzis. Trebuie să aveți rolul de secretar al facultății (SEC).'
         }
     }
 })
 def get_all_exams_and_unassigned_courses():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-
-    courses = Course.query.options(joinedload(Course.coordinator), joinedload(Course.exams)).all()
-    groups = Group.query.all()
-
-    # Pentru fiecare curs determinăm grupele care NU au examen programat
-    group_missing_exams = {}
+    try:
+        filters = _exam_list_filters()
+        page = page_params()
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    # Paginare keyset: doar examenele, în ordinea (dată, oră, id)
+    if page is not None:
+        stmt, keys = _exam_list_query(filters)
+        try:
+            rows, next_cursor = keyset_page(stmt, keys, *page)
+        except PaginationError as e:
+            return jsonify({"msg": str(e)}), 400
+        return jsonify({"exams": [serialize_exam_list_item(row) for row in rows], "next_cursor": next_cursor}), 200
 
-    for course in courses:
-        # Obținem grupele relevante pentru curs (în funcție de specializare și an de studiu)
-        relevant_groups = [
-            group for group in groups
-            if group.specialization == course.specialization and group.year_of_study == course.study_year
-        ]
+    # Perechile (curs, grupă) fără examen, calculate în SQL (NOT EXISTS) și grupate după grupă
+    groups_without_exam_sorted = missing_exams_by_group()
 
-        for group in relevant_groups:
-            # Verificăm dacă există deja un examen între acest curs și grupă
-            exam_exists = any(
-                exam for exam in course.exams if exam.group_id == group.group_id
-            )
-            if not exam_exists:
-                group_name = group.name
-                if group_name not in group_missing_exams:
-                    group_missing_exams[group_name] = []
-
-                group_missing_exams[group_name].append({
-                    "course_name": course.name,
-                    "coordinator": course.coordinator.name if course.coordinator else None
-                })
-
-    # Convertim într-o listă sortată după grupă
-    groups_without_exam_sorted = [
-        {
-            "group": group_name,
-            "leader": group.leader.name if group.leader else None,
-            "missing_exams": sorted(missing, key=lambda x: x["course_name"])
-        }
-        for group_name, missing in sorted(group_missing_exams.items(), key=lambda x: x[0])
-    ]
-
-    # Găsim toate examenele și le sortăm după status
-    exams = Exam.query.options(
-        joinedload(Exam.course),
-        joinedload(Exam.room),
-        joinedload(Exam.professor),
-        joinedload(Exam.assistant),
-        joinedload(Exam.group)
-    ).all()
-
-    # Pregătim examenele grupate după status
+    # Găsim toate examenele (filtrate) și le grupăm după status
     exams_by_status = {
         "IN_ASTEPTARE": [],
         "RESPINS": [],
         "ACCEPTAT": []
     }
 
-    for exam in exams:
-        status_key = exam.status.name if exam.status else "NECUNOSCUT"
-
-        exam_info = {
-            "exam_id": exam.exam_id,
-            "course_name": exam.course.name,
-            "group_name": exam.group.name,
-            "exam_type": str(exam.type),
-            "exam_date": exam.exam_date.strftime("%Y-%m-%d") if exam.exam_date else None,
-            "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
-            "duration": exam.duration,
-            "room": exam.room.name if exam.room else None,
-            "building": exam.room.building if exam.room else None,
-            "professor": exam.professor.name if exam.professor else None,
-            "assistant": exam.assistant.name if exam.assistant else None,
-            "status": exam.status.name if exam.status else None,
-            "details": exam.details
-        }
+    stmt, keys = _exam_list_query(filters)
+    for row in db.session.execute(stmt.order_by(*keys)).all():
+        exam_info = serialize_exam_list_item(row)
+        status_key = exam_info["status"] or "NECUNOSCUT"
 
         # Adaugă la grupul corespunzător statusului
         if status_key in exams_by_status:
@@ -1,15 +1,14 @@
 import os
-import threading
 
 import pandas as pd
 from flasgger import swag_from
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 
 from app.decorators import roles_required
-from app.email import send_email_notification
-from app.import_data import fetch_and_store_data
-from app.models import db, User, UserRole, Group
+from app.identity import current_user
+from app.models import db, User, UserRole, Group, SyncJob
+from app.sync_jobs import enqueue_sync, job_to_dict
 
 upload_bp = Blueprint("upload", __name__)
 
@@ -134,16 +133,28 @@ def upload_users():
 @swag_from({
     'tags': ['Upload'],
     'summary': 'Sincronizare date externe',
-    'description': 'Apelează API-urile externe și salvează profesorii, cursurile si salile disponibile în baza de date. Doar pentru ADMIN.',
+    'description': 'Programează sincronizarea profesorilor, cursurilor și sălilor din orar.usv.ro. Jobul este rulat '
+                   'de workerul `flask sync-worker`; dacă o sincronizare este deja programată sau în curs, este '
+                   'întors jobul existent. Progresul se urmărește cu GET /sync-data/<job_id>.',
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': False,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'full': {'type': 'boolean', 'description': 'Reprocesează și orarele neschimbate.'}
+                }
+            }
+        }
+    ],
     'responses': {
-        200: {
-            'description': 'Datele au fost sincronizate cu succes.'
+        202: {
+            'description': 'Sincronizarea a fost programată (sau era deja programată): `{"msg", "job_id"}`.'
         },
         403: {
-            'description': 'Acces interzis. Doar adminul poate accesa această rută.'
-        },
-        500: {
-            'description': 'Eroare la sincronizare.'
+            'description': 'Acces interzis. Doar secretariatul poate accesa această rută.'
         }
     },
     'security': [{
@@ -151,42 +162,47 @@ def upload_users():
     }]
 })
 def sync_data():
-    app = current_app._get_current_object()
-    threading.Thread(target=run_sync, args=(app,)).start()
-    return jsonify({"msg": "Sincronizarea a fost pornită în fundal."}), 202
-
+    data = request.get_json(silent=True) or {}
+    job, created = enqueue_sync(requested_by=current_user.user_id if current_user else None,
+                                full=bool(data.get("full")))
+    if not created:
+        return jsonify({"msg": "O sincronizare este deja programată sau în curs.", "job_id": job.job_id}), 202
+    return jsonify({"msg": "Sincronizarea a fost programată.", "job_id": job.job_id}), 202
 
-def run_sync(app):
-    with app.app_context():
-        try:
-            fetch_and_store_data()
 
-            try:
-                send_email_notification(
-                    to="ancuta.cirlan1@student.usv.ro",
-                    subject="Incarcare date - profesori",
-                    body="S-au incarcat datele necesare pentru programarea examenelor. "
-                         "Intrati in aplicatie si setati metoda de evaluare pentru cursurile la care sunteti coordonator."
-
-                )
-                print("✅Email catre profesor trims ")
-
-            except Exception as e:
-                print(f"⚠️ Email catre profesor: {e}")
-
-            try:
-                send_email_notification(
-                    to="ancuta.cirlan1@student.usv.ro",
-                    subject="Incarcare date - studenti",
-                    body="S-au incarcat datele necesare pentru programarea examenelor. "
-                         "Intrati in aplicatie si alegeti datele pentru examen."
-                )
-                print("✅Email catre student trims ")
-
-            except Exception as e:
-                print(f"⚠️ Email catre student eșuat: {e}")
-
-            print("✅ Sincronizare completă.")
-
-        except Exception as e:
-            print(f"❌ Eroare în sincronizare: {e}")
+@upload_bp.route("/sync-data/<int:job_id>", methods=["GET"])
+@roles_required("SEC")
+@swag_from({
+    'tags': ['Upload'],
+    'summary': 'Progresul unei sincronizări',
+    'description': 'Statusul (IN_ASTEPTARE, IN_CURS, FINALIZAT, ESUAT), progresul descărcării (`fetched` din '
+                   '`total`), numărul orarelor modificate / neschimbate / eșuate și durata unui job de sincronizare.',
+    'parameters': [
+        {
+            'name': 'job_id',
+            'in': 'path',
+            'type': 'integer',
+            'required': True,
+            'description': 'ID-ul jobului întors de POST /sync-data'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Starea jobului.'
+        },
+        403: {
+            'description': 'Acces interzis. Doar secretariatul poate accesa această rută.'
+        },
+        404: {
+            'description': 'Jobul nu există.'
+        }
+    },
+    'security': [{
+        'Bearer': []
+    }]
+})
+def get_sync_job(job_id):
+    job = db.session.get(SyncJob, job_id)
+    if job is None:
+        return jsonify({"error": "Jobul de sincronizare nu există."}), 404
+    return jsonify(job_to_dict(job))
@@ -1,8 +1,15 @@
+from datetime import datetime
+
 from flasgger import swag_from
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from sqlalchemy import select
 
+from app.database import db
 from app.decorators import roles_required
+from app.intervals import as_minutes, format_minutes
 from app.models import Room
+from app.pagination import page_params, keyset_page, PaginationError
+from app.room_availability import room_availability, free_intervals
 
 rooms_bp = Blueprint("rooms", __name__)
 @rooms_bp.route("/rooms", methods=["GET"])
@@ -10,6 +17,15 @@ rooms_bp = Blueprint("rooms", __name__)
 @swag_from({
     'tags': ['Rooms'],
     'summary': 'Returnează toate sălile',
+    'description': 'Sălile sunt ordonate după nume. Cu `limit` / `cursor` răspunsul este paginat '
+                   '(keyset, după nume și ID): `{"rooms": [...], "next_cursor": "..."}`.',
+    'parameters': [
+        {'name': 'building', 'in': 'query', 'type': 'string', 'required': False, 'example': 'C'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': 'Numărul de săli pe pagină (1-500)'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Valoarea `next_cursor` din pagina anterioară'}
+    ],
     'responses': {
         200: {
             'description': 'Listă cu toate sălile',
@@ -25,15 +41,88 @@ rooms_bp = Blueprint("rooms", __name__)
                     }
                 ]
             }
-        }
+        },
+        400: {'description': 'Parametri de paginare invalizi'}
     }
 })
 def get_rooms():
-    rooms = Room.query.all()
-    rooms_sorted = sorted(rooms, key=lambda room: room.name)
+    stmt = select(Room.name, Room.room_id)
+    if request.args.get("building"):
+        stmt = stmt.where(Room.building == request.args["building"])
+
+    try:
+        page = page_params()
+        if page is not None:
+            rows, next_cursor = keyset_page(stmt, (Room.name, Room.room_id), *page)
+        else:
+            rows = db.session.execute(stmt.order_by(Room.name, Room.room_id)).all()
+    except PaginationError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    rooms = [
+        {
+            "room_id": room_id,
+            "name": name,
+        } for name, room_id in rows
+    ]
+    if page is not None:
+        return jsonify({"rooms": rooms, "next_cursor": next_cursor})
+    return jsonify(rooms)
+
+@rooms_bp.route("/rooms/availability", methods=["GET"])
+@roles_required("CD", "SEC")
+@swag_from({
+    'tags': ['Rooms'],
+    'summary': 'Intervalele libere ale sălilor într-o zi',
+    'description': 'Returnează, pentru fiecare sală, intervalele libere și ocupate (examene acceptate) din ziua cerută.',
+    'parameters': [
+        {'name': 'date', 'in': 'query', 'type': 'string', 'format': 'date', 'required': True,
+         'example': '2025-06-10'},
+        {'name': 'building', 'in': 'query', 'type': 'string', 'required': False, 'example': 'C'},
+        {'name': 'day_start', 'in': 'query', 'type': 'string', 'required': False, 'example': '08:00'},
+        {'name': 'day_end', 'in': 'query', 'type': 'string', 'required': False, 'example': '20:00'},
+        {'name': 'min_duration', 'in': 'query', 'type': 'integer', 'required': False, 'example': 120}
+    ],
+    'responses': {
+        200: {
+            'description': 'Disponibilitatea sălilor',
+            'examples': {
+                'application/json': [
+                    {
+                        "room_id": 1,
+                        "name": "C203",
+                        "building": "C",
+                        "busy": [{"start": "10:00", "end": "12:00"}],
+                        "free": [{"start": "08:00", "end": "10:00"}, {"start": "12:00", "end": "20:00"}]
+                    }
+                ]
+            }
+        },
+        400: {'description': 'Parametri invalizi'}
+    }
+})
+def get_rooms_availability():
+    try:
+        day = datetime.strptime(request.args.get("date", ""), "%Y-%m-%d").date()
+        day_start = as_minutes(request.args.get("day_start", "08:00"))
+        day_end = as_minutes(request.args.get("day_end", "20:00"))
+        min_duration = int(request.args.get("min_duration", 0))
+    except ValueError:
+        return jsonify({"msg": "Parametri invalizi. Data se trimite ca YYYY-MM-DD, orele ca HH:MM."}), 400
+
+    building = request.args.get("building")
+
+    def fmt(intervals):
+        return [{"start": format_minutes(s), "end": format_minutes(e)} for s, e in intervals]
+
     return jsonify([
         {
-            "room_id": room.room_id,
-            "name": room.name,
-        } for room in rooms_sorted
-    ])
\ No newline at end of file
+            "room_id": room_id,
+            "name": name,
+            "building": room_building,
+            "busy": fmt(busy),
+            "free": fmt(free_intervals(busy, day_start, day_end, min_duration)),
+        }
+        for room_id, name, room_building, busy in room_availability.get(day)
+        if not building or room_building == building
+    ]), 200
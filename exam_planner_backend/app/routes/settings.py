@@ -4,7 +4,9 @@ from flasgger import swag_from
 from flask import Blueprint, request, jsonify
 
 from app.decorators import roles_required
-from app.models import ExaminationPeriod, db, ExamType, UserRole, User, Exam, Course, Group, Room, course_assistants
+from app.change_tracking import notify_bulk
+from app.models import ExaminationPeriod, db, ExamType, UserRole, User, Exam, Course, Group, Room, course_assistants, \
+    TimetableSyncState
 
 settings_bp = Blueprint("settings", __name__, url_prefix="/settings")
 
@@ -236,11 +238,14 @@ def reset_database():
         Group.query.delete(synchronize_session=False)
         Room.query.delete(synchronize_session=False)
         ExaminationPeriod.query.delete(synchronize_session=False)
+        # Fără starea sincronizării, următoarea sincronizare reîncarcă toate orarele
+        TimetableSyncState.query.delete(synchronize_session=False)
 
         # Ștergem utilizatorii care nu sunt ADM sau SEC
         User.query.filter(~User.role.in_([UserRole.ADM, UserRole.SEC])).delete(synchronize_session=False)
 
         db.session.commit()
+        notify_bulk(Exam, Course, Group, Room, ExaminationPeriod, User)
         return jsonify({"message": "Resetare realizată cu succes"}), 200
 
     except Exception as e:
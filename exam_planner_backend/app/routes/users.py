@@ -1,9 +1,11 @@
 from flasgger import swag_from
 from flask import Blueprint, jsonify, request
+from sqlalchemy import select
 
 from app import User, db
 from app.decorators import roles_required
 from app.models import UserRole
+from app.pagination import page_params, keyset_page, PaginationError
 
 users_bp = Blueprint("users", __name__, url_prefix="/users")
 
@@ -13,7 +15,15 @@ users_bp = Blueprint("users", __name__, url_prefix="/users")
 @swag_from({
     'tags': ['Utilizatori'],
     'summary': 'Obține lista cadrelor didactice',
-    'description': 'Returnează o listă cu toate cadrele didactice (utilizatori cu rolul CD). Accesibil pentru ADM, SEC și CD.',
+    'description': 'Returnează o listă cu toate cadrele didactice (utilizatori cu rolul CD). Accesibil pentru ADM, SEC și CD. '
+                   'Cu `limit` / `cursor` răspunsul este paginat (keyset, după ID): '
+                   '`{"professors": [...], "next_cursor": "..."}`.',
+    'parameters': [
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': 'Numărul de cadre didactice pe pagină (1-500)'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Valoarea `next_cursor` din pagina anterioară'}
+    ],
     'responses': {
         200: {
             'description': 'Lista cadrelor didactice',
@@ -29,18 +39,32 @@ users_bp = Blueprint("users", __name__, url_prefix="/users")
                 }
             }
         },
+        400: {'description': 'Parametri de paginare invalizi'},
         403: {'description': 'Acces interzis'}
     }
 })
 def get_professors():
-    cadre = User.query.filter_by(role=UserRole.CD).all()
-    return jsonify([
+    stmt = select(User.name, User.email, User.user_id).where(User.role == UserRole.CD)
+
+    try:
+        page = page_params()
+        if page is not None:
+            rows, next_cursor = keyset_page(stmt, (User.user_id,), *page)
+        else:
+            rows = db.session.execute(stmt.order_by(User.user_id)).all()
+    except PaginationError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    cadre = [
         {
-            "user_id": c.user_id,
-            "name": c.name,
-            "email": c.email,
-        } for c in cadre
-    ]), 200
+            "user_id": user_id,
+            "name": name,
+            "email": email,
+        } for name, email, user_id in rows
+    ]
+    if page is not None:
+        return jsonify({"professors": cadre, "next_cursor": next_cursor}), 200
+    return jsonify(cadre), 200
 
 
 @users_bp.route("/<int:user_id>", methods=["PUT"])
@@ -0,0 +1,316 @@
+from collections import Counter, defaultdict
+from itertools import groupby
+from dataclasses import dataclass, field
+from datetime import timedelta, time as time_type
+
+from sqlalchemy import select, and_, insert
+from sqlalchemy.orm import aliased
+
+from app.change_tracking import notify_bulk
+from app.config import Config
+from app.database import db
+from app.intervals import as_minutes
+from app.models import Course, Group, Exam, ExamStatus, ExaminationPeriod, Room, User, course_assistants
+
+
+@dataclass
+class SchedulingRequest:
+    """
+    O pereche (curs, grupă) care nu are încă examen.
+
+    Atribute:
+        course_id (int): ID-ul cursului.
+        group_id (int): ID-ul grupei.
+        professor_id (int, optional): Coordonatorul cursului.
+        exam_type (str): Metoda de examinare a cursului (EXAMEN / COLOCVIU).
+        assistant_ids (list[int]): Asistenții cursului, în ordinea preferinței.
+    """
+    course_id: int
+    group_id: int
+    professor_id: int
+    exam_type: str
+    assistant_ids: list = field(default_factory=list)
+
+
+def unassigned_course_groups():
+    """
+    Returnează perechile (curs, grupă) fără examen, printr-o singură interogare.
+
+    Grupele relevante pentru un curs sunt cele cu aceeași specializare și același an de studiu.
+    """
+    has_exam = (
+        select(Exam.exam_id)
+        .where(Exam.course_id == Course.course_id, Exam.group_id == Group.group_id)
+        .exists()
+    )
+    rows = db.session.execute(
+        select(Course.course_id, Group.group_id, Course.coordinator_id, Course.examination_method)
+        .join(Group, and_(Group.specialization == Course.specialization,
+                          Group.year_of_study == Course.study_year))
+        .where(~has_exam)
+        .order_by(Course.course_id, Group.group_id)
+    ).all()
+
+    assistants = defaultdict(list)
+    for course_id, assistant_id in db.session.execute(
+            select(course_assistants.c.course_id, course_assistants.c.assistant_id)
+            .order_by(course_assistants.c.course_id, course_assistants.c.assistant_id)):
+        assistants[course_id].append(assistant_id)
+
+    return [
+        SchedulingRequest(course_id, group_id, coordinator_id, method, assistants[course_id])
+        for course_id, group_id, coordinator_id, method in rows
+    ]
+
+
+def missing_exams_by_group():
+    """
+    Cursurile fără examen ale fiecărei grupe, grupate și sortate după numele grupei.
+
+    O singură interogare: grupele sunt unite cu cursurile pe (specializare, an de studiu),
+    iar perechile care au deja un examen sunt excluse cu NOT EXISTS.
+
+    Returns:
+        list[dict]: `{"group", "leader", "missing_exams": [{"course_name", "coordinator"}]}`
+    """
+    leader = aliased(User)
+    coordinator = aliased(User)
+    has_exam = (
+        select(Exam.exam_id)
+        .where(Exam.course_id == Course.course_id, Exam.group_id == Group.group_id)
+        .exists()
+    )
+    rows = db.session.execute(
+        select(Group.name, leader.name, Course.name, coordinator.name)
+        .join(Course, and_(Course.specialization == Group.specialization,
+                           Course.study_year == Group.year_of_study))
+        .outerjoin(leader, leader.user_id == Group.leader_id)
+        .outerjoin(coordinator, coordinator.user_id == Course.coordinator_id)
+        .where(~has_exam)
+        .order_by(Group.name, Course.name)
+    ).all()
+
+    result = []
+    for group_name, group_rows in groupby(rows, key=lambda row: row[0]):
+        group_rows = list(group_rows)
+        result.append({
+            "group": group_name,
+            "leader": group_rows[0][1],
+            "missing_exams": [
+                {"course_name": course_name, "coordinator": coordinator_name}
+                for _, _, course_name, coordinator_name in group_rows
+            ]
+        })
+    return result
+
+
+def build_slots(period_start, period_end, day_start, day_end, duration, include_weekends=False):
+    """
+    Construiește grila de intervale (dată, minut de început) pentru o perioadă de examinare.
+
+    Intervalele unei zile nu se suprapun, astfel încât două examene se suprapun
+    doar dacă au exact același interval.
+    """
+    slots = []
+    day = period_start
+    while day <= period_end:
+        if include_weekends or day.weekday() < 5:
+            start = day_start
+            while start + duration <= day_end:
+                slots.append((day, start))
+                start += duration
+        day += timedelta(days=1)
+    return slots
+
+
+class ExamScheduler:
+    """
+    Planificator automat pentru examenele lipsă.
+
+    Problema este tratată ca o colorare de graf: fiecare pereche (curs, grupă) este un
+    nod, două noduri sunt adiacente dacă au aceeași grupă sau același profesor, iar
+    culorile sunt intervalele din grila perioadei de examinare. Nodurile sunt colorate
+    greedy în ordinea Welsh–Powell (gradul descrescător), iar pentru fiecare interval
+    se verifică în O(1) disponibilitatea sălii și a asistentului.
+
+    Constrângeri:
+        - o grupă are cel mult `max_per_day` examene pe zi, iar două examene ale ei din zile
+          diferite sunt la cel puțin `min_days_between` zile (0 dezactivează verificarea);
+        - grupa, profesorul, asistentul și sala nu au două examene în același interval;
+        - examenele deja existente (acceptate sau în așteptare) ocupă resursele lor.
+    """
+
+    def __init__(self, slots_by_type, room_ids, duration, max_per_day=1, min_days_between=0):
+        self.slots_by_type = slots_by_type
+        self.duration = duration
+        self.room_ids = list(room_ids)
+        self.max_per_day = max_per_day
+        self.min_days_between = min_days_between
+        self.day_starts = sorted({start for slots in slots_by_type.values() for _, start in slots})
+        self.group_days = defaultdict(Counter)
+        self.busy = defaultdict(set)
+        self.used_rooms = defaultdict(set)
+
+    def reserve_existing(self, group_id, exam_date, start, duration, room_id, professor_id, assistant_id):
+        """Marchează resursele ocupate de un examen deja existent."""
+        if group_id is not None:
+            self.group_days[group_id][exam_date] += 1
+        if start is None or duration is None:
+            return
+        end = start + duration
+        for slot_start in self.day_starts:
+            if slot_start >= end:
+                break
+            if start < slot_start + self.duration:
+                slot = (exam_date, slot_start)
+                if group_id is not None:
+                    self.busy[("group", group_id)].add(slot)
+                if professor_id is not None:
+                    self.busy[("professor", professor_id)].add(slot)
+                if assistant_id is not None:
+                    self.busy[("assistant", assistant_id)].add(slot)
+                if room_id is not None:
+                    self.used_rooms[slot].add(room_id)
+
+    def _free_room(self, slot):
+        used = self.used_rooms[slot]
+        if len(used) >= len(self.room_ids):
+            return None
+        for room_id in self.room_ids:
+            if room_id not in used:
+                return room_id
+        return None
+
+    def _day_allowed(self, group_days, day):
+        """Verifică limita de examene pe zi și distanța minimă față de celelalte zile cu examene ale grupei."""
+        if self.max_per_day and group_days[day] >= self.max_per_day:
+            return False
+        for offset in range(1, self.min_days_between):
+            if group_days[day - timedelta(days=offset)] or group_days[day + timedelta(days=offset)]:
+                return False
+        return True
+
+    def _place(self, req):
+        slots = self.slots_by_type.get(req.exam_type)
+        if not slots:
+            return None, "Nu există perioadă de examinare pentru metoda cursului."
+
+        group_days = self.group_days[req.group_id]
+        group_busy = self.busy[("group", req.group_id)]
+        professor_busy = self.busy[("professor", req.professor_id)] if req.professor_id else set()
+
+        checked_day, day_allowed = None, False
+        for slot in slots:
+            if slot[0] != checked_day:
+                checked_day, day_allowed = slot[0], self._day_allowed(group_days, slot[0])
+            if not day_allowed or slot in group_busy or slot in professor_busy:
+                continue
+
+            assistant_id = None
+            if req.assistant_ids:
+                assistant_id = next(
+                    (a for a in req.assistant_ids if slot not in self.busy[("assistant", a)]), None)
+                if assistant_id is None:
+                    continue
+
+            room_id = self._free_room(slot)
+            if room_id is None:
+                continue
+
+            group_days[slot[0]] += 1
+            group_busy.add(slot)
+            if req.professor_id:
+                professor_busy.add(slot)
+            if assistant_id is not None:
+                self.busy[("assistant", assistant_id)].add(slot)
+            self.used_rooms[slot].add(room_id)
+            return (slot, room_id, assistant_id), None
+
+        return None, "Nu s-a găsit niciun interval liber."
+
+    def solve(self, requests):
+        """
+        Plasează toate cererile.
+
+        Returns:
+            tuple: (lista de plasări (cerere, (dată, minut), sală, asistent), lista de cereri neplasate cu motiv)
+        """
+        degree = Counter()
+        for req in requests:
+            degree[("group", req.group_id)] += 1
+            if req.professor_id:
+                degree[("professor", req.professor_id)] += 1
+
+        ordered = sorted(
+            requests,
+            key=lambda r: (-(degree[("group", r.group_id)] + degree[("professor", r.professor_id)]),
+                           len(r.assistant_ids), r.course_id, r.group_id)
+        )
+
+        placed, unplaced = [], []
+        for req in ordered:
+            result, reason = self._place(req)
+            if result is None:
+                unplaced.append((req, reason))
+            else:
+                slot, room_id, assistant_id = result
+                placed.append((req, slot, room_id, assistant_id))
+        return placed, unplaced
+
+
+def auto_schedule(duration=120, day_start="08:00", day_end="20:00", include_weekends=False, commit=True):
+    """
+    Programează automat toate perechile (curs, grupă) fără examen.
+
+    Examenele sunt salvate cu statusul IN_ASTEPTARE, urmând să fie revizuite de
+    coordonatori. Toate datele necesare sunt citite cu un număr constant de interogări.
+    Se respectă constrângerile grupei din Config (`GROUP_MAX_EXAMS_PER_DAY`,
+    `GROUP_MIN_DAYS_BETWEEN_EXAMS`); fără o limită pe zi configurată, grupa primește cel mult
+    un examen pe zi.
+
+    Returns:
+        tuple: (plasări, cereri neplasate)
+    """
+    start_minute, end_minute = as_minutes(day_start), as_minutes(day_end)
+
+    slots_by_type = {
+        period.name: build_slots(period.period_start, period.period_end, start_minute, end_minute,
+                                 duration, include_weekends)
+        for period in ExaminationPeriod.query.all()
+    }
+    room_ids = db.session.execute(select(Room.room_id).order_by(Room.room_id)).scalars().all()
+    scheduler = ExamScheduler(slots_by_type, room_ids, duration,
+                              max_per_day=Config.GROUP_MAX_EXAMS_PER_DAY or 1,
+                              min_days_between=Config.GROUP_MIN_DAYS_BETWEEN_EXAMS)
+
+    existing = db.session.execute(
+        select(Exam.group_id, Exam.exam_date, Exam.start_time, Exam.duration, Exam.room_id,
+               Exam.professor_id, Exam.assistant_id)
+        .where(Exam.status != ExamStatus.RESPINS)
+    ).all()
+    for group_id, exam_date, start_time, exam_duration, room_id, professor_id, assistant_id in existing:
+        scheduler.reserve_existing(group_id, exam_date, as_minutes(start_time), exam_duration,
+                                   room_id, professor_id, assistant_id)
+
+    placed, unplaced = scheduler.solve(unassigned_course_groups())
+
+    if placed and commit:
+        db.session.execute(insert(Exam), [
+            {
+                "course_id": req.course_id,
+                "group_id": req.group_id,
+                "exam_date": exam_date,
+                "type": req.exam_type,
+                "room_id": room_id,
+                "professor_id": req.professor_id,
+                "assistant_id": assistant_id,
+                "status": ExamStatus.IN_ASTEPTARE,
+                "start_time": time_type(minute // 60, minute % 60),
+                "duration": duration,
+            }
+            for req, (exam_date, minute), room_id, assistant_id in placed
+        ])
+        db.session.commit()
+        notify_bulk(Exam)
+
+    return placed, unplaced
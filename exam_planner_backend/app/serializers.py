@@ -0,0 +1,143 @@
+from operator import itemgetter
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.models import Exam, Course, Group, Room, User
+
+
+def make_serializer(fields):
+    """
+    Construiește (o singură dată, la import) o funcție care transformă un rând al unei interogări în dict.
+
+    Valorile sunt extrase dintr-odată cu un `operator.itemgetter`; doar câmpurile cu conversie
+    sau cu valoare implicită sunt apoi rescrise. Fiecare rând costă crearea unui dict, fără
+    `getattr` sau încărcări lazy.
+
+    Args:
+        fields (tuple): Tupluri (cheie, index în rând, conversie sau None, valoare implicită pentru NULL).
+            Conversia nu este apelată pentru valorile NULL.
+
+    Returns:
+        callable: funcția `serialize(row) -> dict`.
+    """
+    keys = tuple(key for key, _, _, _ in fields)
+    indices = tuple(index for _, index, _, _ in fields)
+    values = itemgetter(*indices) if len(indices) > 1 else (lambda row: (row[indices[0]],))
+    conversions = tuple((key, convert or _identity, default)
+                        for key, _, convert, default in fields if convert is not None or default is not None)
+
+    def serialize(row):
+        item = dict(zip(keys, values(row)))
+        for key, convert, default in conversions:
+            value = item[key]
+            item[key] = default if value is None else convert(value)
+        return item
+
+    return serialize
+
+
+def _identity(value):
+    return value
+
+
+def hhmm(value):
+    """Ora în formatul HH:MM."""
+    return value.isoformat("minutes")
+
+
+def enum_name(value):
+    return value.name
+
+
+def enum_value(value):
+    return value.value
+
+
+def none_if_empty(value):
+    return value or None
+
+
+# Coloanele unui rând de examen (ordinea este folosită de serializatoarele de mai jos)
+(EXAM_ID, COURSE_NAME, GROUP_NAME, SPECIALIZATION, EXAM_TYPE, EXAM_DATE, START_TIME, DURATION, ROOM_NAME,
+ BUILDING, PROFESSOR_NAME, ASSISTANT_NAME, STATUS, DETAILS) = range(14)
+
+
+def exam_row_select(*extra_columns):
+    """
+    Interogarea (fără încărcări lazy) care produce rândurile de examen pentru serializatoare.
+
+    Coloanele suplimentare (ex: chei de ordonare) sunt adăugate după cele 14 coloane standard.
+    """
+    professor = aliased(User)
+    assistant = aliased(User)
+    return (
+        select(Exam.exam_id, Course.name, Group.name, Course.specialization, Exam.type, Exam.exam_date,
+               Exam.start_time, Exam.duration, Room.name, Room.building, professor.name, assistant.name,
+               Exam.status, Exam.details, *extra_columns)
+        .select_from(Exam)
+        .outerjoin(Course, Course.course_id == Exam.course_id)
+        .outerjoin(Group, Group.group_id == Exam.group_id)
+        .outerjoin(Room, Room.room_id == Exam.room_id)
+        .outerjoin(professor, professor.user_id == Exam.professor_id)
+        .outerjoin(assistant, assistant.user_id == Exam.assistant_id)
+    )
+
+
+# Lista examenelor pentru secretariat (GET /exam/all)
+serialize_exam_list_item = make_serializer((
+    ("exam_id", EXAM_ID, None, None),
+    ("course_name", COURSE_NAME, None, None),
+    ("group_name", GROUP_NAME, None, None),
+    ("exam_type", EXAM_TYPE, None, None),
+    ("exam_date", EXAM_DATE, None, None),
+    ("start_time", START_TIME, hhmm, None),
+    ("duration", DURATION, None, None),
+    ("room", ROOM_NAME, None, None),
+    ("building", BUILDING, None, None),
+    ("professor", PROFESSOR_NAME, None, None),
+    ("assistant", ASSISTANT_NAME, None, None),
+    ("status", STATUS, enum_name, None),
+    ("details", DETAILS, None, None),
+))
+
+# Detaliile unui examen (GET /exam/<id>, GET /exam/for/group)
+serialize_exam_details = make_serializer((
+    ("exam_id", EXAM_ID, None, None),
+    ("course_name", COURSE_NAME, None, None),
+    ("exam_type", EXAM_TYPE, None, None),
+    ("exam_date", EXAM_DATE, None, None),
+    ("start_time", START_TIME, hhmm, None),
+    ("duration", DURATION, None, None),
+    ("room", ROOM_NAME, None, None),
+    ("building", BUILDING, None, None),
+    ("professor", PROFESSOR_NAME, None, None),
+    ("assistant", ASSISTANT_NAME, None, None),
+    ("status", STATUS, enum_value, None),
+    ("details", DETAILS, none_if_empty, None),
+))
+
+# Examenele coordonate de un profesor (GET /exam/by-status)
+serialize_exam_by_status = make_serializer((
+    ("exam_id", EXAM_ID, None, None),
+    ("course_name", COURSE_NAME, None, None),
+    ("group_name", GROUP_NAME, None, None),
+    ("specialization", SPECIALIZATION, None, None),
+    ("exam_date", EXAM_DATE, None, None),
+    ("start_time", START_TIME, hhmm, None),
+    ("duration", DURATION, None, None),
+    ("room", ROOM_NAME, None, None),
+    ("building", BUILDING, None, None),
+    ("type", EXAM_TYPE, None, None),
+    ("status", STATUS, enum_name, "IN_ASTEPTARE"),
+))
+
+# Cursurile (GET /courses): rânduri (name, examination_method, specialization, study_year, course_id),
+# cu cheia de paginare la final
+serialize_course = make_serializer((
+    ("id", 4, None, None),
+    ("name", 0, None, None),
+    ("examination_method", 1, None, None),
+    ("specialization", 2, None, None),
+    ("study_year", 3, None, None),
+))
@@ -0,0 +1,194 @@
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.email import send_email_notification
+from app.import_data import fetch_and_store_data
+from app.models import SyncJob, SyncJobStatus
+
+# Tipul jobului pentru sincronizarea profesorilor, cursurilor și sălilor din orar.usv.ro
+TIMETABLE_SYNC = "orar"
+
+# Intervalul minim (secunde) între două salvări ale progresului / semnului de viață
+HEARTBEAT_INTERVAL = 1.0
+
+
+def active_job(kind=TIMETABLE_SYNC):
+    """Jobul în așteptare sau în curs de tipul dat, sau None."""
+    return db.session.execute(
+        select(SyncJob).where(SyncJob.kind == kind,
+                              SyncJob.status.in_([SyncJobStatus.IN_ASTEPTARE, SyncJobStatus.IN_CURS]))
+    ).scalar()
+
+
+def enqueue_sync(requested_by=None, full=False, kind=TIMETABLE_SYNC):
+    """
+    Programează o sincronizare, dacă nu există deja una în așteptare sau în curs.
+
+    Unicitatea jobului activ este garantată de indexul unic parțial `ux_sync_jobs_active`, deci și
+    pentru cereri simultane din workeri gunicorn diferiți.
+
+    Returns:
+        tuple: (jobul, True dacă a fost creat acum / False dacă exista deja).
+    """
+    job = active_job(kind)
+    if job is not None:
+        return job, False
+
+    job = SyncJob(kind=kind, status=SyncJobStatus.IN_ASTEPTARE, full=full, requested_by=requested_by,
+                  attempts=0, created_at=datetime.now())
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Altă cerere a programat între timp o sincronizare
+        db.session.rollback()
+        return active_job(kind), False
+    return job, True
+
+
+def _stale_running(kind, now):
+    """Condiția pentru joburile în curs al căror worker nu a mai dat semn de viață (`SYNC_JOB_STALE_AFTER`)."""
+    stale_before = now - timedelta(seconds=current_app.config.get("SYNC_JOB_STALE_AFTER"))
+    return and_(SyncJob.kind == kind, SyncJob.status == SyncJobStatus.IN_CURS, SyncJob.heartbeat_at < stale_before)
+
+
+def claim_job(kind=TIMETABLE_SYNC):
+    """
+    Preia jobul activ pentru workerul curent: cel în așteptare sau unul în curs al unui worker oprit.
+
+    Preluarea este un `UPDATE` condiționat de status, deci un singur worker poate rula jobul. Un job
+    abandonat de `SYNC_JOB_MAX_ATTEMPTS` ori este marcat ca eșuat în loc să fie reluat.
+
+    Returns:
+        SyncJob sau None dacă nu există niciun job de rulat.
+    """
+    now = datetime.now()
+    db.session.execute(
+        update(SyncJob)
+        .where(_stale_running(kind, now), SyncJob.attempts >= current_app.config.get("SYNC_JOB_MAX_ATTEMPTS"))
+        .values(status=SyncJobStatus.ESUAT, finished_at=now, error="Workerul sincronizării s-a oprit.")
+        .execution_options(synchronize_session=False)
+    )
+    claimable = or_(and_(SyncJob.kind == kind, SyncJob.status == SyncJobStatus.IN_ASTEPTARE),
+                    _stale_running(kind, now))
+    job_id = db.session.execute(select(SyncJob.job_id).where(claimable)).scalar()
+    claimed = job_id is not None and db.session.execute(
+        update(SyncJob)
+        .where(SyncJob.job_id == job_id, claimable)
+        .values(status=SyncJobStatus.IN_CURS, started_at=now, heartbeat_at=now, attempts=SyncJob.attempts + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    return db.session.get(SyncJob, job_id) if claimed else None
+
+
+def run_job(job):
+    """
+    Rulează sincronizarea unui job preluat cu `claim_job` și salvează progresul, rezultatul și durata.
+
+    Progresul descărcării (și semnul de viață al workerului) este salvat cel mult o dată pe secundă.
+    """
+    last_heartbeat = time.monotonic()
+
+    def progress(done, total):
+        nonlocal last_heartbeat
+        job.total, job.fetched = total, done
+        if done in (0, total) or time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+            job.heartbeat_at = datetime.now()
+            db.session.commit()
+            last_heartbeat = time.monotonic()
+
+    try:
+        counts = fetch_and_store_data(full=job.full, progress=progress)
+        if counts is None:
+            raise RuntimeError("Eroare la preluarea profesorilor.")
+    except Exception as e:
+        db.session.rollback()
+        job.status, job.error = SyncJobStatus.ESUAT, str(e)
+    else:
+        job.total, job.changed, job.unchanged, job.failed = (
+            counts["professors"], counts["changed"], counts["unchanged"], counts["failed"])
+        job.status, job.error = SyncJobStatus.FINALIZAT, None
+    job.finished_at = job.heartbeat_at = datetime.now()
+    db.session.commit()
+
+    if job.status == SyncJobStatus.FINALIZAT:
+        notify_sync_done()
+    return job
+
+
+def notify_sync_done():
+    """Anunță profesorii și studenții că datele pentru programarea examenelor au fost încărcate."""
+    try:
+        send_email_notification(
+            to="ancuta.cirlan1@student.usv.ro",
+            subject="Incarcare date - profesori",
+            body="S-au incarcat datele necesare pentru programarea examenelor. "
+                 "Intrati in aplicatie si setati metoda de evaluare pentru cursurile la care sunteti coordonator."
+
+        )
+        print("✅Email catre profesor trims ")
+
+    except Exception as e:
+        print(f"⚠️ Email catre profesor: {e}")
+
+    try:
+        send_email_notification(
+            to="ancuta.cirlan1@student.usv.ro",
+            subject="Incarcare date - studenti",
+            body="S-au incarcat datele necesare pentru programarea examenelor. "
+                 "Intrati in aplicatie si alegeti datele pentru examen."
+        )
+        print("✅Email catre student trims ")
+
+    except Exception as e:
+        print(f"⚠️ Email catre student eșuat: {e}")
+
+
+def job_to_dict(job):
+    """Starea unui job, așa cum este întoarsă de GET /sync-data/<job_id>."""
+    return {
+        "job_id": job.job_id,
+        "status": job.status.name,
+        "full": job.full,
+        "attempts": job.attempts,
+        "total": job.total,
+        "fetched": job.fetched,
+        "changed": job.changed,
+        "unchanged": job.unchanged,
+        "failed": job.failed,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "duration": (job.finished_at - job.started_at).total_seconds()
+        if job.started_at and job.finished_at else None,
+    }
+
+
+@click.command("sync-worker")
+@click.option("--once", is_flag=True, help="Rulează cel mult un job și se oprește.")
+@with_appcontext
+def sync_worker_command(once):
+    """Rulează joburile de sincronizare programate prin POST /sync-data (proces separat de gunicorn)."""
+    poll_interval = current_app.config.get("SYNC_JOB_POLL_INTERVAL")
+    while True:
+        job = claim_job()
+        if job is not None:
+            click.echo(f"Sincronizarea {job.job_id} a pornit (încercarea {job.attempts}).")
+            job = run_job(job)
+            click.echo(f"Sincronizarea {job.job_id}: {job.status.value} "
+                       f"({job.changed or 0} orare modificate, {job.unchanged or 0} neschimbate, "
+                       f"{job.failed or 0} eșuate){f' - {job.error}' if job.error else ''}.")
+        db.session.remove()
+        if once:
+            return
+        if job is None:
+            time.sleep(poll_interval)
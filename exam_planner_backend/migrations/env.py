@@ -90,9 +90,14 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # coloana generată exams.time_span este creată prin DDL (vezi app.models), nu prin metadata
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (type_ == "column" and reflected and compare_to is None and name == "time_span")
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,97 @@
+"""added unique keys for rooms and courses used by the timetable sync upserts
+
+Revision ID: 3e5f0a9c8d21
+Revises: 9b1c7d4e2a58
+Create Date: 2026-10-18 17:12:05.448913
+
+Sălile și cursurile duplicate (același nume / aceeași cheie) create de sincronizările anterioare sunt
+unite înainte de crearea constrângerilor: se păstrează rândul cu cel mai mic ID, iar examenele și
+asistenții duplicatelor sunt mutați pe el. Dacă o grupă are examen la ambele cursuri duplicate,
+se păstrează examenul acceptat / în așteptare (la egalitate, cel mai vechi), celălalt este șters.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e5f0a9c8d21'
+down_revision = '9b1c7d4e2a58'
+branch_labels = None
+depends_on = None
+
+
+# Ordinea în care se păstrează examenele duplicate ale unei grupe
+STATUS_RANK = {'ACCEPTAT': 0, 'IN_ASTEPTARE': 1, 'RESPINS': 2}
+
+
+def duplicates(connection, sql):
+    """Perechile (id păstrat, id duplicat) pentru rândurile cu aceeași cheie; prima coloană este ID-ul."""
+    kept, pairs = {}, []
+    for row_id, *key in connection.execute(sa.text(sql)):
+        key = tuple(key)
+        if key in kept:
+            pairs.append((kept[key], row_id))
+        else:
+            kept[key] = row_id
+    return pairs
+
+
+def merge_rooms(connection):
+    for keep, duplicate in duplicates(connection, "SELECT room_id, name FROM rooms ORDER BY room_id"):
+        params = {"keep": keep, "duplicate": duplicate}
+        connection.execute(sa.text("UPDATE exams SET room_id = :keep WHERE room_id = :duplicate"), params)
+        connection.execute(sa.text("DELETE FROM rooms WHERE room_id = :duplicate"), params)
+
+
+def merge_courses(connection):
+    pairs = duplicates(connection, "SELECT course_id, name, study_year, specialization FROM courses ORDER BY course_id")
+    for keep, duplicate in pairs:
+        params = {"keep": keep, "duplicate": duplicate}
+        connection.execute(sa.text(
+            "UPDATE courses SET "
+            "coordinator_id = COALESCE(coordinator_id, "
+            "(SELECT coordinator_id FROM courses WHERE course_id = :duplicate)), "
+            "examination_method = COALESCE(examination_method, "
+            "(SELECT examination_method FROM courses WHERE course_id = :duplicate)) "
+            "WHERE course_id = :keep"), params)
+
+        connection.execute(sa.text(
+            "INSERT INTO course_assistants (course_id, assistant_id) "
+            "SELECT :keep, assistant_id FROM course_assistants WHERE course_id = :duplicate AND assistant_id NOT IN "
+            "(SELECT assistant_id FROM course_assistants WHERE course_id = :keep)"), params)
+        connection.execute(sa.text("DELETE FROM course_assistants WHERE course_id = :duplicate"), params)
+
+        # O grupă poate avea un singur examen pe curs (unique_exam_per_course_and_group)
+        by_group = {}
+        for exam_id, group_id, status in connection.execute(sa.text(
+                "SELECT exam_id, group_id, CAST(status AS VARCHAR) FROM exams "
+                "WHERE course_id IN (:keep, :duplicate) AND group_id IS NOT NULL"), params):
+            by_group.setdefault(group_id, []).append((STATUS_RANK.get(status, len(STATUS_RANK)), exam_id))
+        for exams in by_group.values():
+            for _, exam_id in sorted(exams)[1:]:
+                connection.execute(sa.text("DELETE FROM exams WHERE exam_id = :exam_id"), {"exam_id": exam_id})
+
+        connection.execute(sa.text("UPDATE exams SET course_id = :keep WHERE course_id = :duplicate"), params)
+        connection.execute(sa.text("DELETE FROM courses WHERE course_id = :duplicate"), params)
+
+
+def upgrade():
+    connection = op.get_bind()
+    merge_rooms(connection)
+    merge_courses(connection)
+
+    with op.batch_alter_table('rooms', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_room_name', ['name'])
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_course_per_year_and_specialization',
+                                          ['name', 'study_year', 'specialization'])
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_course_per_year_and_specialization', type_='unique')
+
+    with op.batch_alter_table('rooms', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_room_name', type_='unique')
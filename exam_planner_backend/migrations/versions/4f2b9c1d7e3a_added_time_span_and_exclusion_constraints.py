@@ -0,0 +1,76 @@
+"""added time_span range and exclusion constraints for accepted exams
+
+Revision ID: 4f2b9c1d7e3a
+Revises: 21646872a3d2
+Create Date: 2026-10-18 10:12:41.518203
+
+Constrângerile nu pot fi create cât timp există examene acceptate care se suprapun în aceeași sală
+sau cu același asistent / profesor. Migrarea le verifică înainte și se oprește cu lista lor;
+pentru fiecare pereche, secretariatul trece unul dintre examene înapoi în așteptare, de exemplu
+`UPDATE exams SET status = 'IN_ASTEPTARE' WHERE exam_id = <id>;`, apoi rulează din nou migrarea.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2b9c1d7e3a'
+down_revision = '21646872a3d2'
+branch_labels = None
+depends_on = None
+
+TIME_SPAN_SQL = (
+    "CASE WHEN start_time IS NOT NULL AND duration IS NOT NULL "
+    "THEN tsrange(exam_date + start_time, exam_date + start_time + duration * interval '1 minute', '[)') END"
+)
+
+CONSTRAINTS = {
+    'exams_room_no_overlap': 'room_id',
+    'exams_assistant_no_overlap': 'assistant_id',
+    'exams_professor_no_overlap': 'professor_id',
+}
+
+
+def find_overlaps(connection):
+    """Perechile de examene acceptate care ar încălca una dintre constrângeri: (coloană, id1, id2, zi)."""
+    start, end = ("{0}.exam_date + {0}.start_time",
+                  "{0}.exam_date + {0}.start_time + {0}.duration * interval '1 minute'")
+    overlaps = []
+    for column in CONSTRAINTS.values():
+        overlaps += [(column, *row) for row in connection.execute(sa.text(
+            f"SELECT a.exam_id, b.exam_id, a.exam_date FROM exams a JOIN exams b "
+            f"ON a.{column} = b.{column} AND a.exam_id < b.exam_id "
+            f"WHERE a.status = 'ACCEPTAT' AND b.status = 'ACCEPTAT' "
+            f"AND {start.format('a')} < {end.format('b')} AND {start.format('b')} < {end.format('a')} "
+            f"ORDER BY a.exam_date, a.exam_id"
+        ))]
+    return overlaps
+
+
+def upgrade():
+    overlaps = find_overlaps(op.get_bind())
+    if overlaps:
+        details = "\n".join(f"  {column}: examenele {first} și {second} ({day})"
+                             for column, first, second, day in overlaps)
+        raise RuntimeError(
+            "Există examene acceptate care se suprapun; treceți unul din fiecare pereche în "
+            f"IN_ASTEPTARE și rulați din nou migrarea:\n{details}"
+        )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(f"ALTER TABLE exams ADD COLUMN time_span tsrange GENERATED ALWAYS AS ({TIME_SPAN_SQL}) STORED")
+
+    for name, column in CONSTRAINTS.items():
+        op.execute(
+            f"ALTER TABLE exams ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, time_span WITH &&) WHERE (status = 'ACCEPTAT')"
+        )
+
+
+def downgrade():
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE exams DROP CONSTRAINT IF EXISTS {name}")
+
+    with op.batch_alter_table('exams', schema=None) as batch_op:
+        batch_op.drop_column('time_span')
@@ -0,0 +1,26 @@
+"""added (group_id, exam_date) index for exams
+
+Revision ID: 6a3e8d2f1b47
+Revises: 4f2b9c1d7e3a
+Create Date: 2026-10-18 11:02:17.304118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a3e8d2f1b47'
+down_revision = '4f2b9c1d7e3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('exams', schema=None) as batch_op:
+        batch_op.create_index('ix_exams_group_date', ['group_id', 'exam_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('exams', schema=None) as batch_op:
+        batch_op.drop_index('ix_exams_group_date')
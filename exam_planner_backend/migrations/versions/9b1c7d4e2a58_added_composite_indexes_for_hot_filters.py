@@ -0,0 +1,56 @@
+"""added composite and partial indexes for the exam, course, group and period filters
+
+Revision ID: 9b1c7d4e2a58
+Revises: 6a3e8d2f1b47
+Create Date: 2026-10-18 15:40:52.117406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1c7d4e2a58'
+down_revision = '6a3e8d2f1b47'
+branch_labels = None
+depends_on = None
+
+ACCEPTED_SQL = "status = 'ACCEPTAT'"
+
+INDEXES = {
+    'exams': {
+        'ix_exams_room_date_status': ['room_id', 'exam_date', 'status'],
+        'ix_exams_assistant_date_status': ['assistant_id', 'exam_date', 'status'],
+        'ix_exams_professor_date_status': ['professor_id', 'exam_date', 'status'],
+        'ix_exams_date_start': ['exam_date', 'start_time', 'exam_id'],
+    },
+    'courses': {
+        'ix_courses_specialization_year': ['specialization', 'study_year'],
+        'ix_courses_coordinator': ['coordinator_id'],
+    },
+    'groups': {
+        'ix_groups_specialization_year': ['specialization', 'year_of_study'],
+    },
+    'examination_period': {
+        'ix_examination_period_name_dates': ['name', 'period_start', 'period_end'],
+    },
+}
+
+
+def upgrade():
+    for table, indexes in INDEXES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name, columns in indexes.items():
+                batch_op.create_index(name, columns, unique=False)
+
+    op.create_index('ix_exams_accepted_date', 'exams', ['exam_date', 'start_time'], unique=False,
+                    postgresql_where=sa.text(ACCEPTED_SQL), sqlite_where=sa.text(ACCEPTED_SQL))
+
+
+def downgrade():
+    op.drop_index('ix_exams_accepted_date', table_name='exams')
+
+    for table, indexes in INDEXES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name in indexes:
+                batch_op.drop_index(name)
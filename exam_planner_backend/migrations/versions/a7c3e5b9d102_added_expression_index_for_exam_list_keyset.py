@@ -0,0 +1,33 @@
+"""replaced ix_exams_date_start with an expression index matching the exam list keyset
+
+Revision ID: a7c3e5b9d102
+Revises: e8a1f4c6b309
+Create Date: 2026-10-18 21:05:37.204815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5b9d102'
+down_revision = 'e8a1f4c6b309'
+branch_labels = None
+depends_on = None
+
+# Aceeași expresie ca `EXAM_START_KEY` din app/models.py (examenele fără oră sunt la începutul zilei)
+START_KEY_SQL = "coalesce(start_time, '00:00:00')"
+
+
+def upgrade():
+    with op.batch_alter_table('exams', schema=None) as batch_op:
+        batch_op.drop_index('ix_exams_date_start')
+
+    op.create_index('ix_exams_date_start', 'exams', ['exam_date', sa.text(START_KEY_SQL), 'exam_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_exams_date_start', table_name='exams')
+
+    with op.batch_alter_table('exams', schema=None) as batch_op:
+        batch_op.create_index('ix_exams_date_start', ['exam_date', 'start_time', 'exam_id'], unique=False)
@@ -0,0 +1,31 @@
+"""added timetable sync state
+
+Revision ID: c4d9e2f7a615
+Revises: 3e5f0a9c8d21
+Create Date: 2026-10-18 18:03:41.902317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d9e2f7a615'
+down_revision = '3e5f0a9c8d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('timetable_sync_state',
+    sa.Column('teacher_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.String(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('teacher_id')
+    )
+
+
+def downgrade():
+    op.drop_table('timetable_sync_state')
@@ -0,0 +1,49 @@
+"""added sync jobs
+
+Revision ID: e8a1f4c6b309
+Revises: c4d9e2f7a615
+Create Date: 2026-10-18 18:47:13.526084
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1f4c6b309'
+down_revision = 'c4d9e2f7a615'
+branch_labels = None
+depends_on = None
+
+ACTIVE_SQL = "status IN ('IN_ASTEPTARE', 'IN_CURS')"
+
+
+def upgrade():
+    op.create_table('sync_jobs',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('IN_ASTEPTARE', 'IN_CURS', 'FINALIZAT', 'ESUAT', name='syncjobstatus'), nullable=False),
+    sa.Column('full', sa.Boolean(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('fetched', sa.Integer(), nullable=True),
+    sa.Column('changed', sa.Integer(), nullable=True),
+    sa.Column('unchanged', sa.Integer(), nullable=True),
+    sa.Column('failed', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ux_sync_jobs_active', 'sync_jobs', ['kind'], unique=True,
+                    postgresql_where=sa.text(ACTIVE_SQL), sqlite_where=sa.text(ACTIVE_SQL))
+
+
+def downgrade():
+    op.drop_index('ux_sync_jobs_active', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
+    sa.Enum(name='syncjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,127 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.calendar_feeds import calendar_feeds
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        calendar_feeds.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed():
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    room = Room(name="C203", building="C")
+    groups = [Group(name="3711", specialization="C", year_of_study=3),
+              Group(name="3712", specialization="C", year_of_study=3)]
+    course = Course(name="Baze de date; avansat", study_year=3, specialization="C", examination_method="EXAMEN")
+    db.session.add_all([prof, asist, room, *groups, course])
+    db.session.flush()
+    exams = [Exam(course_id=course.course_id, group_id=group.group_id, exam_date=date(2025, 6, 10 + i),
+                  type="EXAMEN", room_id=room.room_id, professor_id=prof.user_id,
+                  assistant_id=asist.user_id if i == 0 else None, status=ExamStatus.ACCEPTAT,
+                  start_time=time(9, 0), duration=150) for i, group in enumerate(groups)]
+    db.session.add_all(exams)
+    db.session.add(Exam(course_id=None, group_id=groups[0].group_id, exam_date=date(2025, 6, 20), type="EXAMEN",
+                        status=ExamStatus.IN_ASTEPTARE))
+    db.session.commit()
+    return prof, asist, room, groups, exams
+
+
+def _count_selects(client, url, **kwargs):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    response = client.get(url, **kwargs)
+    event.remove(db.engine, "before_cursor_execute", listener)
+    return response, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_group_feed_contains_accepted_exams(client, app):
+    prof, asist, room, groups, exams = _seed()
+
+    response = client.get(f'/calendar/group/{groups[0].group_id}.ics')
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/calendar"
+    body = response.data.decode()
+    assert body.count("BEGIN:VEVENT") == 1
+    assert "DTSTART:20250610T090000\r\n" in body
+    assert "DTEND:20250610T113000\r\n" in body
+    assert "SUMMARY:EXAMEN Baze de date\; avansat - 3711" in body
+    assert "LOCATION:C203 (C)" in body
+
+    assert client.get('/calendar/group/999.ics').status_code == 404
+    assert client.get(f'/calendar/professor/{asist.user_id}.ics').data.decode().count("BEGIN:VEVENT") == 1
+    assert client.get(f'/calendar/room/{room.room_id}.ics').data.decode().count("BEGIN:VEVENT") == 2
+
+
+def test_feeds_are_cached_and_conditional(client, app):
+    prof, asist, room, groups, exams = _seed()
+    url = f'/calendar/group/{groups[0].group_id}.ics'
+    other_url = f'/calendar/group/{groups[1].group_id}.ics'
+
+    first = client.get(url)
+    other = client.get(other_url)
+    etag = first.headers["ETag"]
+
+    response, selects = _count_selects(client, url)
+    assert response.data == first.data and selects == []
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+
+    # mutarea examenului grupei 3712 nu invalidează calendarul grupei 3711
+    exams[1].start_time = time(12, 0)
+    db.session.commit()
+    response, selects = _count_selects(client, url, headers={"If-None-Match": etag})
+    assert response.status_code == 304 and selects == []
+
+    changed = client.get(other_url, headers={"If-None-Match": other.headers["ETag"]})
+    assert changed.status_code == 200
+    assert "DTSTART:20250611T120000" in changed.data.decode()
+
+    # redenumirea sălii invalidează calendarele în care apare
+    room.name = "C204"
+    db.session.commit()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and "LOCATION:C204 (C)" in response.data.decode()
+
+
+def test_build_racing_an_invalidation_is_not_cached(client, app, monkeypatch):
+    prof, asist, room, groups, exams = _seed()
+    key = ("group", groups[0].group_id)
+    build = calendar_feeds._build
+
+    def racing_build(kind, entity_id):
+        result = build(kind, entity_id)
+        # Sala se modifică după citire, înainte ca rezultatul să fie salvat
+        calendar_feeds.invalidate(Room, room.room_id)
+        return result
+
+    monkeypatch.setattr(calendar_feeds, "_build", racing_build)
+    assert client.get(f'/calendar/group/{groups[0].group_id}.ics').status_code == 200
+    assert key not in calendar_feeds._feeds
+
+    monkeypatch.setattr(calendar_feeds, "_build", build)
+    client.get(f'/calendar/group/{groups[0].group_id}.ics')
+    assert key in calendar_feeds._feeds
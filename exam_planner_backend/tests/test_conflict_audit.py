@@ -0,0 +1,98 @@
+from datetime import date, time
+
+import numpy as np
+import pytest
+
+from app import create_app
+from app.conflict_audit import find_overlaps, audit_conflicts
+from app.models import db, User, UserRole, Room, Exam, ExamStatus
+
+
+# Fixture pentru crearea aplicației cu o bază de date în memorie
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_find_overlaps_per_key():
+    keys = np.array([1, 1, 1, 2, 2, -1, -1])
+    starts = np.array([0, 50, 300, 40, 100, 0, 10])
+    ends = np.array([400, 100, 350, 100, 200, 100, 20])
+
+    positions, partners = find_overlaps(keys, starts, ends)
+    pairs = set(zip(positions.tolist(), partners.tolist()))
+
+    # intervalul lung [0, 400) acoperă și examenul de la 300, chiar dacă nu sunt adiacente
+    assert pairs == {(1, 0), (2, 0)}
+
+
+def test_find_overlaps_reports_every_pair():
+    # A[0, 100), B[10, 50), C[20, 30): C se suprapune atât cu A, cât și cu B
+    positions, partners = find_overlaps(np.array([1, 1, 1]), np.array([0, 10, 20]), np.array([100, 50, 30]))
+    assert set(zip(positions.tolist(), partners.tolist())) == {(1, 0), (2, 0), (2, 1)}
+
+
+def test_audit_reports_room_and_professor_conflicts(app):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, room])
+    db.session.commit()
+
+    day = date(2025, 6, 10)
+    first = Exam(exam_date=day, type="EXAMEN", room_id=room.room_id, professor_id=prof.user_id,
+                 status=ExamStatus.ACCEPTAT, start_time=time(9, 0), duration=120)
+    second = Exam(exam_date=day, type="EXAMEN", room_id=room.room_id, professor_id=prof.user_id,
+                  status=ExamStatus.ACCEPTAT, start_time=time(10, 0), duration=60)
+    pending = Exam(exam_date=day, type="EXAMEN", room_id=room.room_id, professor_id=prof.user_id,
+                   status=ExamStatus.IN_ASTEPTARE, start_time=time(9, 0), duration=60)
+    other_day = Exam(exam_date=date(2025, 6, 11), type="EXAMEN", room_id=room.room_id,
+                     status=ExamStatus.ACCEPTAT, start_time=time(9, 0), duration=60)
+    db.session.add_all([first, second, pending, other_day])
+    db.session.commit()
+
+    report = audit_conflicts()
+
+    assert {(item["resource"], item["exam_id"], item["conflicts_with"]) for item in report} == {
+        ("room", second.exam_id, first.exam_id),
+        ("professor", second.exam_id, first.exam_id),
+    }
+    assert report[0]["exam_date"] == "2025-06-10"
+    assert report[0]["start_time"] == "10:00"
+
+
+def _pairwise_overlaps(keys, starts, ends):
+    """Referința de forță brută: compară toate perechile din fiecare cheie."""
+    expected = set()
+    order = np.argsort(keys, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(keys[order])) + 1)
+    for group in groups:
+        if keys[group[0]] < 0:
+            continue
+        mask = (starts[group][:, None] < ends[group][None, :]) & (starts[group][None, :] < ends[group][:, None])
+        first, second = np.nonzero(np.triu(mask, k=1))
+        expected.update(frozenset(pair) for pair in zip(group[first].tolist(), group[second].tolist()))
+    return expected
+
+
+def test_find_overlaps_matches_pairwise_check():
+    rng = np.random.default_rng(7)
+    count = 50_000
+    keys = rng.integers(-1, 2_000, count)
+    starts = rng.integers(0, 5 * 1440, count)
+    ends = starts + rng.integers(30, 240, count)
+
+    positions, partners = find_overlaps(keys, starts, ends)
+    found = {frozenset(pair) for pair in zip(positions.tolist(), partners.tolist())}
+
+    expected = _pairwise_overlaps(keys, starts, ends)
+    assert found == expected
+    assert len(positions) == len(expected)
+    assert np.all(starts[partners] <= starts[positions])
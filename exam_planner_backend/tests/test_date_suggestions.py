@@ -0,0 +1,100 @@
+from datetime import date, time
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.config import Config
+from app.date_suggestions import suggest_alternatives
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus, ExaminationPeriod
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed():
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    leader = User(name="Lider", email="lider@student.usv.ro", role=UserRole.SG)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, asist, leader, room])
+    db.session.flush()
+    group = Group(name="3711", leader_id=leader.user_id, specialization="C", year_of_study=3)
+    other_group = Group(name="3712", specialization="C", year_of_study=3)
+    courses = [Course(name=f"Curs {i}", study_year=3, specialization="C", examination_method="EXAMEN",
+                      coordinator_id=prof.user_id) for i in range(3)]
+    db.session.add_all([group, other_group, *courses])
+    db.session.add(ExaminationPeriod(name="EXAMEN", period_start=date(2027, 6, 7), period_end=date(2027, 6, 18)))
+    db.session.flush()
+
+    # profesorul are deja un examen acceptat miercuri 08:00 - 10:00 în singura sală
+    db.session.add(Exam(course_id=courses[1].course_id, group_id=other_group.group_id, exam_date=date(2027, 6, 9),
+                        type="EXAMEN", room_id=room.room_id, professor_id=prof.user_id, assistant_id=asist.user_id,
+                        status=ExamStatus.ACCEPTAT, start_time=time(8, 0), duration=120))
+    exam = Exam(course_id=courses[0].course_id, group_id=group.group_id, exam_date=date(2027, 6, 9),
+                type="EXAMEN", professor_id=prof.user_id, status=ExamStatus.IN_ASTEPTARE)
+    db.session.add(exam)
+    db.session.commit()
+    return prof, asist, room, group, courses, exam
+
+
+def test_suggestions_use_free_time_and_group_constraints(app, monkeypatch):
+    monkeypatch.setattr(Config, "GROUP_MAX_EXAMS_PER_DAY", 1)
+    prof, asist, room, group, courses, exam = _seed()
+
+    suggestions = suggest_alternatives(exam, duration=120, k=3)
+    assert suggestions[0] == {"exam_date": "2027-06-09", "start_time": "10:00", "room_id": room.room_id}
+    assert [s["exam_date"] for s in suggestions] == ["2027-06-09", "2027-06-08", "2027-06-10"]
+
+    # grupa are deja un examen marți, iar data respinsă nu mai este propusă
+    db.session.add(Exam(course_id=courses[2].course_id, group_id=group.group_id, exam_date=date(2027, 6, 8),
+                        type="EXAMEN", status=ExamStatus.IN_ASTEPTARE))
+    db.session.commit()
+    suggestions = suggest_alternatives(exam, duration=120, exclude_date=exam.exam_date, k=4)
+    assert [s["exam_date"] for s in suggestions] == ["2027-06-10", "2027-06-07", "2027-06-11", "2027-06-14"]
+    assert all(s["start_time"] == "08:00" for s in suggestions)
+
+
+def test_suggestions_skip_days_without_a_long_enough_gap(app):
+    prof, asist, room, group, courses, exam = _seed()
+
+    suggestions = suggest_alternatives(exam, duration=11 * 60, k=1)
+    assert suggestions == [{"exam_date": "2027-06-08", "start_time": "08:00", "room_id": room.room_id}]
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_review_returns_alternatives(send_email, client, app):
+    prof, asist, room, group, courses, exam = _seed()
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.put('/exam/review', json={
+        "exam_id": exam.exam_id, "decision": "ACCEPTAT", "room_id": room.room_id,
+        "assistant_id": asist.user_id, "start_time": "09:00", "duration": 120,
+    }, headers=headers)
+    assert response.status_code == 409
+    assert response.get_json()["alternatives"][0] == {"exam_date": "2027-06-09", "start_time": "10:00",
+                                                      "room_id": room.room_id}
+
+    response = client.put('/exam/review', json={"exam_id": exam.exam_id, "decision": "RESPINS"}, headers=headers)
+    assert response.status_code == 200
+    alternatives = response.get_json()["alternatives"]
+    assert alternatives and "2027-06-09" not in [a["exam_date"] for a in alternatives]
+    assert "Date disponibile" in send_email.call_args.kwargs["body"]
@@ -0,0 +1,179 @@
+import os
+import time as clock
+import zipfile
+from datetime import date, time
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from openpyxl import load_workbook
+from reportlab.pdfbase import pdfmetrics
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.export_cache import export_cache, ExportCache
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        export_cache.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed(count):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, asist, room])
+    db.session.flush()
+    for i in range(count):
+        group = Group(name=f"37{i:02d}", specialization="C", year_of_study=3)
+        course = Course(name=f"Curs {i}", study_year=3, specialization="C", examination_method="EXAMEN",
+                        coordinator_id=prof.user_id)
+        db.session.add_all([group, course])
+        db.session.flush()
+        db.session.add(Exam(course_id=course.course_id, group_id=group.group_id, exam_date=date(2025, 6, 10 + i % 5),
+                            type="EXAMEN", room_id=room.room_id if i % 2 else None, professor_id=prof.user_id,
+                            assistant_id=asist.user_id if i % 2 else None, status=ExamStatus.ACCEPTAT,
+                            start_time=time(8 + i % 10, 0), duration=60))
+    db.session.commit()
+
+
+def _count_selects(client, url):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    response = client.get(url)
+    event.remove(db.engine, "before_cursor_execute", listener)
+    return response, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.parametrize("count", [3, 40])
+def test_excel_export_uses_one_query(client, app, count):
+    _seed(count)
+    response, selects = _count_selects(client, '/download/exams-xlsx')
+    assert response.status_code == 200
+    assert len(selects) == 1
+
+    rows = list(load_workbook(BytesIO(response.data)).active.iter_rows(values_only=True))
+    assert len(rows) == count + 1
+    assert rows[0][0] == "Grupa"
+    if count > 3:
+        return
+    assert rows[1] == ("3700/3/C", "Curs 0", "Prof", "N/A", "2025-06-10", "08:00", "N/A")
+    assert rows[2] == ("3701/3/C", "Curs 1", "Prof", "Asistent", "2025-06-11", "09:00", "C203")
+
+
+def test_pdf_export_in_memory_with_one_query(client, app):
+    _seed(60)
+    static_pdf = os.path.join(app.root_path, 'static', 'examene.pdf')
+    before = os.path.getmtime(static_pdf)
+
+    with patch('app.exports.pdfmetrics.registerFont', wraps=pdfmetrics.registerFont) as register:
+        response, selects = _count_selects(client, '/download/exams-pdf')
+        second = client.get('/download/exams-pdf')
+
+    assert response.status_code == 200 and second.status_code == 200
+    assert response.data.startswith(b"%PDF")
+    assert len(selects) == 1
+    assert [c.args[0].fontName for c in register.call_args_list].count("DejaVuSans") <= 1
+    assert os.path.getmtime(static_pdf) == before
+
+
+def test_exports_are_cached_with_etag(client, app):
+    _seed(3)
+    first, selects = _count_selects(client, '/download/exams-xlsx')
+    etag = first.headers["ETag"]
+    assert len(selects) == 1
+
+    cached, selects = _count_selects(client, '/download/exams-xlsx')
+    assert cached.status_code == 200 and cached.data == first.data
+    assert selects == []
+
+    not_modified = client.get('/download/exams-xlsx', headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    room = db.session.get(Room, 1)
+    room.name = "C999"
+    db.session.commit()
+    changed = client.get('/download/exams-xlsx', headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_etags_do_not_depend_on_the_render_time(client, app):
+    _seed(3)
+    first = {url: client.get(url) for url in ('/download/exams-xlsx', '/download/exams-pdf')}
+
+    # Un alt proces (cache gol) generează aceleași date după ce ceasul a avansat
+    export_cache.clear()
+    clock.sleep(2.1)
+    for url, response in first.items():
+        again = client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304, url
+
+    assert first['/download/exams-xlsx'].headers["ETag"] != first['/download/exams-pdf'].headers["ETag"]
+
+
+def test_export_cache_evicts_least_recently_used():
+    cache = ExportCache(max_bytes=10, ttl=60)
+    cache.get_or_render("a", list, lambda rows: b"aaaa")
+    cache.get_or_render("b", list, lambda rows: b"bbbb")
+    cache.get_or_render("a", list, lambda rows: b"never")
+    cache.get_or_render("c", list, lambda rows: b"cccc")
+
+    assert cache.size == 8
+    assert cache.get_or_render("a", list, lambda rows: b"new")[1] == b"aaaa"
+    assert cache.get_or_render("b", list, lambda rows: b"new")[1] == b"new"
+
+    cache.bump()
+    assert cache.get_or_render("a", list, lambda rows: b"v2")[1] == b"v2"
+
+
+def test_exports_filter_in_sql(client, app):
+    _seed(10)
+    group = Group.query.filter_by(name="3703").first()
+
+    rows = list(load_workbook(BytesIO(client.get(f'/download/exams-xlsx?group_id={group.group_id}').data))
+                .active.iter_rows(values_only=True))
+    assert [r[1] for r in rows[1:]] == ["Curs 3"]
+
+    response = client.get('/download/exams-xlsx?date_from=2025-06-11&date_to=2025-06-12&study_year=3&specialization=C')
+    dates = [r[4] for r in load_workbook(BytesIO(response.data)).active.iter_rows(values_only=True)][1:]
+    assert len(dates) == 4 and set(dates) == {"2025-06-11", "2025-06-12"}
+
+    assert client.get('/download/exams-xlsx?study_year=4').status_code == 200
+    assert client.get('/download/exams-xlsx?group_id=abc').status_code == 400
+    assert client.get('/download/exams-pdf?date_from=11-06-2025').status_code == 400
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pdf_booklet_has_one_pdf_per_group(client, app, monkeypatch, workers):
+    monkeypatch.setattr(Config, "EXPORT_BOOKLET_WORKERS", workers)
+    if not workers:
+        # Implicit broșura este generată în procesul cererii, fără pool de procese
+        monkeypatch.setattr("app.exports._get_booklet_pool", lambda: pytest.fail("pool pornit"))
+    _seed(4)
+    response = client.get('/download/exams-pdf?booklet=1&date_to=2025-06-12')
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    with zipfile.ZipFile(BytesIO(response.data)) as archive:
+        assert sorted(archive.namelist()) == ["examene_3700.pdf", "examene_3701.pdf", "examene_3702.pdf"]
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
@@ -0,0 +1,110 @@
+from datetime import date, time
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.interval_index import is_free
+from app.models import db, User, UserRole, Room, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed():
+    sec = User(name="Secretariat", email="sec@usv.ro", role=UserRole.SEC)
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    rooms = [Room(name="C203", building="C"), Room(name="C204", building="C")]
+    db.session.add_all([sec, prof, *rooms])
+    db.session.commit()
+    exams = [Exam(exam_date=date(2025, 6, 10), type="EXAMEN", room_id=rooms[i % 2].room_id,
+                  status=ExamStatus.ACCEPTAT, start_time=time(8 + 3 * i, 0), duration=120) for i in range(3)]
+    db.session.add_all(exams)
+    db.session.commit()
+    token = create_access_token(identity=str(sec.user_id), additional_claims={'role': 'SEC'})
+    return prof, rooms, exams, {'Authorization': f'Bearer {token}'}
+
+
+def test_dry_run_reports_conflict_and_diff_without_saving(client, app):
+    prof, rooms, exams, headers = _seed()
+
+    response = client.put(f'/exam/edit/{exams[1].exam_id}?dry_run=1',
+                          json={"room_id": rooms[0].room_id, "start_time": "09:00"}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["dry_run"] is True
+    assert body["conflicts"] == [{"exam_id": exams[1].exam_id, "field": "room_id",
+                                  "conflicts_with": exams[0].exam_id,
+                                  "msg": "Sala este ocupat în intervalul propus."}]
+    assert body["diff"][0]["changes"] == {
+        "room_id": {"before": rooms[1].room_id, "after": rooms[0].room_id},
+        "start_time": {"before": "11:00", "after": "09:00"},
+    }
+
+    db.session.expire_all()
+    exam = db.session.get(Exam, exams[1].exam_id)
+    assert (exam.room_id, exam.start_time) == (rooms[1].room_id, time(11, 0))
+    assert is_free("room_id", rooms[0].room_id, date(2025, 6, 10), "11:00", 60)
+
+
+def test_plan_detects_conflicts_between_planned_moves(client, app):
+    prof, rooms, exams, headers = _seed()
+
+    plan = {"edits": [
+        {"exam_id": exams[0].exam_id, "exam_date": "2025-06-11", "professor_id": prof.user_id},
+        {"exam_id": exams[2].exam_id, "exam_date": "2025-06-11", "start_time": "09:00",
+         "professor_id": prof.user_id},
+    ]}
+    response = client.put('/exam/edit/plan', json=plan, headers=headers)
+
+    assert response.status_code == 409
+    conflicts = response.get_json()["conflicts"]
+    assert {(c["field"], c["exam_id"], c["conflicts_with"]) for c in conflicts} == {
+        ("room_id", exams[0].exam_id, exams[2].exam_id),
+        ("professor_id", exams[0].exam_id, exams[2].exam_id),
+    }
+    db.session.expire_all()
+    assert db.session.get(Exam, exams[0].exam_id).exam_date == date(2025, 6, 10)
+
+    plan["edits"][1]["start_time"] = "10:00"
+    response = client.put('/exam/edit/plan?dry_run=1', json=plan, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["conflicts"] == []
+    db.session.expire_all()
+    assert db.session.get(Exam, exams[0].exam_id).exam_date == date(2025, 6, 10)
+
+    response = client.put('/exam/edit/plan', json=plan, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["applied"] is True
+    db.session.expire_all()
+    assert db.session.get(Exam, exams[2].exam_id).start_time == time(10, 0)
+    assert not is_free("professor_id", prof.user_id, date(2025, 6, 11), "09:00", 60)
+
+
+def test_plan_rejects_invalid_payload(client, app):
+    prof, rooms, exams, headers = _seed()
+
+    assert client.put('/exam/edit/plan', json={"edits": []}, headers=headers).status_code == 400
+    response = client.put('/exam/edit/plan?dry_run=1', json={"edits": [
+        {"exam_id": exams[0].exam_id, "room_id": 999},
+        {"exam_id": 12345, "duration": 60},
+    ]}, headers=headers)
+    assert [c["msg"] for c in response.get_json()["conflicts"]] == [
+        "Sala specificată nu există.", "Examenul nu a fost găsit!"]
@@ -0,0 +1,119 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app import create_app
+from app.config import Config
+from app.group_constraints import check_group_date
+from app.models import db, User, UserRole, Group, Course, Exam, ExamStatus, ExaminationPeriod
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed(courses=3):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    leader = User(name="Lider", email="lider@student.usv.ro", role=UserRole.SG)
+    db.session.add_all([prof, leader])
+    db.session.flush()
+    group = Group(name="3711", leader_id=leader.user_id, specialization="C", year_of_study=3)
+    db.session.add(group)
+    db.session.add(ExaminationPeriod(name="EXAMEN", period_start=date(2025, 6, 1), period_end=date(2025, 6, 30)))
+    course_list = [Course(name=f"Curs {i}", study_year=3, specialization="C", examination_method="EXAMEN",
+                          coordinator_id=prof.user_id) for i in range(courses)]
+    db.session.add_all(course_list)
+    db.session.commit()
+    token = create_access_token(identity=str(leader.user_id), additional_claims={'role': 'SG'})
+    return group, course_list, {'Authorization': f'Bearer {token}'}
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_propose_limits_exams_per_day(send_email, client, app, monkeypatch):
+    monkeypatch.setattr(Config, "GROUP_MAX_EXAMS_PER_DAY", 1)
+    monkeypatch.setattr(Config, "GROUP_MIN_DAYS_BETWEEN_EXAMS", 0)
+    group, courses, headers = _seed()
+
+    response = client.post('/exam/propose', json={"course_id": courses[0].course_id, "exam_date": "2025-06-10"},
+                           headers=headers)
+    assert response.status_code == 201
+
+    response = client.post('/exam/propose', json={"course_id": courses[1].course_id, "exam_date": "2025-06-10"},
+                           headers=headers)
+    assert response.status_code == 409
+    assert "în această zi" in response.get_json()["error"]
+
+    response = client.post('/exam/propose', json={"course_id": courses[1].course_id, "exam_date": "2025-06-11"},
+                           headers=headers)
+    assert response.status_code == 201
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_propose_and_reschedule_respect_spacing(send_email, client, app, monkeypatch):
+    monkeypatch.setattr(Config, "GROUP_MAX_EXAMS_PER_DAY", 1)
+    monkeypatch.setattr(Config, "GROUP_MIN_DAYS_BETWEEN_EXAMS", 3)
+    group, courses, headers = _seed()
+
+    assert client.post('/exam/propose', json={"course_id": courses[0].course_id, "exam_date": "2025-06-10"},
+                       headers=headers).status_code == 201
+
+    response = client.post('/exam/propose', json={"course_id": courses[1].course_id, "exam_date": "2025-06-12"},
+                           headers=headers)
+    assert response.status_code == 409
+    assert "2025-06-10" in response.get_json()["error"]
+
+    assert client.post('/exam/propose', json={"course_id": courses[1].course_id, "exam_date": "2025-06-13"},
+                       headers=headers).status_code == 201
+
+    # reprogramarea ignoră examenul reprogramat, dar nu și pe celelalte
+    exam = Exam.query.filter_by(course_id=courses[1].course_id).first()
+    exam.status = ExamStatus.RESPINS
+    db.session.commit()
+
+    response = client.patch(f'/exam/{exam.exam_id}/update-date', json={"exam_date": "2025-06-11"}, headers=headers)
+    assert response.status_code == 409
+
+    response = client.patch(f'/exam/{exam.exam_id}/update-date', json={"exam_date": "2025-06-14"}, headers=headers)
+    assert response.status_code == 200
+    assert db.session.get(Exam, exam.exam_id).exam_date == date(2025, 6, 14)
+
+
+def test_rejected_exams_do_not_count(app):
+    group, courses, _ = _seed()
+    db.session.add(Exam(course_id=courses[0].course_id, group_id=group.group_id, exam_date=date(2025, 6, 10),
+                        type="EXAMEN", status=ExamStatus.RESPINS))
+    db.session.commit()
+
+    assert check_group_date(group.group_id, date(2025, 6, 10), max_per_day=1, min_days_between=2) is None
+
+
+def test_limits_are_off_by_default_and_read_from_the_database(app, monkeypatch):
+    group, courses, _ = _seed()
+    assert Config.GROUP_MAX_EXAMS_PER_DAY == 0
+    monkeypatch.setattr(Config, "GROUP_MAX_EXAMS_PER_DAY", 1)
+    assert check_group_date(group.group_id, date(2025, 6, 10)) is None
+
+    # Examen salvat de alt proces (fără notificări în procesul curent)
+    with db.engine.begin() as connection:
+        connection.execute(insert(Exam), {"course_id": courses[0].course_id, "group_id": group.group_id,
+                                          "exam_date": date(2025, 6, 10), "type": "EXAMEN",
+                                          "status": ExamStatus.IN_ASTEPTARE})
+    assert "în această zi" in check_group_date(group.group_id, date(2025, 6, 10))
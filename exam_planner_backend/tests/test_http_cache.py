@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from app import create_app
+from app.import_data import fetch_and_store_data, http_session
+from app.models import db, User, Course, Room, TimetableSyncState
+from tests.test_sync import FACULTY, StubOrar, _professors
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['FACULTY_NAME'] = FACULTY
+    app.config['SHORT_FACULTY_NAME'] = "FIESC"
+    app.config['SYNC_HTTP_CACHE_DIR'] = str(tmp_path / "orar")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def orar(monkeypatch):
+    stubs = []
+
+    def start(professors, **kwargs):
+        stub = StubOrar(professors, **kwargs)
+        monkeypatch.setattr("app.import_data.API_PROFESSORS", f"{stub.url}/cadre.php?json")
+        monkeypatch.setattr("app.import_data.API_COURSES", f"{stub.url}/orarSPG.php?ID={{}}&mod=prof&json")
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.close()
+
+
+def _reset_db():
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def _snapshot():
+    return (sorted((u.email, u.teacherId) for u in User.query.all()),
+            sorted((c.name, c.coordinator_id, len(c.assistants)) for c in Course.query.all()),
+            sorted(r.name for r in Room.query.all()))
+
+
+def test_recorded_sync_replays_without_network(app, orar):
+    stub = orar(_professors(15), delay=0.05)
+    app.config['SYNC_HTTP_CACHE'] = "record"
+    fetch_and_store_data()
+    recorded = _snapshot()
+
+    files = os.listdir(app.config['SYNC_HTTP_CACHE_DIR'])
+    assert len(files) == 16 and all(name.endswith(".gz") for name in files)
+    with open(os.path.join(app.config['SYNC_HTTP_CACHE_DIR'], files[0]), "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+
+    # Serverul nu mai este disponibil: sincronizarea este redată de pe disc
+    stub.close()
+    _reset_db()
+    app.config['SYNC_HTTP_CACHE'] = "replay"
+    assert fetch_and_store_data()["changed"] == 15
+
+    assert _snapshot() == recorded
+    # O a doua redare găsește aceleași conținuturi (același hash) și nu reprocesează nimic
+    assert fetch_and_store_data()["unchanged"] == 15
+
+
+def test_replay_of_a_missing_response_fails_the_timetable(app, orar):
+    app.config['SYNC_HTTP_CACHE'] = "record"
+    stub = orar(_professors(3))
+    fetch_and_store_data()
+    stub.close()
+
+    app.config['SYNC_HTTP_CACHE'] = "replay"
+    orar(_professors(4))
+    # URL-urile noului server nu au fost înregistrate
+    assert fetch_and_store_data() is None
+
+    with http_session(1, "replay", app.config['SYNC_HTTP_CACHE_DIR'], 0) as session:
+        with pytest.raises(Exception, match="nu există în cache"):
+            session.get("http://127.0.0.1:9/orarSPG.php?ID=1&mod=prof&json")
+
+
+def test_ttl_mode_refreshes_only_expired_responses(app, orar):
+    stub = orar(_professors(5), etags=True)
+    app.config['SYNC_HTTP_CACHE'] = "ttl"
+    app.config['SYNC_HTTP_CACHE_TTL'] = 3600
+    fetch_and_store_data()
+    assert len(stub.requests) == 6
+
+    # Răspunsurile proaspete sunt servite de pe disc
+    assert fetch_and_store_data()["unchanged"] == 5
+    assert len(stub.requests) == 6
+
+    # După expirare, orarele sunt cerute condiționat, iar intrările confirmate prin 304 sunt reîmprospătate
+    app.config['SYNC_HTTP_CACHE_TTL'] = 0
+    stub.timetables[2] = [[], {}]
+    assert fetch_and_store_data() == {"professors": 5, "changed": 1, "unchanged": 4, "failed": 0}
+    assert len(stub.requests) == 12 and stub.not_modified == 4
+    assert TimetableSyncState.query.count() == 5
+
+    app.config['SYNC_HTTP_CACHE_TTL'] = 3600
+    fetch_and_store_data()
+    assert len(stub.requests) == 12
+
+
+def test_unknown_cache_mode_is_rejected():
+    with pytest.raises(ValueError):
+        http_session(1, "sometimes")
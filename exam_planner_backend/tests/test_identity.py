@@ -0,0 +1,114 @@
+from datetime import date
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.identity import token_claims
+from app.models import db, User, UserRole, Group, Course, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed():
+    leader = User(name="Lider", email="lider@usv.ro", role=UserRole.SG)
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    db.session.add_all([leader, prof])
+    db.session.flush()
+    group = Group(name="3711", specialization="C", year_of_study=3, leader_id=leader.user_id)
+    course = Course(name="Rețele", specialization="C", study_year=3, coordinator_id=prof.user_id)
+    db.session.add_all([group, course])
+    db.session.flush()
+    exam = Exam(course_id=course.course_id, group_id=group.group_id, exam_date=date(2027, 6, 10), type="EXAMEN",
+                professor_id=prof.user_id, status=ExamStatus.IN_ASTEPTARE)
+    db.session.add(exam)
+    db.session.commit()
+    return leader, prof, group, course, exam
+
+
+def _selects(client, url, token):
+    # Ca într-o cerere reală, sesiunea nu are încă obiecte încărcate
+    db.session.expunge_all()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    response = client.get(url, headers={'Authorization': f'Bearer {token}'})
+    event.remove(db.engine, "before_cursor_execute", listener)
+    assert response.status_code == 200, response.get_json()
+    return response, [s.split("FROM")[1].split()[0] for s in statements if s.lstrip().startswith("SELECT")]
+
+
+def test_token_claims_include_led_group(app):
+    leader, prof, group, course, exam = _seed()
+
+    assert token_claims(leader) == {"role": "SG", "group_id": group.group_id, "specialization": "C",
+                                    "study_year": 3}
+    assert token_claims(prof) == {"role": "CD", "group_id": None, "specialization": None, "study_year": None}
+
+
+def test_group_claims_skip_user_and_group_lookups(client):
+    leader, prof, group, course, exam = _seed()
+    token = create_access_token(identity=str(leader.user_id), additional_claims=token_claims(leader))
+    exam_id = exam.exam_id
+
+    response, tables = _selects(client, '/exam/for/group', token)
+    assert [e["exam_id"] for e in response.get_json()] == [exam_id]
+    assert tables == ["exams"]
+
+    response, tables = _selects(client, f'/exam/{exam_id}', token)
+    assert tables == ["users", "exams"]
+
+    response, tables = _selects(client, '/courses', token)
+    assert [c["name"] for c in response.get_json()] == ["Rețele"]
+    assert tables == ["users", "courses"]
+
+
+def test_tokens_without_group_claims_look_up_the_group_once(client):
+    leader, prof, group, course, exam = _seed()
+    token = create_access_token(identity=str(leader.user_id), additional_claims={'role': 'SG'})
+    other = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+    exam_id = exam.exam_id
+
+    response, tables = _selects(client, f'/exam/{exam_id}', token)
+    assert response.get_json()["exam_id"] == exam_id
+    assert sorted(tables) == ["exams", "groups", "users"]
+
+    # Cererile nu împart utilizatorul încărcat, chiar dacă rulează în același context de aplicație
+    response, tables = _selects(client, '/exam/by-status', other)
+    assert sum(len(items) for items in response.get_json().values()) == 1
+
+
+def test_replaced_leader_cannot_modify_with_an_old_token(client):
+    leader, prof, group, course, exam = _seed()
+    token = create_access_token(identity=str(leader.user_id), additional_claims=token_claims(leader))
+    headers = {'Authorization': f'Bearer {token}'}
+
+    other = User(name="Lider nou", email="lider.nou@usv.ro", role=UserRole.SG)
+    db.session.add(other)
+    db.session.flush()
+    group.leader_id = other.user_id
+    db.session.commit()
+
+    response = client.patch(f'/exam/{exam.exam_id}/update-date', json={"exam_date": "2027-06-11"}, headers=headers)
+    assert response.status_code == 404
+    response = client.post('/exam/propose', json={"course_id": course.course_id, "exam_date": "2027-06-11"},
+                           headers=headers)
+    assert response.status_code == 403
+    assert db.session.get(Exam, exam.exam_id).exam_date == date(2027, 6, 10)
@@ -0,0 +1,101 @@
+from datetime import date, time
+
+import pytest
+
+from app import create_app
+from app.interval_index import find_conflict, is_free, IntervalList
+from app.models import db, User, UserRole, Room, Exam, ExamStatus
+
+
+# Fixture pentru crearea aplicației cu o bază de date în memorie
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _seed(app):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, asist, room])
+    db.session.commit()
+    exam = Exam(exam_date=date(2025, 6, 10), type="EXAMEN", room_id=room.room_id,
+                professor_id=prof.user_id, assistant_id=asist.user_id, status=ExamStatus.ACCEPTAT,
+                start_time=time(9, 0), duration=120)
+    db.session.add(exam)
+    db.session.commit()
+    return prof, asist, room, exam
+
+
+def test_interval_list_finds_overlaps():
+    intervals = IntervalList()
+    intervals.add(0, 100, 1)
+    intervals.add(120, 150, 2)
+    intervals.add(10, 400, 3)
+
+    assert intervals.find(100, 120) == 3
+    assert intervals.find(100, 120, exclude_exam_id=3) is None
+    assert intervals.find(130, 140, exclude_exam_id=3) == 2
+    assert intervals.find(400, 500) is None
+
+    intervals.remove(3)
+    assert intervals.find(100, 120) is None
+
+
+def test_find_conflict_for_each_resource(app):
+    prof, asist, room, exam = _seed(app)
+    day = date(2025, 6, 10)
+
+    assert find_conflict("room_id", room.room_id, day, "10:00", 60) == exam.exam_id
+    assert find_conflict("assistant_id", asist.user_id, "2025-06-10", "08:00", 61) == exam.exam_id
+    assert find_conflict("professor_id", prof.user_id, day, time(11, 0), 30) is None
+    assert is_free("room_id", room.room_id, day, "10:00", 60, exclude_exam_id=exam.exam_id)
+
+
+def test_checks_follow_commits(app):
+    prof, asist, room, exam = _seed(app)
+    day = date(2025, 6, 10)
+    assert not is_free("room_id", room.room_id, day, "09:30", 30)
+
+    exam.start_time = time(12, 0)
+    db.session.commit()
+    assert is_free("room_id", room.room_id, day, "09:30", 30)
+    assert not is_free("room_id", room.room_id, day, "12:30", 30)
+
+    exam.status = ExamStatus.RESPINS
+    db.session.commit()
+    assert is_free("room_id", room.room_id, day, "12:30", 30)
+
+    exam.status = ExamStatus.ACCEPTAT
+    db.session.commit()
+    db.session.delete(exam)
+    db.session.commit()
+    assert is_free("room_id", room.room_id, day, "12:30", 30)
+
+
+def test_changes_from_other_processes_are_seen(app):
+    prof, asist, room, exam = _seed(app)
+    day = date(2025, 6, 10)
+    assert is_free("room_id", room.room_id, day, "14:00", 60)
+
+    # Un alt proces acceptă un examen (fără notificări în procesul curent)
+    with db.engine.begin() as connection:
+        connection.execute(Exam.__table__.insert().values(
+            exam_date=day, type="EXAMEN", room_id=room.room_id, status="ACCEPTAT",
+            start_time=time(14, 0), duration=60))
+        other = connection.execute(db.select(db.func.max(Exam.exam_id))).scalar()
+    assert find_conflict("room_id", room.room_id, day, "14:30", 60) == other
+
+    # ...și îl mută pe primul
+    with db.engine.begin() as connection:
+        connection.execute(Exam.__table__.update().where(Exam.exam_id == exam.exam_id)
+                           .values(start_time=time(17, 0)))
+    assert is_free("room_id", room.room_id, day, "09:00", 60)
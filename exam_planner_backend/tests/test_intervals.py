@@ -0,0 +1,75 @@
+import os
+import random
+import timeit
+from datetime import datetime, date, time, timedelta
+
+import numpy as np
+import pytest
+
+from app.interval_index import IntervalList
+from app.intervals import as_minutes, exam_span, format_minutes, overlaps, overlap_mask
+from app.models import Exam
+
+
+def legacy_overlaps(start1, dur1, start2, dur2):
+    # Implementarea anterioară din app/routes/exams.py, păstrată pentru comparație
+    if isinstance(start1, str):
+        start1 = datetime.strptime(start1, "%H:%M").time()
+    if isinstance(start2, str):
+        start2 = datetime.strptime(start2, "%H:%M").time()
+    s1 = datetime.combine(date.today(), start1)
+    e1 = s1 + timedelta(minutes=dur1)
+    s2 = datetime.combine(date.today(), start2)
+    e2 = s2 + timedelta(minutes=dur2)
+    return s1 < e2 and s2 < e1
+
+
+def _random_exams(count, seed=3):
+    rng = random.Random(seed)
+    return [(f"{rng.randint(8, 19):02d}:{rng.choice((0, 15, 30, 45)):02d}", rng.choice((60, 90, 120, 180)))
+            for _ in range(count)]
+
+
+def test_overlaps_and_interval_list_match_legacy():
+    exams = _random_exams(300)
+    spans = [exam_span(start, duration) for start, duration in exams]
+    starts = np.array([s for s, _ in spans])
+    ends = np.array([e for _, e in spans])
+
+    for i, ((start, duration), (s, e)) in enumerate(zip(exams, spans)):
+        expected = [legacy_overlaps(start, duration, other, other_duration) for other, other_duration in exams]
+        assert [overlaps(s, e, s2, e2) for s2, e2 in spans] == expected
+        assert overlap_mask(starts, ends, s, e).tolist() == expected
+
+        intervals = IntervalList()
+        for j, span in enumerate(spans):
+            if j != i:
+                intervals.add(*span, j)
+        assert (intervals.find(s, e) is not None) == any(expected[:i] + expected[i + 1:])
+
+
+def test_exam_minutes_and_formatting():
+    exam = Exam(start_time=time(9, 30), duration=150)
+    assert (exam.start_minute, exam.end_minute) == (570, 720)
+    assert format_minutes(exam.end_minute) == "12:00"
+    assert Exam(start_time=None, duration=60).end_minute is None
+    assert as_minutes("23:59") == 1439
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="Benchmark opțional (RUN_BENCHMARKS=1).")
+def test_benchmark_integer_minutes_against_legacy():
+    # Doar afișează timpii (pytest -s); nu verifică nimic, rezultatele depind de mașină
+    exams = _random_exams(200)
+    spans = [exam_span(start, duration) for start, duration in exams]
+    starts = np.array([s for s, _ in spans])
+    ends = np.array([e for _, e in spans])
+    probe_time, probe_duration = exams[0]
+    probe = spans[0]
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_overlaps(probe_time, probe_duration, t, d) for t, d in exams], number=20, repeat=3))
+    scalar = min(timeit.repeat(
+        lambda: [overlaps(probe[0], probe[1], s, e) for s, e in spans], number=20, repeat=3))
+    batch = min(timeit.repeat(lambda: overlap_mask(starts, ends, *probe), number=20, repeat=3))
+
+    print(f"\nlegacy {legacy * 1e3:.2f} ms, scalar {scalar * 1e3:.2f} ms, batch {batch * 1e3:.2f} ms")
@@ -0,0 +1,112 @@
+import random
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from app import create_app
+from app.models import db, User, UserRole, Group, Course, Exam, ExamStatus
+from app.scheduler import missing_exams_by_group
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _legacy_missing_exams():
+    """Implementarea anterioară (bucle imbricate în Python), folosită ca referință."""
+    courses = Course.query.options(joinedload(Course.coordinator), joinedload(Course.exams)).all()
+    groups = Group.query.all()
+    leaders = {}
+    missing = {}
+    for course in courses:
+        for group in groups:
+            if group.specialization != course.specialization or group.year_of_study != course.study_year:
+                continue
+            if not any(exam for exam in course.exams if exam.group_id == group.group_id):
+                leaders[group.name] = group.leader.name if group.leader else None
+                missing.setdefault(group.name, []).append({
+                    "course_name": course.name,
+                    "coordinator": course.coordinator.name if course.coordinator else None
+                })
+    return [
+        {"group": name, "leader": leaders[name], "missing_exams": sorted(items, key=lambda x: x["course_name"])}
+        for name, items in sorted(missing.items())
+    ]
+
+
+def _seed(course_count, group_count, specializations=("C", "AIA", "TI", "SIC", "CALC")):
+    rng = random.Random(7)
+    professors = [User(name=f"Prof {i:03d}", email=f"prof{i}@usv.ro", role=UserRole.CD, teacherId=i)
+                  for i in range(1, 41)]
+    leaders = [User(name=f"Student {i:03d}", email=f"student{i}@usv.ro", role=UserRole.SG)
+               for i in range(group_count)]
+    db.session.add_all(professors + leaders)
+    db.session.flush()
+
+    groups = [Group(name=f"{i:04d}", specialization=specializations[i % len(specializations)],
+                    year_of_study=1 + i % 4, leader_id=leaders[i].user_id if i % 3 else None)
+              for i in range(group_count)]
+    courses = [Course(name=f"Curs {i:03d}", specialization=specializations[i % len(specializations)],
+                      study_year=1 + (i // len(specializations)) % 4, examination_method="EXAMEN",
+                      coordinator_id=rng.choice(professors).user_id if i % 7 else None)
+               for i in range(course_count)]
+    db.session.add_all(groups + courses)
+    db.session.flush()
+
+    pairs = [(c, g) for c in courses for g in groups
+             if c.specialization == g.specialization and c.study_year == g.year_of_study]
+    db.session.execute(insert(Exam), [
+        {"course_id": c.course_id, "group_id": g.group_id, "exam_date": date(2027, 6, 1), "type": "EXAMEN",
+         "status": ExamStatus.IN_ASTEPTARE}
+        for c, g in rng.sample(pairs, len(pairs) // 2)
+    ])
+    db.session.commit()
+    return pairs
+
+
+def test_missing_exams_grouped_by_group_name(app):
+    lead = User(name="Lider", email="lider@usv.ro", role=UserRole.SG)
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    db.session.add_all([lead, prof])
+    db.session.flush()
+    g1 = Group(name="3712", specialization="C", year_of_study=3)
+    g2 = Group(name="3711", specialization="C", year_of_study=3, leader_id=lead.user_id)
+    g3 = Group(name="1111", specialization="AIA", year_of_study=1)
+    c1 = Course(name="Rețele", specialization="C", study_year=3, coordinator_id=prof.user_id)
+    c2 = Course(name="Baze de date", specialization="C", study_year=3)
+    db.session.add_all([g1, g2, g3, c1, c2])
+    db.session.flush()
+    db.session.add(Exam(course_id=c1.course_id, group_id=g1.group_id, exam_date=date(2027, 6, 1), type="EXAMEN"))
+    db.session.commit()
+
+    assert missing_exams_by_group() == [
+        {"group": "3711", "leader": "Lider", "missing_exams": [
+            {"course_name": "Baze de date", "coordinator": None},
+            {"course_name": "Rețele", "coordinator": "Prof"},
+        ]},
+        {"group": "3712", "leader": None, "missing_exams": [
+            {"course_name": "Baze de date", "coordinator": None},
+        ]},
+    ]
+
+
+def test_anti_join_matches_legacy(app):
+    pairs = _seed(course_count=200, group_count=150)
+
+    result = missing_exams_by_group()
+    db.session.expire_all()
+    legacy = _legacy_missing_exams()
+
+    assert result == legacy
+    assert sum(len(group["missing_exams"]) for group in result) == len(pairs) - len(pairs) // 2
@@ -0,0 +1,133 @@
+from datetime import date, time
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed():
+    sec = User(name="Secretar", email="sec@usv.ro", role=UserRole.SEC)
+    profs = [User(name=f"Prof {i}", email=f"prof{i}@usv.ro", role=UserRole.CD, teacherId=i) for i in range(1, 8)]
+    rooms = [Room(name=f"{b}{n}", building=b) for b in "CD" for n in (201, 101, 301)]
+    groups = [Group(name="3711", specialization="C", year_of_study=3),
+              Group(name="3121", specialization="AIA", year_of_study=1)]
+    courses = [Course(name=f"Curs {i}", study_year=3 if i % 2 else 1, specialization="C" if i % 2 else "AIA",
+                      examination_method="EXAMEN") for i in range(1, 16)]
+    db.session.add_all([sec, *profs, *rooms, *groups, *courses])
+    db.session.flush()
+
+    statuses = [ExamStatus.ACCEPTAT, ExamStatus.IN_ASTEPTARE, ExamStatus.RESPINS]
+    for i in range(30):
+        db.session.add(Exam(course_id=courses[i // 2].course_id, group_id=groups[i % 2].group_id,
+                            exam_date=date(2027, 6, 1 + i % 7), type="EXAMEN",
+                            room_id=rooms[i % len(rooms)].room_id, professor_id=profs[0].user_id,
+                            status=statuses[i % 3], start_time=None if i % 5 == 0 else time(8 + i % 4, 0),
+                            duration=120))
+    db.session.commit()
+    token = create_access_token(identity=str(sec.user_id), additional_claims={'role': 'SEC'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _all_pages(client, url, key, headers, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        query = f"{url}{'&' if '?' in url else '?'}limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(query, headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body[key]) <= limit
+        items += body[key]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_exam_pages_follow_date_time_id_order(client):
+    headers = _seed()
+
+    exams, pages = _all_pages(client, '/exam/all', 'exams', headers, limit=7)
+    assert len(exams) == 30 and pages == 5
+    assert len({e["exam_id"] for e in exams}) == 30
+
+    keys = [(e["exam_date"], e["start_time"] or "00:00", e["exam_id"]) for e in exams]
+    assert keys == sorted(keys)
+
+
+def test_exam_pages_are_read_in_index_order(client):
+    headers = _seed()
+    first = client.get('/exam/all?limit=7', headers=headers).get_json()
+
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+    event.listen(db.engine, "before_cursor_execute", listener)
+    client.get(f'/exam/all?limit=7&cursor={first["next_cursor"]}', headers=headers)
+    event.remove(db.engine, "before_cursor_execute", listener)
+
+    statement, parameters = next(s for s in statements if "LIMIT" in s[0])
+    plan = [row[-1] for row in db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+    assert any("ix_exams_date_start" in detail for detail in plan)
+    assert not any("TEMP B-TREE" in detail for detail in plan)
+
+
+def test_exam_filters_apply_to_pages_and_legacy_response(client):
+    headers = _seed()
+
+    exams, _ = _all_pages(client, '/exam/all?status=ACCEPTAT,RESPINS&date_from=2027-06-02&date_to=2027-06-05'
+                                  '&building=C', 'exams', headers, limit=3)
+    assert exams
+    assert all(e["status"] in ("ACCEPTAT", "RESPINS") and e["building"] == "C" for e in exams)
+    assert all("2027-06-02" <= e["exam_date"] <= "2027-06-05" for e in exams)
+
+    legacy = client.get('/exam/all?specialization=AIA&status=ACCEPTAT', headers=headers).get_json()
+    assert legacy["exams_by_status"]["IN_ASTEPTARE"] == []
+    assert all(e["group_name"] == "3121" for e in legacy["exams_by_status"]["ACCEPTAT"])
+    assert "missing_exams" in legacy
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=abc", "cursor=nu-este-un-cursor", "status=ALTUL",
+                                   "date_from=10.06.2027"])
+def test_invalid_parameters_return_400(client, query):
+    headers = _seed()
+    assert client.get(f'/exam/all?{query}', headers=headers).status_code == 400
+
+
+def test_courses_professors_and_rooms_pages(client):
+    headers = _seed()
+
+    legacy = client.get('/courses', headers=headers).get_json()
+    courses, _ = _all_pages(client, '/courses', 'courses', headers, limit=4)
+    assert courses == legacy and len(courses) == 15
+
+    filtered = client.get('/courses?specialization=C&study_year=3', headers=headers).get_json()
+    assert [c["name"] for c in filtered] == [f"Curs {i}" for i in range(1, 16, 2)]
+
+    professors, pages = _all_pages(client, '/users/professors', 'professors', headers, limit=3)
+    assert professors == client.get('/users/professors', headers=headers).get_json()
+    assert len(professors) == 7 and pages == 3
+
+    rooms, _ = _all_pages(client, '/rooms?building=D', 'rooms', headers, limit=2)
+    assert [r["name"] for r in rooms] == ["D101", "D201", "D301"]
+    assert [r["name"] for r in client.get('/rooms', headers=headers).get_json()] == \
+        ["C101", "C201", "C301", "D101", "D201", "D301"]
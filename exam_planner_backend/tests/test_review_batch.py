@@ -0,0 +1,148 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _seed(groups=3):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, asist, room])
+    db.session.commit()
+    course = Course(name="Curs", study_year=3, specialization="C", examination_method="EXAMEN",
+                    coordinator_id=prof.user_id)
+    db.session.add(course)
+    exams = []
+    for i in range(groups):
+        leader = User(name=f"Lider {i}", email=f"lider{i}@student.usv.ro", role=UserRole.SG)
+        db.session.add(leader)
+        db.session.flush()
+        group = Group(name=f"37{i}", leader_id=leader.user_id, specialization="C", year_of_study=3)
+        db.session.add(group)
+        db.session.flush()
+        exam = Exam(course_id=course.course_id, group_id=group.group_id, exam_date=date(2025, 6, 10),
+                    type="EXAMEN", professor_id=prof.user_id, status=ExamStatus.IN_ASTEPTARE)
+        db.session.add(exam)
+        exams.append(exam)
+    db.session.commit()
+    return prof, asist, room, exams
+
+
+def _accept(exam, room, asist, start):
+    return {"exam_id": exam.exam_id, "decision": "ACCEPTAT", "room_id": room.room_id,
+            "assistant_id": asist.user_id, "start_time": start, "duration": 120}
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_batch_review_detects_conflicts_inside_the_batch(send_email, client, app):
+    prof, asist, room, exams = _seed()
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+
+    response = client.put('/exam/review/batch', json={"decisions": [
+        _accept(exams[0], room, asist, "09:00"),
+        _accept(exams[1], room, asist, "10:00"),
+        {"exam_id": exams[2].exam_id, "decision": "RESPINS", "details": "alta data"},
+    ]}, headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["applied"] == 2
+    assert [r["code"] for r in body["results"]] == [200, 409, 200]
+    assert db.session.get(Exam, exams[0].exam_id).status == ExamStatus.ACCEPTAT
+    assert db.session.get(Exam, exams[1].exam_id).status == ExamStatus.IN_ASTEPTARE
+    assert db.session.get(Exam, exams[2].exam_id).status == ExamStatus.RESPINS
+    assert send_email.call_count == 2
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_batch_review_all_or_nothing_and_constant_queries(send_email, client, app):
+    prof, asist, room, exams = _seed(groups=12)
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+
+    response = client.put('/exam/review/batch', json={"all_or_nothing": True, "decisions": [
+        _accept(exams[0], room, asist, "09:00"),
+        _accept(exams[1], room, asist, "10:00"),
+    ]}, headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 409
+    assert db.session.get(Exam, exams[0].exam_id).status == ExamStatus.IN_ASTEPTARE
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    rooms = [Room(name=f"S{i}", building="S") for i in range(12)]
+    db.session.add_all(rooms)
+    db.session.commit()
+
+    decisions = [{"exam_id": e.exam_id, "decision": "ACCEPTAT", "room_id": r.room_id,
+                  "assistant_id": asist.user_id if i == 0 else prof.user_id, "start_time": f"{8 + i}:00",
+                  "duration": 60} for i, (e, r) in enumerate(zip(exams, rooms))]
+    statements.clear()
+    response = client.put('/exam/review/batch', json={"decisions": decisions},
+                          headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    assert response.get_json()["applied"] == 12
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) <= 5
+
+
+@patch('app.routes.exams.send_email_notification')
+def test_batch_review_rejects_malformed_ids(send_email, client, app):
+    prof, asist, room, exams = _seed()
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+
+    response = client.put('/exam/review/batch', json={"decisions": [
+        {"exam_id": [exams[0].exam_id], "decision": "RESPINS"},
+        {"exam_id": {"id": 1}, "decision": "RESPINS"},
+        {**_accept(exams[1], room, asist, "09:00"), "room_id": [room.room_id]},
+        {**_accept(exams[2], room, asist, "09:00"), "assistant_id": str(asist.user_id)},
+    ]}, headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    assert [r["code"] for r in response.get_json()["results"]] == [400, 400, 400, 400]
+    assert response.get_json()["applied"] == 0
+
+
+@patch('app.routes.exams.exclusion_violation_field', return_value="room_id")
+@patch('app.routes.exams.send_email_notification')
+def test_batch_review_reports_items_of_a_failed_commit(send_email, violation, client, app):
+    prof, asist, room, exams = _seed()
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+
+    # O altă cerere acceptă între timp un examen în aceeași sală: constrângerea respinge commit-ul
+    with patch.object(db.session, "commit", side_effect=IntegrityError("INSERT", {}, Exception())):
+        response = client.put('/exam/review/batch', json={"decisions": [
+            _accept(exams[0], room, asist, "09:00"),
+            {"exam_id": exams[1].exam_id, "decision": "RESPINS"},
+            {"exam_id": 999, "decision": "RESPINS"},
+        ]}, headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 409
+    assert [r["code"] for r in response.get_json()["results"]] == [409, 409, 404]
+    assert all("status" not in r for r in response.get_json()["results"])
+    send_email.assert_not_called()
@@ -0,0 +1,84 @@
+from datetime import date, time
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.models import db, User, UserRole, Room, Exam, ExamStatus
+from app.room_availability import merge_intervals, free_intervals, room_availability
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+
+    with app.app_context():
+        db.create_all()
+        room_availability.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_merge_and_free_intervals():
+    busy = merge_intervals([(600, 720), (540, 660), (720, 780), (900, 960)])
+    assert busy == [(540, 780), (900, 960)]
+    assert free_intervals(busy, 480, 1200) == [(480, 540), (780, 900), (960, 1200)]
+    assert free_intervals(busy, 480, 1200, min_duration=120) == [(780, 900), (960, 1200)]
+
+
+def test_availability_endpoint_is_invalidated_by_exam_changes(client, app):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    rooms = [Room(name="C203", building="C"), Room(name="A101", building="A")]
+    db.session.add_all([prof, *rooms])
+    db.session.commit()
+    exam = Exam(exam_date=date(2025, 6, 10), type="EXAMEN", room_id=rooms[0].room_id, professor_id=prof.user_id,
+                status=ExamStatus.ACCEPTAT, start_time=time(10, 0), duration=120)
+    db.session.add(exam)
+    db.session.commit()
+
+    token = create_access_token(identity=str(prof.user_id), additional_claims={'role': 'CD'})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/rooms/availability?date=2025-06-10&building=C', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == [{
+        "room_id": rooms[0].room_id, "name": "C203", "building": "C",
+        "busy": [{"start": "10:00", "end": "12:00"}],
+        "free": [{"start": "08:00", "end": "10:00"}, {"start": "12:00", "end": "20:00"}],
+    }]
+
+    exam.exam_date = date(2025, 6, 11)
+    db.session.commit()
+
+    data = client.get('/rooms/availability?date=2025-06-10', headers=headers).get_json()
+    assert [r["name"] for r in data] == ["A101", "C203"]
+    assert all(r["busy"] == [] for r in data)
+
+    assert client.get('/rooms/availability?date=10.06.2025', headers=headers).status_code == 400
+
+
+def test_load_racing_an_invalidation_is_not_cached(app, monkeypatch):
+    day = date(2025, 6, 10)
+    load = room_availability._load
+
+    def racing_load(exam_date):
+        rooms = load(exam_date)
+        # Un examen din aceeași zi se modifică după citire, înainte ca rezultatul să fie salvat
+        room_availability.invalidate(exam_date)
+        return rooms
+
+    monkeypatch.setattr(room_availability, "_load", racing_load)
+    room_availability.get(day)
+    assert day not in room_availability._days
+
+    monkeypatch.setattr(room_availability, "_load", load)
+    room_availability.get(day)
+    assert day in room_availability._days
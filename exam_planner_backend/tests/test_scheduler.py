@@ -0,0 +1,117 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus, ExaminationPeriod
+from app.scheduler import ExamScheduler, SchedulingRequest, build_slots, auto_schedule
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _assert_no_overlaps(placed):
+    seen = set()
+    for req, slot, room_id, assistant_id in placed:
+        keys = [("group", req.group_id, slot[0]), ("room", room_id, slot), ("professor", req.professor_id, slot)]
+        if assistant_id is not None:
+            keys.append(("assistant", assistant_id, slot))
+        for key in keys:
+            assert key not in seen, key
+            seen.add(key)
+
+
+def test_scheduler_places_full_faculty_without_conflicts():
+    slots = {"EXAMEN": build_slots(date(2025, 6, 2), date(2025, 6, 27), 8 * 60, 20 * 60, 120)}
+    scheduler = ExamScheduler(slots, room_ids=range(1, 61), duration=120)
+
+    # 150 de grupe x 15 cursuri = 2250 de perechi, 10 specializări
+    requests = [
+        SchedulingRequest(course_id=g % 10 * 20 + c, group_id=g, professor_id=(g % 10 * 20 + c) % 300,
+                          exam_type="EXAMEN", assistant_ids=[1000 + c, 2000 + c])
+        for g in range(150) for c in range(1, 16)
+    ]
+
+    placed, unplaced = scheduler.solve(requests)
+
+    assert len(placed) + len(unplaced) == len(requests)
+    assert not unplaced
+    _assert_no_overlaps(placed)
+
+
+def _count_selects(func, *args, **kwargs):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    result = func(*args, **kwargs)
+    event.remove(db.engine, "before_cursor_execute", listener)
+    return result, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_auto_schedule_respects_existing_exams(app):
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    leader = User(name="Lider", email="lider@student.usv.ro", role=UserRole.SG)
+    room = Room(name="C203", building="C")
+    db.session.add_all([prof, leader, room])
+    db.session.commit()
+
+    group = Group(name="3711", leader_id=leader.user_id, specialization="Calculatoare", year_of_study=3)
+    courses = [Course(name=f"Curs {i}", study_year=3, specialization="Calculatoare",
+                      examination_method="EXAMEN", coordinator_id=prof.user_id) for i in range(3)]
+    db.session.add_all([group, *courses,
+                        ExaminationPeriod(name="EXAMEN", period_start=date(2025, 6, 2),
+                                          period_end=date(2025, 6, 6))])
+    db.session.commit()
+
+    db.session.add(Exam(course_id=courses[0].course_id, group_id=group.group_id, exam_date=date(2025, 6, 2),
+                        type="EXAMEN", professor_id=prof.user_id, status=ExamStatus.ACCEPTAT))
+    db.session.commit()
+
+    (placed, unplaced), statements = _count_selects(auto_schedule, duration=120, day_start="08:00",
+                                                    day_end="12:00")
+
+    assert len(placed) == 2 and not unplaced
+    exams = Exam.query.filter_by(status=ExamStatus.IN_ASTEPTARE).all()
+    assert {e.course_id for e in exams} == {courses[1].course_id, courses[2].course_id}
+    assert len({e.exam_date for e in exams} | {date(2025, 6, 2)}) == 3
+    assert all(e.room_id == room.room_id and e.start_time is not None for e in exams)
+
+    # Numărul de interogări nu depinde de numărul de cursuri
+    db.session.add(Course(name="Curs 3", study_year=3, specialization="Calculatoare",
+                          examination_method="EXAMEN", coordinator_id=prof.user_id))
+    db.session.commit()
+    (placed, _), more_statements = _count_selects(auto_schedule, duration=120, day_start="08:00",
+                                                  day_end="12:00", commit=False)
+    assert len(placed) == 1
+    assert len(more_statements) == len(statements)
+
+
+def test_scheduler_honours_group_spacing_and_daily_limit():
+    slots = {"EXAMEN": build_slots(date(2025, 6, 2), date(2025, 6, 20), 8 * 60, 16 * 60, 120)}
+    requests = [SchedulingRequest(course_id=c, group_id=1, professor_id=c, exam_type="EXAMEN") for c in range(4)]
+
+    scheduler = ExamScheduler(slots, room_ids=[1], duration=120, min_days_between=3)
+    scheduler.reserve_existing(1, date(2025, 6, 3), None, None, None, None, None)
+    placed, unplaced = scheduler.solve(requests)
+    days = sorted([slot[0] for _, slot, _, _ in placed] + [date(2025, 6, 3)])
+    assert not unplaced
+    assert all((b - a).days >= 3 for a, b in zip(days, days[1:]))
+
+    scheduler = ExamScheduler(slots, room_ids=[1, 2], duration=120, max_per_day=2)
+    placed, unplaced = scheduler.solve(requests)
+    assert not unplaced
+    assert sorted(Counter(slot[0] for _, slot, _, _ in placed).values()) == [2, 2]
+    # Două examene ale grupei din aceeași zi nu sunt în același interval
+    assert len({slot for _, slot, _, _ in placed}) == 4
@@ -0,0 +1,140 @@
+import json
+from datetime import date, time
+
+import pytest
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from app import create_app
+from app.models import db, User, UserRole, Room, Group, Course, Exam, ExamStatus
+from app.serializers import exam_row_select, serialize_exam_details, serialize_exam_list_item
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _legacy_exam_dict(exam):
+    """Forma construită manual înainte de serializatoare (referința pentru compatibilitate)."""
+    return {
+        "exam_id": exam.exam_id,
+        "course_name": exam.course.name,
+        "exam_type": str(exam.type),
+        "exam_date": exam.exam_date.strftime("%Y-%m-%d") if exam.exam_date else None,
+        "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
+        "duration": exam.duration if exam.duration is not None else None,
+        "room": exam.room.name if exam.room else None,
+        "building": exam.room.building if exam.room else None,
+        "professor": exam.professor.name if exam.professor else None,
+        "assistant": exam.assistant.name if exam.assistant else None,
+        "status": exam.status.value if exam.status else None,
+        "details": exam.details if exam.details else None
+    }
+
+
+def _headers(user, role):
+    token = create_access_token(identity=str(user.user_id), additional_claims={'role': role})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _seed(exam_count):
+    leader = User(name="Lider", email="lider@usv.ro", role=UserRole.SG)
+    prof = User(name="Prof", email="prof@usv.ro", role=UserRole.CD, teacherId=1)
+    asist = User(name="Asistent", email="asist@usv.ro", role=UserRole.CD, teacherId=2)
+    room = Room(name="C203", building="C")
+    db.session.add_all([leader, prof, asist, room])
+    db.session.flush()
+    group = Group(name="3711", specialization="C", year_of_study=3, leader_id=leader.user_id)
+    db.session.add(group)
+    db.session.flush()
+    db.session.execute(insert(Course), [
+        {"name": f"Curs {i}", "specialization": "C", "study_year": 3, "coordinator_id": prof.user_id}
+        for i in range(exam_count)
+    ])
+    courses = db.session.execute(db.select(Course.course_id).order_by(Course.course_id)).scalars().all()
+    statuses = list(ExamStatus)
+    db.session.execute(insert(Exam), [
+        {"course_id": course_id, "group_id": group.group_id, "exam_date": date(2027, 1, 1 + i % 28),
+         "type": "EXAMEN", "status": statuses[i % 3],
+         "room_id": room.room_id if i % 2 else None, "professor_id": prof.user_id,
+         "assistant_id": asist.user_id if i % 4 else None,
+         "start_time": time(8 + i % 10, 30) if i % 2 else None, "duration": 120 if i % 2 else None,
+         "details": "Sala C203" if i % 5 else ""}
+        for i, course_id in enumerate(courses)
+    ])
+    db.session.commit()
+    return leader, prof, group
+
+
+def test_responses_match_legacy_shapes(client):
+    leader, prof, group = _seed(12)
+    headers = _headers(leader, "SG")
+
+    legacy = [_legacy_exam_dict(exam) for exam in Exam.query.order_by(Exam.exam_id).all()]
+    response = client.get('/exam/for/group', headers=headers).get_json()
+    assert sorted(response, key=lambda e: e["exam_id"]) == legacy
+
+    assert client.get(f'/exam/{legacy[1]["exam_id"]}', headers=headers).get_json() == legacy[1]
+
+    cd_headers = _headers(prof, "CD")
+    by_status = client.get('/exam/by-status', headers=cd_headers).get_json()
+    assert sum(len(items) for items in by_status.values()) == 12
+    accepted = next(e for e in by_status["ACCEPTAT"] if e["start_time"])
+    assert accepted["exam_date"].startswith("2027-01-") and len(accepted["start_time"]) == 5
+    assert accepted["group_name"] == "3711" and accepted["specialization"] == "C"
+
+
+def test_json_provider_encodes_dates_times_and_enums(app):
+    body = jsonify({"date": date(2027, 6, 10), "time": time(9, 30), "status": ExamStatus.IN_ASTEPTARE,
+                    1: "cheie numerică"}).get_data(as_text=True)
+    assert json.loads(body) == {"date": "2027-06-10", "time": "09:30:00", "status": "IN ASTEPTARE",
+                                "1": "cheie numerică"}
+
+
+def test_serializers_match_orm_dicts(app):
+    _seed(300)
+    legacy_provider = DefaultJSONProvider(app)
+
+    exams = Exam.query.options(joinedload(Exam.course), joinedload(Exam.group), joinedload(Exam.room),
+                               joinedload(Exam.professor), joinedload(Exam.assistant)) \
+        .order_by(Exam.exam_id).all()
+    rows = db.session.execute(exam_row_select().order_by(Exam.exam_id)).all()
+
+    # Datele sunt codificate de providerul JSON, deci comparăm corpurile răspunsurilor
+    assert json.loads(app.json.dumps([serialize_exam_details(row) for row in rows])) == \
+        json.loads(legacy_provider.dumps([_legacy_exam_dict(exam) for exam in exams]))
+
+    orm_list_items = [{
+        "exam_id": exam.exam_id,
+        "course_name": exam.course.name,
+        "group_name": exam.group.name,
+        "exam_type": exam.type,
+        "exam_date": exam.exam_date,
+        "start_time": exam.start_time.strftime("%H:%M") if exam.start_time else None,
+        "duration": exam.duration,
+        "room": exam.room.name if exam.room else None,
+        "building": exam.room.building if exam.room else None,
+        "professor": exam.professor.name if exam.professor else None,
+        "assistant": exam.assistant.name if exam.assistant else None,
+        "status": exam.status.name,
+        "details": exam.details,
+    } for exam in exams]
+    assert json.loads(app.json.dumps([serialize_exam_list_item(row) for row in rows])) == \
+        json.loads(app.json.dumps(orm_list_items))
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import threading
+import time as timer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, select
+
+from app import create_app
+from app.import_data import fetch_and_store_data
+from app.models import db, User, UserRole, Course, Room, TimetableSyncState, course_assistants
+
+FACULTY = "Facultatea de Inginerie Electrică și Știința Calculatoarelor"
+
+
+def _timetable(teacher_id):
+    """Orarul unui profesor în formatul orar.usv.ro: [activități, {id activitate: [grupă, facultăți]}]."""
+    entries = [
+        {"id": teacher_id * 10 + 1, "topicLongName": f"Curs {teacher_id}", "typeShortName": "curs",
+         "roomLongName": f"C{teacher_id % 5}", "roomBuilding": "C"},
+        {"id": teacher_id * 10 + 2, "topicLongName": f"Curs {(teacher_id + 1) % 20}", "typeShortName": "lab",
+         "roomLongName": None, "roomBuilding": None},
+    ]
+    groups = {str(entry["id"]): ["C an 3", "FIESC"] for entry in entries}
+    return [entries, groups]
+
+
+class StubOrar:
+    """Server HTTP local în locul orar.usv.ro; fiecare orar este servit după `delay` secunde."""
+
+    def __init__(self, professors, delay=0.0, slow=(), slow_delay=0.0, etags=False):
+        self.professors, self.delay, self.slow, self.slow_delay = professors, delay, set(slow), slow_delay
+        # Orare modificate față de `_timetable` (teacherId -> orar) și răspunsurile 304 trimise
+        self.etags, self.timetables, self.not_modified = etags, {}, 0
+        self.requests, self.ports, self.in_flight, self.max_in_flight = [], set(), 0, 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, request):
+        url = urlparse(request.path)
+        with self.lock:
+            self.requests.append(request.path)
+            self.ports.add(request.client_address[1])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if url.path == "/cadre.php":
+                payload = self.professors
+            else:
+                teacher_id = int(parse_qs(url.query)["ID"][0])
+                timer.sleep(self.slow_delay if teacher_id in self.slow else self.delay)
+                payload = self.timetables.get(teacher_id) or _timetable(teacher_id)
+            body = json.dumps(payload).encode()
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.etags and request.headers.get("If-None-Match") == etag:
+                with self.lock:
+                    self.not_modified += 1
+                request.send_response(304)
+                request.send_header("Content-Length", "0")
+                request.end_headers()
+                return
+            request.send_response(200)
+            request.send_header("Content-Type", "application/json")
+            if self.etags:
+                request.send_header("ETag", etag)
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _professors(count):
+    return [{"id": str(i), "firstName": "Prof", "lastName": str(i), "emailAddress": f"prof{i}@usv.ro",
+             "facultyName": FACULTY} for i in range(count)] + [
+        {"id": "999", "firstName": "Alt", "lastName": "Profesor", "emailAddress": "alt@usv.ro",
+         "facultyName": "Altă facultate"}]
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['FACULTY_NAME'] = FACULTY
+    app.config['SHORT_FACULTY_NAME'] = "FIESC"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def orar(monkeypatch):
+    stubs = []
+
+    def start(professors, **kwargs):
+        stub = StubOrar(professors, **kwargs)
+        monkeypatch.setattr("app.import_data.API_PROFESSORS", f"{stub.url}/cadre.php?json")
+        monkeypatch.setattr("app.import_data.API_COURSES", f"{stub.url}/orarSPG.php?ID={{}}&mod=prof&json")
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.close()
+
+
+def test_sync_stores_professors_courses_and_rooms(app, orar):
+    orar(_professors(20))
+
+    fetch_and_store_data()
+
+    assert User.query.count() == 20
+    assert Room.query.count() == 5
+    courses = {course.name: course for course in Course.query.all()}
+    assert len(courses) == 20
+    prof3 = User.query.filter_by(email="prof3@usv.ro").one()
+    assert courses["Curs 3"].coordinator_id == prof3.user_id
+    assert prof3 in courses["Curs 4"].assistants
+    assert courses["Curs 4"].specialization == "C" and courses["Curs 4"].study_year == 3
+
+
+def test_timetables_are_fetched_concurrently_over_pooled_connections(app, orar):
+    app.config['SYNC_MAX_WORKERS'] = 4
+    stub = orar(_professors(24), delay=0.1)
+
+    fetch_and_store_data()
+
+    # Cel mult (și exact) 4 cereri simultane
+    assert stub.max_in_flight == 4
+    assert len(stub.requests) == 25
+    # Conexiunile sunt refolosite (keep-alive), nu deschise pentru fiecare cerere
+    assert len(stub.ports) <= 4
+    assert Course.query.count() == 24
+
+
+def test_slow_timetables_time_out_without_stopping_the_sync(app, orar):
+    app.config['SYNC_HTTP_TIMEOUT'] = 0.3
+    orar(_professors(6), slow={2}, slow_delay=2)
+
+    fetch_and_store_data()
+
+    assert User.query.count() == 6
+    coordinated = {course.coordinator_id for course in Course.query.all()}
+    prof2 = User.query.filter_by(email="prof2@usv.ro").one()
+    assert prof2.user_id not in coordinated
+    assert Course.query.filter_by(name="Curs 5").one().coordinator_id is not None
+
+
+def _statements_per_table(callback):
+    statements = {}
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        words = statement.split()
+        table = words[words.index("FROM") + 1] if words[0] == "SELECT" else words[2]
+        statements[(words[0], table)] = statements.get((words[0], table), 0) + 1
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        callback()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return statements
+
+
+def test_sync_cost_does_not_grow_with_the_number_of_professors(app, orar):
+    orar(_professors(5))
+    small = _statements_per_table(fetch_and_store_data)
+
+    db.drop_all()
+    db.create_all()
+    orar(_professors(60))
+    large = _statements_per_table(fetch_and_store_data)
+
+    assert large == small
+    assert sum(large.values()) <= 9
+    assert User.query.count() == 60 and Course.query.count() == 60
+
+
+def test_resync_keeps_existing_rows_and_links(app, orar):
+    sec = User(name="Secretariat", email="prof1@usv.ro", role=UserRole.SEC)
+    room = Room(name="C1", building="Corp C")
+    course = Course(name="Curs 19", study_year=3, specialization="C")
+    db.session.add_all([sec, room, course])
+    db.session.commit()
+    orar(_professors(20))
+
+    fetch_and_store_data()
+    fetch_and_store_data()
+
+    assert User.query.count() == 20
+    assert db.session.get(User, sec.user_id).role == UserRole.SEC
+    assert Room.query.filter_by(name="C1").one().building == "Corp C"
+    assert Room.query.count() == 5
+    assert Course.query.count() == 20
+    assert db.session.execute(select(func.count()).select_from(course_assistants)).scalar() == 20
+    # Cursul existent primește coordonatorul (prof19) și asistentul (prof18) din orar
+    prof18, prof19 = (User.query.filter_by(email=f"prof{i}@usv.ro").one() for i in (18, 19))
+    curs19 = db.session.get(Course, course.course_id)
+    assert curs19.coordinator_id == prof19.user_id and curs19.assistants == [prof18]
+    assert Course.query.filter_by(name="Curs 0").one().coordinator_id == User.query.filter_by(
+        email="prof0@usv.ro").one().user_id
+
+
+def test_unchanged_timetables_are_skipped(app, orar):
+    stub = orar(_professors(20))
+    assert fetch_and_store_data() == {"professors": 20, "changed": 20, "unchanged": 0, "failed": 0}
+    assert TimetableSyncState.query.count() == 20
+
+    # prof4 nu mai are laboratorul la "Curs 5" și predă un curs nou
+    timetable = _timetable(4)
+    timetable[0][1].update(topicLongName="Curs nou", typeShortName="curs")
+    stub.timetables[4] = timetable
+
+    statements = _statements_per_table(lambda: fetch_and_store_data())
+    assert statements[("DELETE", "course_assistants")] == 1
+    assert ("INSERT", "course_assistants") not in statements
+
+    prof4 = User.query.filter_by(email="prof4@usv.ro").one()
+    assert Course.query.filter_by(name="Curs nou").one().coordinator_id == prof4.user_id
+    assert prof4 not in Course.query.filter_by(name="Curs 5").one().assistants
+    # Orarele celorlalți profesori nu au fost reprocesate
+    assert User.query.filter_by(email="prof5@usv.ro").one() in Course.query.filter_by(name="Curs 6").one().assistants
+    assert fetch_and_store_data() == {"professors": 20, "changed": 0, "unchanged": 20, "failed": 0}
+
+
+def test_http_validators_are_sent_on_resync(app, orar):
+    stub = orar(_professors(10), etags=True)
+    fetch_and_store_data()
+    assert stub.not_modified == 0
+
+    stub.timetables[3] = [[], {}]
+    assert fetch_and_store_data() == {"professors": 10, "changed": 1, "unchanged": 9, "failed": 0}
+    assert stub.not_modified == 9
+    assert User.query.filter_by(email="prof3@usv.ro").one().assisted_courses == []
+
+    # O sincronizare completă reprocesează toate orarele
+    assert fetch_and_store_data(full=True)["changed"] == 10
+
+
+def test_incremental_sync_after_reset_reloads_everything(app, orar):
+    orar(_professors(10))
+    fetch_and_store_data()
+    courses = Course.query.count()
+
+    sec = User(name="Secretariat", email="sec@usv.ro", role=UserRole.SEC)
+    db.session.add(sec)
+    db.session.commit()
+    token = create_access_token(identity=str(sec.user_id), additional_claims={'role': 'SEC'})
+    response = app.test_client().post('/settings/reset', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert Course.query.count() == 0 and TimetableSyncState.query.count() == 0
+
+    assert fetch_and_store_data() == {"professors": 10, "changed": 10, "unchanged": 0, "failed": 0}
+    assert Course.query.count() == courses and User.query.filter_by(role=UserRole.CD).count() == 10
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app
+from app.models import db, User, UserRole, Course, SyncJob, SyncJobStatus
+from app.sync_jobs import claim_job, enqueue_sync, TIMETABLE_SYNC
+from tests.test_sync import FACULTY, StubOrar, _professors
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr("app.sync_jobs.send_email_notification", lambda **kwargs: None)
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['FACULTY_NAME'] = FACULTY
+    app.config['SHORT_FACULTY_NAME'] = "FIESC"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def orar(monkeypatch):
+    stub = StubOrar(_professors(12))
+    monkeypatch.setattr("app.import_data.API_PROFESSORS", f"{stub.url}/cadre.php?json")
+    monkeypatch.setattr("app.import_data.API_COURSES", f"{stub.url}/orarSPG.php?ID={{}}&mod=prof&json")
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def headers(app):
+    sec = User(name="Secretariat", email="sec@usv.ro", role=UserRole.SEC)
+    db.session.add(sec)
+    db.session.commit()
+    token = create_access_token(identity=str(sec.user_id), additional_claims={'role': 'SEC'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_sync_requests_are_deduplicated(client, headers):
+    response = client.post('/sync-data', headers=headers)
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    again = client.post('/sync-data', headers=headers, json={"full": True})
+    assert again.status_code == 202
+    assert again.get_json()["job_id"] == job_id
+    assert SyncJob.query.count() == 1
+
+    job = client.get(f'/sync-data/{job_id}', headers=headers).get_json()
+    assert job["status"] == "IN_ASTEPTARE" and job["full"] is False and job["fetched"] is None
+    assert client.get('/sync-data/999', headers=headers).status_code == 404
+
+
+def test_only_one_job_can_be_active(app):
+    db.session.add(SyncJob(kind=TIMETABLE_SYNC, status=SyncJobStatus.IN_CURS, created_at=datetime.now()))
+    db.session.commit()
+    db.session.add(SyncJob(kind=TIMETABLE_SYNC, status=SyncJobStatus.IN_ASTEPTARE, created_at=datetime.now()))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    # Joburile încheiate nu blochează programarea unui job nou
+    db.session.add(SyncJob(kind=TIMETABLE_SYNC, status=SyncJobStatus.FINALIZAT, created_at=datetime.now()))
+    db.session.commit()
+
+
+def test_worker_runs_the_job_and_reports_progress(app, client, headers, orar):
+    job_id = client.post('/sync-data', headers=headers).get_json()["job_id"]
+
+    result = app.test_cli_runner().invoke(args=["sync-worker", "--once"])
+    assert result.exit_code == 0, result.output
+    assert f"Sincronizarea {job_id}: FINALIZAT (12 orare modificate" in result.output
+
+    job = client.get(f'/sync-data/{job_id}', headers=headers).get_json()
+    assert job["status"] == "FINALIZAT" and job["attempts"] == 1 and job["error"] is None
+    assert (job["total"], job["fetched"], job["changed"], job["unchanged"], job["failed"]) == (12, 12, 12, 0, 0)
+    assert job["duration"] is not None and job["duration"] >= 0
+    assert Course.query.count() == 13
+
+    # Un job nou poate fi programat după încheierea celui precedent; nu mai este nimic de rulat apoi
+    assert client.post('/sync-data', headers=headers).get_json()["job_id"] != job_id
+    app.test_cli_runner().invoke(args=["sync-worker", "--once"])
+    assert claim_job() is None
+
+
+def test_failed_sync_is_reported(app, client, headers, monkeypatch):
+    monkeypatch.setattr("app.import_data.API_PROFESSORS", "http://127.0.0.1:9/cadre.php?json")
+    job_id = client.post('/sync-data', headers=headers).get_json()["job_id"]
+
+    app.test_cli_runner().invoke(args=["sync-worker", "--once"])
+
+    job = client.get(f'/sync-data/{job_id}', headers=headers).get_json()
+    assert job["status"] == "ESUAT" and job["error"] == "Eroare la preluarea profesorilor."
+
+
+def test_jobs_of_stopped_workers_are_resumed(app):
+    job, created = enqueue_sync()
+    assert created and claim_job().job_id == job.job_id
+    # Jobul rulează: niciun alt worker nu îl poate prelua
+    assert claim_job() is None
+
+    stale = datetime.now() - timedelta(seconds=app.config["SYNC_JOB_STALE_AFTER"] + 1)
+    job.heartbeat_at = stale
+    db.session.commit()
+    resumed = claim_job()
+    assert resumed.job_id == job.job_id and resumed.attempts == 2
+
+    resumed.attempts, resumed.heartbeat_at = app.config["SYNC_JOB_MAX_ATTEMPTS"], stale
+    db.session.commit()
+    assert claim_job() is None
+    job = db.session.get(SyncJob, job.job_id)
+    assert job.status == SyncJobStatus.ESUAT and job.error == "Workerul sincronizării s-a oprit."